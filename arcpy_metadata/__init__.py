@@ -6,10 +6,7 @@ if sys.version_info.major == 2:
 from arcpy_metadata.version import __author__
 from arcpy_metadata.version import __version__
 from arcpy_metadata.metadata_editor import MetadataEditor
-
-
-
-
-
-
-
+from arcpy_metadata.batch import MetadataBatchEditor
+from arcpy_metadata.workspace_session import WorkspaceSession
+from arcpy_metadata.handle_pool import MetadataHandlePool
+from arcpy_metadata.template import MetadataTemplate
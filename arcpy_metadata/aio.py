@@ -0,0 +1,255 @@
+import os
+import asyncio
+import functools
+import concurrent.futures
+
+from arcpy_metadata.batch import _edit_file
+from arcpy_metadata.describe_cache import get_describe_cache
+from arcpy_metadata.metadata_editor import MetadataEditor
+
+
+class AsyncMetadataRunner(object):
+    """
+    Open, save and close editors from asyncio code
+
+    The blocking parts of an editor (describe, export, parse, write and import) run in a thread pool. At most
+    max_concurrency of them run at the same time, and at most per_workspace for datasets of the same workspace,
+    so a single geodatabase isn't flooded with exports and imports.
+
+    Editors are not thread safe: don't change an editor while it is being saved.
+    """
+
+    def __init__(self, max_concurrency=8, per_workspace=None, executor=None, describe_cache=None,
+                 loglevel="WARNING", **editor_options):
+        """
+        :param max_concurrency: int, maximum number of blocking calls running at the same time
+        :param per_workspace: int, maximum number of blocking calls per workspace, None for no limit
+        :param executor: concurrent.futures executor, defaults to a thread pool with max_concurrency threads.
+                         A process pool can only be used with edit(), editors can't be passed between processes
+        :param describe_cache: DescribeCache used to find the workspace of datasets and passed to the editors
+        :param loglevel: log level for the editors
+        :param editor_options: any other keyword arguments for MetadataEditor, eg lazy=True
+        """
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency)
+            self._own_executor = True
+        else:
+            self._own_executor = False
+        self.max_concurrency = max_concurrency
+        self.per_workspace = per_workspace
+        self.executor = executor
+        self._describe = describe_cache if describe_cache is not None else get_describe_cache()
+        self.editor_options = dict(editor_options, loglevel=loglevel, describe_cache=self._describe)
+
+        # semaphores belong to an event loop, so they are created when the runner is used in one
+        self._loop = None
+        self._semaphore = None
+        self._workspace_semaphores = {}  # workspace -> semaphore
+
+    def _limits(self, workspace):
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._workspace_semaphores = {}
+        if self.per_workspace is None:
+            return self._semaphore, None
+        if workspace not in self._workspace_semaphores:
+            self._workspace_semaphores[workspace] = asyncio.Semaphore(self.per_workspace)
+        return self._semaphore, self._workspace_semaphores[workspace]
+
+    async def _run(self, workspace, function, *args, **kwargs):
+        """
+        Run a blocking call in the executor, within the limits of its workspace
+        """
+        semaphore, workspace_semaphore = self._limits(workspace)
+        # take the workspace slot first, so calls waiting for a busy workspace don't block the others
+        if workspace_semaphore is not None:
+            await workspace_semaphore.acquire()
+        try:
+            async with semaphore:
+                return await self._loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+        finally:
+            if workspace_semaphore is not None:
+                workspace_semaphore.release()
+
+    def _check_threads(self):
+        if isinstance(self.executor, concurrent.futures.ProcessPoolExecutor):
+            raise TypeError("Editors can't be passed between processes, use a thread pool or edit()")
+
+    async def _workspace(self, dataset=None, metadata_file=None):
+        if self.per_workspace is None:
+            return None
+        if dataset is None:
+            return os.path.dirname(os.path.abspath(metadata_file))
+        # workspaces are described once and then cached, so this doesn't count against the limits
+        return await asyncio.get_event_loop().run_in_executor(self.executor, self._describe.workspace, dataset)
+
+    async def open(self, dataset=None, metadata_file=None, **editor_options):
+        """
+        Open an editor
+        :param dataset: string, path to the dataset
+        :param metadata_file: string, path to a metadata XML file
+        :param editor_options: keyword arguments for MetadataEditor, they overwrite the runner's options
+        :return: MetadataEditor
+        """
+        self._check_threads()
+        workspace = await self._workspace(dataset, metadata_file)
+        options = dict(self.editor_options, **editor_options)
+        return await self._run(workspace, MetadataEditor, dataset=dataset, metadata_file=metadata_file, **options)
+
+    async def save(self, metadata, Enable_automatic_updates=False, force=False):
+        """
+        Save an editor, see MetadataEditor.save
+        :param metadata: MetadataEditor
+        :return: boolean, True if the metadata was written
+        """
+        self._check_threads()
+        workspace = await self._workspace(metadata.dataset, metadata.metadata_file)
+        return await self._run(workspace, metadata.save, Enable_automatic_updates, force)
+
+    async def close(self, metadata):
+        """
+        Close an editor, see MetadataEditor.close
+        :param metadata: MetadataEditor
+        :return:
+        """
+        self._check_threads()
+        workspace = await self._workspace(metadata.dataset, metadata.metadata_file)
+        await self._run(workspace, metadata.close)
+
+    async def edit(self, metadata_file, edits, save=True):
+        """
+        Open, edit and save a metadata file in one call, like MetadataBatchEditor does for each file.
+        Works with process pools too, as long as edits can be pickled
+        :param metadata_file: string, path to a metadata XML file
+        :param edits: dictionary of element name -> value or a callable taking a MetadataEditor
+        :param save: boolean, save the file after editing it
+        :return: BatchResult
+        """
+        workspace = await self._workspace(metadata_file=metadata_file)
+        options = dict((key, value) for key, value in self.editor_options.items() if key != "describe_cache")
+        return await self._run(workspace, _edit_file, metadata_file, edits, save, options)
+
+    async def editors(self, paths, metadata_files=False, prefetch=None, return_exceptions=False):
+        """
+        Open many editors, `async for metadata in runner.editors(paths)`
+        Editors are yielded as soon as they are open, not in the order of paths. At most prefetch editors are
+        opened ahead of the loop
+        :param paths: iterable of datasets or, with metadata_files=True, of metadata XML files
+        :param metadata_files: boolean, True if paths are metadata files
+        :param prefetch: int, defaults to max_concurrency
+        :param return_exceptions: boolean, yield the exception if a path can't be opened, instead of raising it
+        :return: async generator of MetadataEditor
+
+        If the loop ends early - it breaks, a path can't be opened or it is cancelled - the editors opened ahead of
+        it are closed once the generator is closed. Use `await generator.aclose()` to close them right away
+        """
+        if prefetch is None:
+            prefetch = self.max_concurrency
+        paths = iter(paths)
+        loop = asyncio.get_event_loop()
+        pending = set()
+        unyielded = []  # done tasks, not handed to the loop yet
+
+        def schedule():
+            for path in paths:
+                if metadata_files:
+                    pending.add(loop.create_task(self.open(metadata_file=path)))
+                else:
+                    pending.add(loop.create_task(self.open(path)))
+                if len(pending) >= prefetch:
+                    break
+
+        def opened(task):
+            return not task.cancelled() and task.exception() is None
+
+        try:
+            schedule()
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending -= done
+                unyielded.extend(done)
+                for task in done:
+                    if task.cancelled() and not return_exceptions:
+                        raise asyncio.CancelledError()
+                    if not opened(task) and not return_exceptions:
+                        raise task.exception()
+                schedule()
+                while unyielded:
+                    task = unyielded.pop(0)
+                    if task.cancelled():
+                        yield asyncio.CancelledError()
+                    else:
+                        yield task.exception() if task.exception() is not None else task.result()
+        finally:
+            # editors opening in the executor can't be cancelled, wait for them and close them with the rest
+            left = list(pending) + unyielded
+            if pending:
+                await asyncio.wait(pending)
+            await asyncio.gather(*[self.close(task.result()) for task in left if opened(task)], return_exceptions=True)
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the executor, if the runner created it
+        :param wait: boolean, wait for running calls to finish
+        :return:
+        """
+        if self._own_executor:
+            self.executor.shutdown(wait=wait)
+
+
+_runner = None
+
+
+def get_runner():
+    """
+    Get the runner shared by open_async, save_async, close_async and iter_editors. It is created on first use
+    :return: AsyncMetadataRunner
+    """
+    global _runner
+    if _runner is None:
+        _runner = AsyncMetadataRunner()
+    return _runner
+
+
+def set_runner(runner):
+    """
+    Replace the shared runner, for example to change its limits
+    :param runner: AsyncMetadataRunner, or None to create a new one with the default limits on next use
+    :return:
+    """
+    global _runner
+    _runner = runner
+
+
+async def open_async(dataset=None, metadata_file=None, **editor_options):
+    """
+    Open an editor with the shared runner
+    :return: MetadataEditor
+    """
+    return await get_runner().open(dataset, metadata_file, **editor_options)
+
+
+async def save_async(metadata, Enable_automatic_updates=False, force=False):
+    """
+    Save an editor with the shared runner
+    :return: boolean, True if the metadata was written
+    """
+    return await get_runner().save(metadata, Enable_automatic_updates, force)
+
+
+async def close_async(metadata):
+    """
+    Close an editor with the shared runner
+    :return:
+    """
+    await get_runner().close(metadata)
+
+
+def iter_editors(paths, metadata_files=False, prefetch=None, return_exceptions=False):
+    """
+    Open many editors with the shared runner, `async for metadata in iter_editors(paths)`
+    :return: async generator of MetadataEditor
+    """
+    return get_runner().editors(paths, metadata_files, prefetch, return_exceptions)
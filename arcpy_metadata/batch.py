@@ -0,0 +1,110 @@
+import collections
+import concurrent.futures
+import itertools
+
+from arcpy_metadata.metadata_editor import MetadataEditor
+from arcpy_metadata.elements import elements
+
+
+class BatchResult(collections.namedtuple("BatchResult", ["path", "value", "error"])):
+    """
+    Result of editing a single metadata file
+     - path: the metadata file
+     - value: whatever the edit callable returned, None for dictionary edits
+     - error: None on success, otherwise a description of the exception that stopped the edit
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _apply_edits(metadata, edits):
+    """
+    Apply a dictionary of element name -> value to an editor. Dictionary values for parent items (like
+    contacts) are written to the child elements of the item
+    """
+    for name in edits:
+        value = edits[name]
+        if isinstance(value, dict):
+            item = getattr(metadata, name)
+            for k in value:
+                setattr(item, k, value[k])
+        else:
+            setattr(metadata, name, value)
+
+
+def _edit_file(path, edits, save, editor_options):
+    """
+    Open, edit and save a single metadata file. Runs inside the worker processes, so it needs to be importable
+    and must not raise
+    """
+    try:
+        with MetadataEditor(metadata_file=path, **editor_options) as metadata:
+            if callable(edits):
+                value = edits(metadata)
+            else:
+                _apply_edits(metadata, edits)
+                value = None
+            if save:
+                metadata.save()
+        return BatchResult(path, value, None)
+    except Exception as e:
+        return BatchResult(path, None, "{0}: {1}".format(type(e).__name__, e))
+
+
+class MetadataBatchEditor(object):
+    """
+    Apply the same edits to many metadata files using a pool of worker processes
+
+    edits is either a dictionary of element name -> value, eg {"license": "CC-BY", "tags": ["a", "b"]}, or a callable
+    that takes a MetadataEditor and returns a (picklable) value. A callable has to be defined on module level,
+    so the worker processes can import it. On Windows, create the batch editor inside an
+    `if __name__ == "__main__":` block.
+    """
+
+    def __init__(self, edits, max_workers=None, chunksize=16, save=True, loglevel="WARNING", **editor_options):
+        """
+        :param edits: dictionary of element name -> value or a callable taking a MetadataEditor
+        :param max_workers: number of worker processes, defaults to the number of processors
+        :param chunksize: number of files handed to a worker at once
+        :param save: save each file after editing it
+        :param loglevel: log level for the editors in the worker processes
+        :param editor_options: any other keyword arguments for MetadataEditor, eg lazy=True
+        """
+        if not callable(edits):
+            if not isinstance(edits, dict):
+                raise TypeError("Edits must be a dictionary or a callable")
+            for name in edits:
+                if name not in elements:
+                    raise KeyError("{0} is not a supported metadata element".format(name))
+
+        self.edits = edits
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self.save = save
+        self.editor_options = dict(editor_options, loglevel=loglevel)
+
+    def iter_results(self, paths):
+        """
+        Edit all files and yield a BatchResult for each of them, in the same order as paths.
+        Failing files don't stop the batch
+        :param paths: iterable of metadata file paths
+        :return: generator of BatchResult
+        """
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for result in executor.map(_edit_file, paths,
+                                       itertools.repeat(self.edits),
+                                       itertools.repeat(self.save),
+                                       itertools.repeat(self.editor_options),
+                                       chunksize=self.chunksize):
+                yield result
+
+    def run(self, paths):
+        """
+        Edit all files
+        :param paths: iterable of metadata file paths
+        :return: list of BatchResult
+        """
+        return list(self.iter_results(paths))
@@ -0,0 +1,194 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class DescribeAdapter(object):
+    """
+    The parts of arcpy.Describe the editor needs to find a dataset and its workspace.
+    Implement this to run the editor against something other than arcpy, for example in tests
+    """
+
+    def data_type(self, path):
+        """
+        :param path: string, path to a dataset, workspace or folder
+        :return: string, ArcGIS data type, like "ShapeFile", "FeatureClass" or "Workspace"
+        """
+        raise NotImplementedError
+
+    def layer_source(self, path):
+        """
+        :param path: string, name or path of a layer
+        :return: tuple of data type and catalog path of the layer's data source
+        """
+        raise NotImplementedError
+
+    def workspace_type(self, path):
+        """
+        :param path: string, path to a workspace
+        :return: string, "FileSystem", "LocalDatabase" or "RemoteDatabase"
+        """
+        raise NotImplementedError
+
+    def default_workspace(self):
+        """
+        :return: string, the workspace to use for datasets given without a directory, None if there is none
+        """
+        return None
+
+
+class ArcpyDescribeAdapter(DescribeAdapter):
+
+    @property
+    def _arcpy(self):
+        import arcpy  # only needed once something is described, editing metadata files works without it
+        return arcpy
+
+    def data_type(self, path):
+        return self._arcpy.Describe(path).dataType
+
+    def layer_source(self, path):
+        desc = self._arcpy.Describe(path)
+        return desc.dataElement.dataType, desc.dataElement.catalogPath
+
+    def workspace_type(self, path):
+        return self._arcpy.Describe(path).workspaceType
+
+    def default_workspace(self):
+        return self._arcpy.env.workspace
+
+
+class DescribeCache(object):
+    """
+    Size bounded cache for data types, layer sources, workspaces and workspace types
+
+    Describe calls are slow, and opening many datasets of the same geodatabase describes the same workspace
+    over and over again. Entries are kept until they are invalidated or the least recently used ones
+    are dropped to stay below maxsize.
+    """
+
+    def __init__(self, adapter=None, maxsize=1024):
+        """
+        :param adapter: DescribeAdapter, defaults to ArcpyDescribeAdapter
+        :param maxsize: int, maximum number of cached entries
+        """
+        if adapter is None:
+            adapter = ArcpyDescribeAdapter()
+        self.adapter = adapter
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (kind, path) -> value
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _cached(self, kind, path, describe):
+        key = (kind, path)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = describe(path)
+        self._store(key, value)
+        return value
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def data_type(self, path):
+        """
+        :param path: string
+        :return: string, data type of the dataset
+        """
+        return self._cached("data_type", path, self.adapter.data_type)
+
+    def layer_source(self, path):
+        """
+        :param path: string
+        :return: tuple of data type and catalog path of the layer's data source
+        """
+        return self._cached("layer_source", path, self.adapter.layer_source)
+
+    def workspace_type(self, path):
+        """
+        :param path: string, path to a workspace
+        :return: string
+        """
+        return self._cached("workspace_type", path, self.adapter.workspace_type)
+
+    def workspace(self, path):
+        """
+        Find the workspace of a dataset
+        In case the base directory is not a workspace (ie when feature class is located in a feature dataset)
+        check the next lower base directory until criteria matches
+        :param path: string, path to the dataset
+        :return: string, path to the workspace
+        """
+        key = ("workspace", path)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        workspace = path
+        while self.data_type(workspace) not in ("Workspace", "Folder"):
+            workspace = os.path.dirname(workspace)
+            if workspace == '':
+                # depends on the current environment, so it's not cached
+                return self.adapter.default_workspace() or os.path.curdir
+
+        self._store(key, workspace)
+        return workspace
+
+    def invalidate(self, path=None):
+        """
+        Drop cached entries, for example after a dataset was deleted, renamed or replaced
+        :param path: string, drop entries for this path and everything below it. Drop all entries if None
+        :return:
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+
+            prefixes = tuple(path.rstrip(sep) + sep for sep in set([os.sep, "/"]))
+            for key in list(self._entries.keys()):
+                kind, cached_path = key
+                if cached_path == path or cached_path.startswith(prefixes) \
+                        or (kind == "workspace" and self._entries[key] == path):
+                    del self._entries[key]
+
+
+_describe_cache = None
+
+
+def get_describe_cache():
+    """
+    Get the describe cache shared by all editors of this process. It is created on first use
+    :return: DescribeCache
+    """
+    global _describe_cache
+    if _describe_cache is None:
+        _describe_cache = DescribeCache()
+    return _describe_cache
+
+
+def set_describe_cache(cache):
+    """
+    Replace the describe cache shared by all editors of this process
+    :param cache: DescribeCache, or None to create a new one with the arcpy adapter on next use
+    :return:
+    """
+    global _describe_cache
+    _describe_cache = cache
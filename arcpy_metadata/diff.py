@@ -0,0 +1,314 @@
+import os
+import hashlib
+import collections
+import concurrent.futures
+
+from arcpy_metadata.elements import elements
+from arcpy_metadata.path_resolver import PathTrie
+from arcpy_metadata.reader import extract_value
+from arcpy_metadata.xml_backend import get_backend
+
+
+class PropertyChange(collections.namedtuple("PropertyChange", ["name", "old", "new"])):
+    """
+    A metadata element from elements.py with different values. Missing elements have the value None.
+    Empty and missing elements are the same
+    """
+    __slots__ = ()
+
+
+class XmlChange(collections.namedtuple("XmlChange", ["path", "kind", "old", "new"])):
+    """
+    A difference in the XML
+     - path: path of the node from the root, like "dataIdInfo/searchKeys/keyword[2]". The index is only given
+       if there is more than one node with the tag
+     - kind: "added", "removed", "text" or "attributes"
+     - old, new: text or dictionary of attributes. The text of the node for added and removed nodes
+    """
+    __slots__ = ()
+
+
+class MetadataDiff(collections.namedtuple("MetadataDiff", ["properties", "xml"])):
+    """
+    Differences between two metadata documents
+     - properties: list of PropertyChange
+     - xml: list of XmlChange
+    """
+    __slots__ = ()
+
+    @property
+    def changed(self):
+        return bool(self.properties or self.xml)
+
+
+class FileDiff(collections.namedtuple("FileDiff", ["path", "status", "diff", "error"])):
+    """
+    Result of comparing a metadata file in two directories
+     - path: path of the file relative to the directories
+     - status: "added", "removed", "changed" or "error"
+     - diff: MetadataDiff for changed files, None otherwise
+     - error: description of the exception that stopped the comparison, None otherwise
+    """
+    __slots__ = ()
+
+
+# one path per element, so all of them are found in a single pass
+_element_paths = PathTrie(sorted(set(spec["path"] for spec in elements.values())))
+
+
+def _is_node(element):
+    return isinstance(element.tag, str)  # leaves out comments and processing instructions
+
+
+def subtree_digest(element, hashes):
+    """
+    Hash a node together with everything below it, like a Merkle tree. Two nodes have the same hash if their tags,
+    attributes, text and children are the same. Whitespace around text and tails are ignored
+    :param element: element
+    :param hashes: dictionary of element -> digest, already hashed nodes are taken from it and new ones added
+    :return: digest
+    """
+    digest = hashes.get(element)
+    if digest is not None:
+        return digest
+    parts = [element.tag.encode()]
+    for key, value in sorted(element.attrib.items()):
+        parts.append(b"\x00" + key.encode() + b"=" + value.encode())
+    text = (element.text or "").strip().encode()
+    parts.append(b"\x01%d:" % len(text) + text)  # the length keeps text apart from the child hashes
+    for child in element:
+        if _is_node(child):
+            parts.append(subtree_digest(child, hashes))
+    digest = hashes[element] = hashlib.blake2b(b"".join(parts), digest_size=16).digest()
+    return digest
+
+
+def subtree_hashes(root):
+    """
+    Hash every node of a tree, see subtree_digest
+    :param root: root element
+    :return: dictionary of element -> digest
+    """
+    hashes = {}
+    subtree_digest(root, hashes)
+    return hashes
+
+
+class _Document(object):
+    """
+    Nodes are hashed when they are first compared, so branches that are never reached aren't hashed at all
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.hashes = {}
+        self._paths = None
+
+    def digest(self, element):
+        return subtree_digest(element, self.hashes)
+
+    @property
+    def paths(self):
+        if self._paths is None:
+            self._paths = _element_paths.resolve(self.root)
+        return self._paths
+
+    def node(self, path):
+        found = self.paths.findall(path)
+        return found[0] if found else None
+
+
+def _property_value(element, spec):
+    if element is None:
+        return None
+    try:
+        return extract_value(element, spec)
+    except ValueError:  # can't be decoded, compare the text instead
+        return element.text
+
+
+def _is_empty(value):
+    # the editor adds empty elements for everything it binds, they count as missing
+    if isinstance(value, dict):
+        return all(_is_empty(v) for v in value.values())
+    if isinstance(value, list):
+        return all(_is_empty(v) for v in value)
+    return value is None or value == ""
+
+
+def _diff_properties(a, b):
+    changes = []
+    for name in elements:
+        spec = elements[name]
+        node_a = a.node(spec["path"])
+        node_b = b.node(spec["path"])
+        if node_a is None and node_b is None:
+            continue
+        if node_a is not None and node_b is not None and a.digest(node_a) == b.digest(node_b):
+            continue
+        old = _property_value(node_a, spec)
+        new = _property_value(node_b, spec)
+        if old != new and not (_is_empty(old) and _is_empty(new)):
+            changes.append(PropertyChange(name, old, new))
+    return changes
+
+
+def _children_by_tag(element):
+    children = collections.OrderedDict()
+    for child in element:
+        if _is_node(child):
+            children.setdefault(child.tag, []).append(child)
+    return children
+
+
+def _child_path(path, tag, index, count):
+    step = "{0}[{1}]".format(tag, index + 1) if count > 1 else tag
+    return "{0}/{1}".format(path, step) if path else step
+
+
+def _diff_xml(a, b, node_a, node_b, path, changes):
+    if a.digest(node_a) == b.digest(node_b):
+        return  # the same down to the leaves, nothing to walk
+
+    text_a = (node_a.text or "").strip()
+    text_b = (node_b.text or "").strip()
+    if text_a != text_b:
+        changes.append(XmlChange(path or ".", "text", text_a, text_b))
+    if dict(node_a.attrib) != dict(node_b.attrib):
+        changes.append(XmlChange(path or ".", "attributes", dict(node_a.attrib), dict(node_b.attrib)))
+
+    # children are paired by tag and position among the children with that tag
+    children_a = _children_by_tag(node_a)
+    children_b = _children_by_tag(node_b)
+    for tag in list(children_a.keys()) + [tag for tag in children_b if tag not in children_a]:
+        list_a = children_a.get(tag, [])
+        list_b = children_b.get(tag, [])
+        count = max(len(list_a), len(list_b))
+        for index in range(count):
+            child_path = _child_path(path, tag, index, count)
+            if index >= len(list_b):
+                changes.append(XmlChange(child_path, "removed", list_a[index].text, None))
+            elif index >= len(list_a):
+                changes.append(XmlChange(child_path, "added", None, list_b[index].text))
+            else:
+                _diff_xml(a, b, list_a[index], list_b[index], child_path, changes)
+
+
+def diff_trees(root_a, root_b, properties=True, xml=True):
+    """
+    Compare two metadata documents. Nodes are hashed as they are compared, from the root down, and branches with
+    the same hash are skipped without walking them
+    :param root_a: root element of the old document
+    :param root_b: root element of the new document
+    :param properties: boolean, compare the elements of elements.py
+    :param xml: boolean, compare the XML nodes
+    :return: MetadataDiff
+    """
+    a = _Document(root_a)
+    b = _Document(root_b)
+
+    xml_changes = []
+    if xml:
+        if root_a.tag != root_b.tag:
+            xml_changes.append(XmlChange(".", "removed", root_a.text, None))
+            xml_changes.append(XmlChange(".", "added", None, root_b.text))
+        else:
+            _diff_xml(a, b, root_a, root_b, "", xml_changes)
+        if not xml_changes:
+            return MetadataDiff([], [])  # the roots have the same hash
+    # without xml only the nodes of the elements are hashed
+    return MetadataDiff(_diff_properties(a, b) if properties else [], xml_changes)
+
+
+def diff(editor_a, editor_b, properties=True, xml=True):
+    """
+    Compare the metadata of two editors, including changes that weren't saved yet
+    :param editor_a: MetadataEditor with the old metadata
+    :param editor_b: MetadataEditor with the new metadata
+    :param properties: boolean, compare the elements of elements.py
+    :param xml: boolean, compare the XML nodes
+    :return: MetadataDiff
+    """
+    return diff_trees(editor_a.elements.getroot(), editor_b.elements.getroot(), properties, xml)
+
+
+def _same_content(path_a, path_b, block_size=1 << 16):
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    with open(path_a, "rb") as file_a, open(path_b, "rb") as file_b:
+        while True:
+            block_a = file_a.read(block_size)
+            if block_a != file_b.read(block_size):
+                return False
+            if not block_a:
+                return True
+
+
+def diff_files(path_a, path_b, properties=True, xml=True, xml_backend=None):
+    """
+    Compare two metadata files. Files with the same bytes aren't parsed
+    :param path_a: string, path to the old metadata file
+    :param path_b: string, path to the new metadata file
+    :param properties: boolean, compare the elements of elements.py
+    :param xml: boolean, compare the XML nodes
+    :param xml_backend: "lxml", "stdlib" or None for the default
+    :return: MetadataDiff
+    """
+    if _same_content(path_a, path_b):
+        return MetadataDiff([], [])
+    backend = get_backend(xml_backend)
+    return diff_trees(backend.parse(path_a).getroot(), backend.parse(path_b).getroot(), properties, xml)
+
+
+def _metadata_files(directory, extension):
+    found = set()
+    for dirpath, dirnames, filenames in os.walk(directory):
+        for filename in filenames:
+            if filename.endswith(extension):
+                found.add(os.path.relpath(os.path.join(dirpath, filename), directory))
+    return found
+
+
+def _diff_pair(directory_a, directory_b, path, properties, xml, xml_backend):
+    """
+    Compare one file of both directories. Runs inside the worker processes, so it must not raise
+    """
+    try:
+        result = diff_files(os.path.join(directory_a, path), os.path.join(directory_b, path),
+                            properties, xml, xml_backend)
+    except Exception as e:
+        return FileDiff(path, "error", None, "{0}: {1}".format(type(e).__name__, e))
+    if result.changed:
+        return FileDiff(path, "changed", result, None)
+    return None
+
+
+def diff_directories(directory_a, directory_b, extension=".xml", properties=True, xml=True, xml_backend=None,
+                     max_workers=None, chunksize=64):
+    """
+    Compare two snapshots of a directory of metadata files, using a pool of worker processes. Files are matched by
+    their path relative to the directories. On Windows, call it inside an `if __name__ == "__main__":` block.
+    :param directory_a: string, old snapshot
+    :param directory_b: string, new snapshot
+    :param extension: string, only compare files ending with it
+    :param properties: boolean, compare the elements of elements.py
+    :param xml: boolean, compare the XML nodes
+    :param xml_backend: "lxml", "stdlib" or None for the default
+    :param max_workers: number of worker processes, defaults to the number of processors
+    :param chunksize: number of files handed to a worker at once
+    :return: list of FileDiff for the files that differ, sorted by path
+    """
+    files_a = _metadata_files(directory_a, extension)
+    files_b = _metadata_files(directory_b, extension)
+
+    results = [FileDiff(path, "removed", None, None) for path in files_a - files_b]
+    results.extend(FileDiff(path, "added", None, None) for path in files_b - files_a)
+
+    common = sorted(files_a & files_b)
+    n = len(common)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for result in executor.map(_diff_pair, [directory_a] * n, [directory_b] * n, common, [properties] * n,
+                                   [xml] * n, [xml_backend] * n, chunksize=chunksize):
+            if result is not None:
+                results.append(result)
+    return sorted(results, key=lambda result: result.path)
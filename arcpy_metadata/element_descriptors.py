@@ -0,0 +1,273 @@
+import warnings
+
+from arcpy_metadata.metadata_constructors import MetadataItem
+from arcpy_metadata.metadata_constructors import MetadataValueList
+from arcpy_metadata.metadata_constructors import MetadataParentItem
+from arcpy_metadata.metadata_constructors import MetadataObjectList
+from arcpy_metadata.metadata_constructors import MetadataValueListHelper
+from arcpy_metadata.metadata_constructors import MetadataObjectListHelper
+from arcpy_metadata.value_codecs import codecs, enum_map
+
+
+class ElementDescriptor(object):
+    """
+    Property of MetadataEditor for one element of elements.py. Reading it type casts the value of the bound item,
+    setting it checks the value and writes it to the item. Elements are bound on first access in lazy mode.
+    Everything that only depends on the element's definition is looked up once, when the descriptor is created
+    """
+
+    __slots__ = ("name", "key", "spec", "path", "sync", "deprecation", "unsupported")
+
+    def __init__(self, name, spec):
+        """
+        :param name: string, name of the element
+        :param spec: dictionary, definition of the element in elements.py
+        """
+        self.name = name
+        self.key = "_{0}".format(name)  # where the bound item is kept in the editor's __dict__
+        self.spec = spec
+        self.path = spec["path"]
+        self.sync = spec.get("sync")
+        self.deprecation = None
+        if "deprecated" in spec:
+            self.deprecation = "Call to deprecated property {0}. {1}".format(name, spec["deprecated"])
+        self.unsupported = frozenset(spec.get("unsupported", []))
+
+    def __get__(self, editor, owner=None):
+        if editor is None:
+            return self
+
+        if self.deprecation is not None:
+            warnings.warn(self.deprecation, category=DeprecationWarning)
+
+        if editor.data_type in self.unsupported:
+            raise AttributeError(f"Key {self.name} unsupported for data type {editor.data_type}")
+
+        item = editor.__dict__.get(self.key)
+        if item is None:
+            if self.key not in editor.__dict__ and editor.read_only:
+                return editor._read_element(self.name)
+
+            if self.key not in editor.__dict__ and editor.lazy:
+                editor._bind_element(self.name)
+
+            if self.key not in editor.__dict__:  # return a blanket None if we don't have the key, regardless
+                raise AttributeError(f"Key {self.key} not available in metadata or in this interface")
+            item = editor.__dict__[self.key]
+
+        return self.get(item)
+
+    def __set__(self, editor, value):
+        if editor.read_only:
+            raise PermissionError(f"Can't set {self.name} - metadata was opened read only")
+
+        # internal writes go through set() directly, so only calls made by the user get here
+        if self.deprecation is not None:
+            warnings.warn(self.deprecation, category=DeprecationWarning)
+
+        if editor.data_type in self.unsupported:
+            raise RuntimeWarning(f"Can't set key {self.name} - key is unsupported for data type {editor.data_type}")
+
+        if editor.lazy and self.key not in editor.__dict__:
+            editor._bind_element(self.name)
+
+        tracking = editor._tracking
+        before = editor._snapshot(self.name) if tracking else None
+        self.set(editor, editor.__dict__[self.key], value)
+        if tracking and editor._snapshot(self.name) != before:
+            editor._mark_changed(self.path)
+
+    def bind(self, editor):
+        """
+        Create the item for the element's node, missing nodes get created
+        :param editor: MetadataEditor
+        :return: item
+        """
+        item = MetadataItem(self.path, self.name, editor, self.sync)
+        editor.__dict__[self.key] = item
+        return item
+
+    def get(self, item):
+        """
+        :param item: the bound item
+        :return: the value of the element
+        """
+        return item.value
+
+    def set(self, editor, item, value):
+        """
+        Check a value and write it to the bound item, without tracking the change
+        :param editor: MetadataEditor
+        :param item: the bound item
+        :param value: new value
+        :return:
+        """
+        raise NotImplementedError
+
+
+class StringDescriptor(ElementDescriptor):
+
+    __slots__ = ()
+
+    def bind(self, editor):
+        item = super().bind(editor)
+        self.set(editor, item, item.value.strip() if item.value is not None else None)
+        return item
+
+    def set(self, editor, item, value):
+        if isinstance(value, (str, bytes)):
+            item.value = value
+        elif value is None:
+            item.value = ""
+        else:
+            raise RuntimeWarning("Input value must be of type String")
+
+
+class CodecDescriptor(ElementDescriptor):
+    """
+    Integer, float, datetime, date and time elements, converted by the codec registered for their type
+    """
+
+    __slots__ = ("element_type",)
+
+    def __init__(self, name, spec):
+        super().__init__(name, spec)
+        self.element_type = spec["type"]
+
+    def bind(self, editor):
+        item = super().bind(editor)
+        try:
+            # write the value back in the format the codec writes
+            self.set(editor, item, item.value.strip() if item.value is not None else None)
+        except RuntimeWarning:
+            # leave text that can't be decoded as it is, reading the element raises the error
+            editor.logger.debug("{0} has an invalid value. SKIP".format(self.name))
+        return item
+
+    def get(self, item):
+        return codecs[self.element_type].decode(item.value)  # codecs can be replaced with register_codec
+
+    def set(self, editor, item, value):
+        item.value = codecs[self.element_type].encode(value)
+
+
+class AttributeDescriptor(ElementDescriptor):
+    """
+    Elements stored as a code in an attribute, read and set with their label
+    """
+
+    __slots__ = ("attribute", "enum")
+
+    def __init__(self, name, spec):
+        super().__init__(name, spec)
+        self.attribute = spec["key"]
+        self.enum = enum_map(spec["values"])
+
+    def bind(self, editor):
+        item = super().bind(editor)
+        label = self.enum.label(item.attributes.get(self.attribute))
+        if label is not None:
+            self.set(editor, item, label)
+        return item
+
+    def get(self, item):
+        code = item.attributes.get(self.attribute)
+        if code is None:
+            return None
+        return self.enum.label(code)
+
+    def set(self, editor, item, value):
+        code = self.enum.code(value) if isinstance(value, (str, bytes)) else None
+        if code is None:
+            raise RuntimeWarning("Input value must be one of: {0}".format(self.enum.values))
+        item.attributes[self.attribute] = code
+
+
+class ListDescriptor(ElementDescriptor):
+
+    __slots__ = ()
+
+    def bind(self, editor):
+        item = MetadataValueList(self.spec["tagname"], self.path, self.name, editor, self.sync)
+        editor.__dict__[self.key] = item
+        return item
+
+    def get(self, item):
+        return MetadataValueListHelper(item)
+
+    def set(self, editor, item, value):
+        if isinstance(value, (list, MetadataValueListHelper)) and list(value) == item.value:
+            pass  # same values, leave the tree alone
+        elif isinstance(value, (list, MetadataValueListHelper)):
+            item.value = value
+        else:
+            raise RuntimeWarning("Input value must be of type List")
+
+
+class ParentItemDescriptor(ElementDescriptor):
+
+    __slots__ = ()
+
+    def bind(self, editor):
+        # TODO: turn on sync
+        item = MetadataParentItem(self.path, editor, self.spec["elements"])
+        editor.__dict__[self.key] = item
+        return item
+
+    def get(self, item):
+        return item
+
+    def set(self, editor, item, value):
+        if isinstance(value, MetadataParentItem):
+            editor.__dict__[self.key] = value
+        else:
+            raise RuntimeWarning("Input value must be a MetadataParentItem object")
+
+
+class ObjectListDescriptor(ElementDescriptor):
+
+    __slots__ = ()
+
+    def bind(self, editor):
+        item = MetadataObjectList(self.spec["tagname"], self.path, editor, self.spec["elements"], self.sync)
+        editor.__dict__[self.key] = item
+        return item
+
+    def get(self, item):
+        return MetadataObjectListHelper(item)
+
+    def set(self, editor, item, value):
+        if isinstance(value, (list, MetadataObjectList)):
+            item.value = value
+        else:
+            raise RuntimeWarning("Input value must be a MetadataOnlineResource object")
+
+
+# element type -> descriptor class
+descriptor_types = {
+    "string": StringDescriptor,
+    "integer": CodecDescriptor,
+    "float": CodecDescriptor,
+    "datetime": CodecDescriptor,
+    "date": CodecDescriptor,
+    "time": CodecDescriptor,
+    "attribute": AttributeDescriptor,
+    "list": ListDescriptor,
+    "parent_item": ParentItemDescriptor,
+    "object_list": ObjectListDescriptor,
+}
+
+
+def make_descriptors(cls, element_definitions):
+    """
+    Add a descriptor for each element to a class
+    :param cls: class, like MetadataEditor
+    :param element_definitions: dictionary of element name -> definition, like elements in elements.py
+    :return: dictionary of element name -> descriptor
+    """
+    descriptors = {}
+    for name in element_definitions:
+        spec = element_definitions[name]
+        descriptor = descriptors[name] = descriptor_types[spec["type"]](name, spec)
+        setattr(cls, name, descriptor)
+    return descriptors
@@ -0,0 +1,197 @@
+import os
+import shutil
+import tempfile
+import xml.sax
+from datetime import datetime, date
+from xml.sax.saxutils import XMLGenerator
+
+lineage_path = "Esri/DataProperties/lineage"
+_lineage_steps = lineage_path.split("/")
+
+
+class RetentionPolicy(object):
+    """
+    Decides which entries of the geoprocessing history to keep. An entry is kept if it matches any of the given
+    rules. Without any rule, nothing is kept
+    """
+
+    def __init__(self, keep_last=None, after=None, tools=None):
+        """
+        :param keep_last: int, keep the last n entries
+        :param after: datetime or date, keep entries that ran later than this. A date means midnight of that day
+        :param tools: list of tool names, keep entries of these tools (the Name attribute of the entry)
+        """
+        if after is not None and not isinstance(after, datetime):
+            if isinstance(after, date):
+                after = datetime(after.year, after.month, after.day)
+            else:
+                raise TypeError("after must be a datetime or a date")
+        self.keep_last = keep_last
+        self.after = after
+        self.tools = set(tools) if tools is not None else None
+
+    def keeps(self, attributes, position, total):
+        """
+        :param attributes: mapping of the Process element's attributes
+        :param position: int, 0 based position of the entry in the history
+        :param total: int, number of entries in the history
+        :return: boolean
+        """
+        return self.in_last(position, total) or self.matches(attributes)
+
+    def in_last(self, position, total):
+        """
+        :return: boolean, True if the entry at this position is one of the last keep_last entries
+        """
+        return self.keep_last is not None and position >= total - self.keep_last
+
+    def matches(self, attributes):
+        """
+        :param attributes: mapping of the Process element's attributes
+        :return: boolean, True if the entry is kept because of its tool or date
+        """
+        if self.tools is not None and attributes.get("Name") in self.tools:
+            return True
+        if self.after is not None:
+            timestamp = _timestamp(attributes)
+            if timestamp is not None and timestamp > self.after:
+                return True
+        return False
+
+
+def _timestamp(attributes):
+    """
+    Read when a geoprocessing tool ran from the Date (yyyymmdd) and Time (hhmmss) attributes of its entry
+    :return: datetime, None if there is no valid date
+    """
+    try:
+        day = datetime.strptime(attributes.get("Date", "")[:8], "%Y%m%d")
+    except ValueError:
+        return None
+    clock = attributes.get("Time", "")[:6]
+    if len(clock) == 6 and clock.isdigit():
+        return day.replace(hour=int(clock[:2]) % 24, minute=int(clock[2:4]) % 60, second=int(clock[4:]) % 60)
+    return day
+
+
+def prune(lineage, policy):
+    """
+    Remove the entries the policy doesn't keep from a lineage element, rebuilding its children in a single pass
+    :param lineage: the Esri/DataProperties/lineage element
+    :param policy: RetentionPolicy
+    :return: list of the removed Process elements
+    """
+    processes = [child for child in lineage if child.tag == "Process"]
+    total = len(processes)
+    removed = [process for position, process in enumerate(processes)
+               if not policy.keeps(process.attrib, position, total)]
+    if removed:
+        removed_ids = set(id(process) for process in removed)
+        lineage[:] = [child for child in lineage if id(child) not in removed_ids]
+    return removed
+
+
+class _LineageScanner(xml.sax.handler.ContentHandler):
+    """
+    Finds the entries of the geoprocessing history and notes for each if the policy keeps it because of its
+    tool or date
+    """
+
+    def __init__(self, policy):
+        super().__init__()
+        self.policy = policy
+        self.matches = bytearray()
+        self._stack = []
+
+    def _in_lineage(self):
+        return self._stack[1:] == _lineage_steps
+
+    def startElement(self, name, attrs):
+        if name == "Process" and self._in_lineage():
+            self.matches.append(self.policy.matches(attrs))
+        self._stack.append(name)
+
+    def endElement(self, name):
+        self._stack.pop()
+
+
+class _PruningHandler(xml.sax.handler.ContentHandler):
+    """
+    Writes the document through, except for the entries of the geoprocessing history that are not kept
+    """
+
+    def __init__(self, keep, out):
+        super().__init__()
+        self._keep = keep  # one flag per entry
+        self._position = 0
+        self._stack = []
+        self._skip_depth = 0
+        self._writer = XMLGenerator(out, encoding="utf-8", short_empty_elements=True)
+
+    def startDocument(self):
+        self._writer.startDocument()
+
+    def endDocument(self):
+        self._writer.endDocument()
+
+    def startElement(self, name, attrs):
+        if not self._skip_depth and name == "Process" and self._stack[1:] == _lineage_steps:
+            if not self._keep[self._position]:
+                self._skip_depth = 1
+            self._position += 1
+        elif self._skip_depth:
+            self._skip_depth += 1
+        self._stack.append(name)
+        if not self._skip_depth:
+            self._writer.startElement(name, attrs)
+
+    def endElement(self, name):
+        self._stack.pop()
+        if self._skip_depth:
+            self._skip_depth -= 1
+        else:
+            self._writer.endElement(name)
+
+    def characters(self, content):
+        if not self._skip_depth:
+            self._writer.characters(content)
+
+    def ignorableWhitespace(self, content):
+        if not self._skip_depth:
+            self._writer.ignorableWhitespace(content)
+
+    def processingInstruction(self, target, data):
+        if not self._skip_depth:
+            self._writer.processingInstruction(target, data)
+
+
+def prune_file(metadata_file, policy, output_file=None):
+    """
+    Prune the geoprocessing history of a metadata file without loading the document into memory.
+    The file is read twice: once to find the entries to remove, once to write everything else.
+    Comments are not carried over
+    :param metadata_file: string, path to the XML file
+    :param policy: RetentionPolicy
+    :param output_file: string, defaults to replacing metadata_file
+    :return: int, number of removed entries
+    """
+    scanner = _LineageScanner(policy)
+    xml.sax.parse(metadata_file, scanner)
+    total = len(scanner.matches)
+    keep = bytearray(scanner.matches[position] or policy.in_last(position, total) for position in range(total))
+    removed = total - sum(keep)
+
+    target = output_file if output_file is not None else metadata_file
+    if removed == 0 and os.path.abspath(target) == os.path.abspath(metadata_file):
+        return 0
+
+    handle, temp_file = tempfile.mkstemp(suffix=".xml", dir=os.path.dirname(os.path.abspath(target)))
+    try:
+        with os.fdopen(handle, "wb") as out:
+            xml.sax.parse(metadata_file, _PruningHandler(keep, out))
+        shutil.copymode(metadata_file, temp_file)
+        os.replace(temp_file, target)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+    return removed
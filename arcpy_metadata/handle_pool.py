@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+
+
+def _arcpy_metadata_handle(dataset):
+    import arcpy  # only needed once a handle is opened
+    return arcpy.metadata.Metadata(dataset)
+
+
+class MetadataHandlePool(object):
+    """
+    Shares arcpy.metadata.Metadata handles between editors of the same dataset
+
+    An editor acquires the handle of its dataset when it exports the metadata and releases it when it is closed.
+    Released handles stay in the pool, so opening the same dataset again reuses the handle instead of creating a
+    new one. Up to max_idle released handles are kept, the least recently used ones are dropped first.
+    Close the pool to release all handles and the locks they may hold.
+    """
+
+    def __init__(self, factory=None, max_idle=64):
+        """
+        :param factory: callable(dataset) returning a new handle, defaults to arcpy.metadata.Metadata
+        :param max_idle: int, maximum number of handles kept while no editor uses them
+        """
+        if factory is None:
+            factory = _arcpy_metadata_handle
+        self.factory = factory
+        self.max_idle = max_idle
+        self.hits = 0
+        self.misses = 0
+        self._handles = {}  # dataset -> handle
+        self._users = {}  # dataset -> number of editors using the handle
+        self._idle = OrderedDict()  # datasets whose handle no editor uses, least recently used first
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._handles)
+
+    def __contains__(self, dataset):
+        return dataset in self._handles
+
+    def acquire(self, dataset):
+        """
+        Get the handle of a dataset, it is created if the pool has none yet
+        Each call must be followed by a call to release() once the handle is no longer used
+        :param dataset: string, path to the dataset
+        :return: handle
+        """
+        with self._lock:
+            if dataset in self._handles:
+                self.hits += 1
+                self._idle.pop(dataset, None)
+                self._users[dataset] += 1
+                return self._handles[dataset]
+            self.misses += 1
+
+        handle = self.factory(dataset)
+        with self._lock:
+            if dataset in self._handles:  # another thread was faster, use its handle
+                handle = self._handles[dataset]
+                self._idle.pop(dataset, None)
+                self._users[dataset] += 1
+            else:
+                self._handles[dataset] = handle
+                self._users[dataset] = 1
+        return handle
+
+    def release(self, dataset):
+        """
+        Give back the handle of a dataset. It stays in the pool for the next editor of the dataset
+        :param dataset: string, path to the dataset
+        :return:
+        """
+        with self._lock:
+            if dataset not in self._users:  # discarded or closed in the meantime
+                return
+            self._users[dataset] -= 1
+            if self._users[dataset] == 0:
+                self._idle[dataset] = True
+                while len(self._idle) > self.max_idle:
+                    self._drop(self._idle.popitem(last=False)[0])
+
+    def discard(self, dataset):
+        """
+        Drop the handle of a dataset, for example after it was deleted or replaced. Editors still using the handle
+        keep it until they are closed
+        :param dataset: string, path to the dataset
+        :return:
+        """
+        with self._lock:
+            self._idle.pop(dataset, None)
+            self._drop(dataset)
+
+    def _drop(self, dataset):
+        self._handles.pop(dataset, None)
+        self._users.pop(dataset, None)
+
+    def close(self):
+        """
+        Drop all handles
+        :return:
+        """
+        with self._lock:
+            self._handles.clear()
+            self._users.clear()
+            self._idle.clear()
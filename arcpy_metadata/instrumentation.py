@@ -0,0 +1,139 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class PhaseStats(object):
+    """
+    Call count and wall time of one phase
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self):
+        return "PhaseStats(count={0}, total={1:.6f}, mean={2:.6f}, max={3:.6f})".format(
+            self.count, self.total, self.mean, self.max)
+
+
+class MetadataStats(object):
+    """
+    Wall time and call counts per phase, like "describe", "export", "parse", "bind", "save.write" or "cleanup"
+
+    One stats object can be shared by many editors to get totals for a whole run
+    """
+
+    def __init__(self):
+        self.phases = OrderedDict()  # phase name -> PhaseStats
+        self._lock = threading.Lock()
+
+    def add(self, phase, seconds):
+        """
+        Record one call of a phase
+        :param phase: string
+        :param seconds: float
+        :return:
+        """
+        with self._lock:
+            stats = self.phases.get(phase)
+            if stats is None:
+                stats = self.phases[phase] = PhaseStats()
+            stats.count += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+
+    def __getitem__(self, phase):
+        return self.phases[phase]
+
+    def __contains__(self, phase):
+        return phase in self.phases
+
+    def reset(self):
+        with self._lock:
+            self.phases.clear()
+
+    def as_dict(self):
+        """
+        :return: dictionary of phase name -> dictionary with count, total, mean and max
+        """
+        return OrderedDict((phase, {"count": stats.count, "total": stats.total, "mean": stats.mean, "max": stats.max})
+                           for phase, stats in self.phases.items())
+
+    def __repr__(self):
+        return "\n".join("{0}: {1!r}".format(phase, stats) for phase, stats in self.phases.items())
+
+
+class _Phase(object):
+
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+
+
+class PhaseTimer(object):
+    """
+    Times phases of an editor: `with timer("parse"): ...`
+    Each phase is added to the stats and passed to the callback as callback(editor, phase, seconds)
+    """
+
+    def __init__(self, editor, stats=None, callback=None):
+        self.editor = editor
+        self.stats = stats
+        self.callback = callback
+
+    def __call__(self, name):
+        return _Phase(self, name)
+
+    def record(self, name, seconds):
+        if self.stats is not None:
+            self.stats.add(name, seconds)
+        if self.callback is not None:
+            self.callback(self.editor, name, seconds)
+
+
+class _NullTimer(object):
+    """
+    Used when instrumentation is off. Calling it returns itself, and entering or leaving it does nothing
+    """
+
+    __slots__ = ()
+
+    def __call__(self, name):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+null_timer = _NullTimer()
+
+
+def make_timer(editor, stats=None, callback=None):
+    """
+    :param editor: the editor passed to the callback
+    :param stats: MetadataStats or None
+    :param callback: callable(editor, phase, seconds) or None
+    :return: PhaseTimer, or null_timer if neither stats nor callback are given
+    """
+    if stats is None and callback is None:
+        return null_timer
+    return PhaseTimer(editor, stats, callback)
@@ -1,11 +1,14 @@
-import copy
-import xml.etree.ElementTree as ET
+from arcpy_metadata.reader import extract_child_value
+from arcpy_metadata.value_codecs import enum_map
 
 
 class MetadataValueListHelper(object):
     """
     A helper class to have value list items behave like a python list
     """
+
+    __slots__ = ("list_items",)
+
     def __init__(self, list_items):
         if isinstance(list_items, MetadataValueListConstructor):
             self.list_items = list_items
@@ -16,7 +19,13 @@ class MetadataValueListHelper(object):
         return self.list_items.current_items[index].text
 
     def __setitem__(self, index, value):
-        self.list_items.current_items[index].text = value
+        self.list_items._set_text(index, value)
+
+    def __contains__(self, value):
+        return value in self.list_items
+
+    def __iter__(self):
+        return iter(self.list_items.value)
 
     def __repr__(self):
         return repr(self.list_items.value)
@@ -41,6 +50,22 @@ class MetadataValueListHelper(object):
         """
         self.list_items.insert(index, value)
 
+    def extend(self, values):
+        """
+        Append all given items to the list in one step
+        :param values: iterable
+        :return:
+        """
+        self.list_items.extend(values)
+
+    def update(self, values):
+        """
+        Append the given items that are not in the list yet
+        :param values: iterable
+        :return:
+        """
+        self.list_items.update(values)
+
     def remove(self, value):
         """
         Remove given item from list
@@ -49,6 +74,14 @@ class MetadataValueListHelper(object):
         """
         self.list_items.remove(value)
 
+    def discard_many(self, values):
+        """
+        Remove all items with any of the given values from the list. Values that are not in the list are ignored
+        :param values: iterable
+        :return:
+        """
+        self.list_items.discard_many(values)
+
     def pop(self):
         """
         Remove last list item
@@ -68,6 +101,9 @@ class MetadataObjectListHelper(object):
     """
     A helper class to have value list items behave like a python list
     """
+
+    __slots__ = ("list_objects",)
+
     def __init__(self, list_objects):
         if isinstance(list_objects, MetadataObjectListConstructor):
             self.list_objects = list_objects
@@ -78,7 +114,13 @@ class MetadataObjectListHelper(object):
         return self.list_objects.current_items[index]
 
     def __setitem__(self, index, value):
-        self.list_objects.current_items[index] = value
+        items = self.list_objects.current_items
+        if isinstance(items[index], MetadataParentItemConstructor):
+            items[index]._owner = None
+        if isinstance(value, MetadataParentItemConstructor):
+            value._owner = self.list_objects
+        items[index] = value
+        self.list_objects._index = None
 
     def __repr__(self):
         return repr(self.list_objects.current_items)
@@ -86,12 +128,24 @@ class MetadataObjectListHelper(object):
     def __len__(self):
         return len(self.list_objects.current_items)
 
+    def __iter__(self):
+        return iter(self.list_objects.current_items)
+
     def new(self):
         """
         Add a new object to the list
-        :return:
+        :return: the new object
         """
-        self.list_objects.new()
+        return self.list_objects.new()
+
+    def get(self, name, default=None):
+        """
+        Find an object by name, like a field by its label
+        :param name: string
+        :param default: returned if there is no object with this name
+        :return: object
+        """
+        return self.list_objects.get(name, default)
 
     def remove(self, value):
         """
@@ -114,45 +168,49 @@ class MetadataItemConstructor(object):
     A standard Metadata Item
     '''
 
-    path = None
-    sync = None
+    # items don't get a __dict__, an editor holds well over a hundred of them
+    __slots__ = ("parent", "element", "path", "sync", "__weakref__")
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, element=None):
         self.parent = parent
         try:
             self.parent.elements
         except AttributeError:
             self.parent = parent.parent
-        self.element = None
-        self._require_tree_elements()
+        # items bound to a given element keep it for good, there is no path to look it up again
+        self.element = element
+        if element is None:
+            self._require_tree_elements()
+            self.parent._add_handle(self)
 
         # set current metadata value and attributes
-        element = self.parent.elements.find(self.path)
+        element = self.element
         if element is not None and element.text is not None:
-            self.value = self.parent.elements.find(self.path).text.strip()
+            self.value = element.text.strip()
         else:
             self.value = None
         
         if element is not None:
-            self.attributes = element.attrib
+            self.attributes = dict(element.attrib)
         else:
             self.attributes = {}
 
-        if self.sync is not None:
-            if self.sync:
+        sync = getattr(self, "sync", None)
+        if sync is not None:
+            if sync:
                 self.attributes["Sync"] = "TRUE"
             else:
                 self.attributes["Sync"] = "FALSE"
 
     @property
     def attributes(self):
-        return self.parent.elements.find(self.path).attrib
+        return self._get_element().attrib
 
     @attributes.setter
     def attributes(self, v):
         if isinstance(v, dict):
             if self.parent:
-                item = self.parent.elements.find(self.path)
+                item = self._get_element()
                 for attribute in v:
                     item.set(attribute, v[attribute])  # set the value, it will be written later
             if not self.parent:
@@ -163,19 +221,28 @@ class MetadataItemConstructor(object):
 
     @property
     def value(self):
-        node = self.parent.elements.find(self.path)
+        node = self._get_element()
         return node.text
 
     @value.setter
     def value(self, v):
         if self.parent:
-            item = self.parent.elements.find(self.path)
+            item = self._get_element()
             item.text = v  # set the value, it will be written later
         if not self.parent:
             raise ValueError(
                 "Can't write values without being contained in a Metadata Editor list or without manually initializing"
                 " self.parent to an instance of MetadataEditor")
 
+    def _get_element(self):
+        """
+        Get the node of this item. The node is kept until a structural change removes it or one of its ancestors
+        from the tree, only then it gets looked up again
+        :return: element
+        """
+        if self.element is None:
+            self.element = self.parent.elements.find(self.path)
+        return self.element
 
     def _require_tree_elements(self):
         """
@@ -185,8 +252,7 @@ class MetadataItemConstructor(object):
         root = self.parent.elements.getroot()
 
         #try:
-        if root.findall(self.path) is not None:
-            elements = root.findall(self.path)
+        elements = self.parent._findall(self.path)
         #except KeyError:
         #    elements = self._build_tree(e_tree, root)
         #except SyntaxError:
@@ -209,6 +275,7 @@ class MetadataItemConstructor(object):
         # otherwise build the tree
         else:
             self._build_tree(e_tree, root)
+            self.parent._paths.record(self.path, self.element)
 
     def _build_tree(self, e_tree, root):
         done = False
@@ -244,7 +311,7 @@ class MetadataItemConstructor(object):
         return d
 
     def _insert_subtree(self, d, i, e_name, e_attrib):
-        child = ET.Element(e_name)
+        child = self.parent._xml.Element(e_name)
         for attrib in e_attrib:
             if attrib[0] == "@":
                 kv = attrib.split('=')
@@ -261,25 +328,47 @@ class MetadataValueListConstructor(MetadataItemConstructor):
         subitem to store there (self.tag_name) and you can use list-like methods to edit the group
     """
 
-    tag_name = None
-    path = None
+    __slots__ = ("tag_name", "current_items", "_counts")
 
     def __init__(self, parent=None, tagname=None, path=None):
 
-        if not self.tag_name:
+        if getattr(self, "tag_name", None) is None:
             self.tag_name = tagname
 
         if path:
             self.path = path
 
         self.current_items = []
+        self._counts = {}  # value -> number of items with this value
 
         super().__init__(parent)
 
-        values = []
-        for item in self.parent.elements.find(self.path):
-            values.append(item.text)
-        self.value = values
+        # take the existing items as they are
+        for item in self._get_element():
+            if item.tag == self.tag_name:
+                self.current_items.append(item)
+                self._count(item.text, 1)
+
+    def _count(self, value, n):
+        count = self._counts.get(value, 0) + n
+        if count > 0:
+            self._counts[value] = count
+        else:
+            self._counts.pop(value, None)
+
+    def _new_element(self, value):
+        element = self.parent._xml.Element(self.tag_name)
+        element.text = value
+        self._count(value, 1)
+        return element
+
+    def _set_text(self, index, value):
+        element = self.current_items[index]
+        if element.text != value:
+            self._count(element.text, -1)
+            self._count(value, 1)
+            element.text = value
+            self.parent._mark_changed(self.path)
 
     @property
     def value(self):
@@ -290,15 +379,18 @@ class MetadataValueListConstructor(MetadataItemConstructor):
 
     @value.setter
     def value(self, v):
-        self._removeall()
         if v is None or v == "":
-            pass
+            self._removeall()
         elif isinstance(v, (list, MetadataValueListHelper)):
-            for value in v:
-                self.append(value)
+            values = list(v)  # v can be this list itself
+            self._removeall()
+            self.extend(values)
         else:
             raise RuntimeWarning("Input value must be a List or None")
 
+    def __contains__(self, value):
+        return value in self._counts
+
     def append(self, item):
         """
             Adds an individual item to the section
@@ -306,14 +398,37 @@ class MetadataValueListConstructor(MetadataItemConstructor):
                 configured on parent object
             :return:
         """
-
-        element = ET.Element(self.tag_name)
-        element.text = item
+        element = self._new_element(item)
         self.current_items.append(element)
-        #self._removeall()
-        #for element in self.current_items:
-        #    self.element.append(element)
-        self.element.append(element)  # This should really be a replacement of all of the children to perform the update, I think. We're losing subitems for some reason in our update
+        self._get_element().append(element)
+        self.parent._mark_changed(self.path)
+
+    def extend(self, items):
+        """
+            Adds all given items to the end of the section in one step
+            :param items: iterable of texts
+            :return:
+        """
+        new_elements = [self._new_element(item) for item in items]
+        if new_elements:
+            self.current_items.extend(new_elements)
+            self._get_element().extend(new_elements)
+            self.parent._mark_changed(self.path)
+
+    def update(self, items):
+        """
+            Adds the given items that are not in the section yet, like a set union. Duplicates within the given
+            items are only added once
+            :param items: iterable of texts
+            :return:
+        """
+        new_items = []
+        seen = set()
+        for item in items:
+            if item not in self._counts and item not in seen:
+                seen.add(item)
+                new_items.append(item)
+        self.extend(new_items)
 
     def insert(self, index, item):
         """
@@ -323,29 +438,25 @@ class MetadataValueListConstructor(MetadataItemConstructor):
                 configured on parent object
             :return:
         """
-
-        element = ET.Element(self.tag_name)
-        element.text = item
+        element = self._new_element(item)
         self.current_items.insert(index, element)
-        self.element.insert(index, element)  # THIS MAY NEED TO BE index + 1 or a replacement of all child
+        self._get_element().insert(index, element)  # THIS MAY NEED TO BE index + 1 or a replacement of all child
+        self.parent._mark_changed(self.path)
 
     def pop(self):
         """
         Remove the last element in element tree
         :return: object
         """
+        if not self.current_items:
+            return None
 
-        item_to_remove = None
-
-        for i in self.current_items:
-            item_to_remove = i
-
-        j = copy.deepcopy(item_to_remove)
-
-        if item_to_remove is not None:
-            self.current_items.remove(item_to_remove)
+        item_to_remove = self.current_items.pop()
+        self._count(item_to_remove.text, -1)
+        self._get_element().remove(item_to_remove)
+        self.parent._mark_changed(self.path)
 
-        return j
+        return item_to_remove
 
     def remove(self, item):
         """
@@ -353,27 +464,44 @@ class MetadataValueListConstructor(MetadataItemConstructor):
         :param item:
         :return:
         """
-        items_to_remove = []
+        self.discard_many([item])
 
-        for i in self.current_items:
-            if i.text == item:
-                items_to_remove.append(i)
+    def discard_many(self, items):
+        """
+        Remove all items with any of the given values from element tree, in a single pass. Values that are not
+        in the section are ignored
+        :param items: iterable of texts
+        :return:
+        """
+        values = set(item for item in items if item in self._counts)
+        if not values:
+            return
 
-        for i in items_to_remove:
-            self.current_items.remove(i)
+        removed = set()
+        kept = []
+        for element in self.current_items:
+            if element.text in values:
+                removed.add(id(element))
+            else:
+                kept.append(element)
+        self._drop(kept, removed)
+        for value in values:
+            self._counts.pop(value, None)
 
     def _removeall(self):
         """
         Removes all items from element tree
         :return:
         """
-        items_to_remove = []
+        if self.current_items:
+            self._drop([], set(id(element) for element in self.current_items))
+            self._counts = {}
 
-        for i in self.current_items:
-            items_to_remove.append(i)
-
-        for i in items_to_remove:
-            self.current_items.remove(i)
+    def _drop(self, kept, removed):
+        container = self._get_element()
+        container[:] = [element for element in container if id(element) not in removed]
+        self.current_items = kept
+        self.parent._mark_changed(self.path)
 
     def sort(self):
         """
@@ -381,6 +509,7 @@ class MetadataValueListConstructor(MetadataItemConstructor):
         :return:
         """
 
+        self.parent._mark_changed(self.path)
         return self.current_items.sort(key=lambda elm: elm.tag)  # sort by tag name
 
 
@@ -390,14 +519,13 @@ class MetadataObjectListConstructor(MetadataItemConstructor):
         subitem to store there (self.tag_name) and you can use list-like methods to edit the group
     """
 
-    tag_name = None
-    path = None
+    __slots__ = ("tag_name", "child_elements", "_items", "_removed", "_index", "_item_path")
 
     def __init__(self, parent=None, tagname=None, path=None, child_elements=None):
 
         self.child_elements = child_elements
 
-        if not self.tag_name:
+        if getattr(self, "tag_name", None) is None:
             self.tag_name = tagname
 
         if path:
@@ -407,53 +535,111 @@ class MetadataObjectListConstructor(MetadataItemConstructor):
 
         self.reset()
 
+    @property
+    def current_items(self):
+        """
+        The objects in the order of their elements. Removed objects are only dropped from the list when it is
+        needed again, so removing many objects one by one doesn't copy the list each time
+        :return: list
+        """
+        if self._removed:
+            removed = self._removed
+            self._items = [item for item in self._items if id(item) not in removed]
+            self._removed = {}
+        return self._items
+
+    @current_items.setter
+    def current_items(self, items):
+        self._items = items
+        self._removed = {}  # id -> removed object, kept alive so the id isn't reused before the list is compacted
+
     def reset(self):
+        """
+        Bind one object to each child element in a single pass over the children
+        :return:
+        """
         self.current_items = []
-        for item in self.parent.elements.find(self.path):
-            if item.tag == self.tag_name:
-                new_path = "{0}/{1}".format(self.path, self.tag_name)
-                
-                # XPath is 1-indexed, so we don't want to pass forward a 0 index on 0 length
-                index = len(self.current_items) + 1
-                # index = index if index > 0 else 1
-
-                child = MetadataParentItem(path=new_path,
-                                            parent=self.parent,
-                                            elements=self.child_elements,
-                                            index=index)
-                self.current_items.append(child)
+        self._index = None  # name -> objects with this name in list order, built on first lookup by name
+        self._item_path = "{0}/{1}".format(self.path, self.tag_name)  # shared by all objects
+        for element in self._get_element():
+            if element.tag == self.tag_name:
+                self._items.append(self._bind_item(element))
+
+    def _bind_item(self, element):
+        child = MetadataParentItem(path=self._item_path,
+                                   parent=self.parent,
+                                   elements=self.child_elements,
+                                   element=element)
+        child._owner = self
+        return child
 
     def new(self):
-        new_path = "{0}/{1}".format(self.path, self.tag_name)
-        #element = ET.Element(f"{new_path}[{len(self.current_items)+1}]")
-        #self.parent.append(element)
-
-        child = MetadataParentItem(path=new_path,
-                                    parent=self.parent,
-                                    elements=self.child_elements,
-                                    index=len(self.current_items)+1
-                                )
+        """
+        Add a new object at the end of the list
+        :return: the new object
+        """
+        element = self.parent._xml.Element(self.tag_name)
+        self._get_element().append(element)
+        self.parent._structure_changed(self.path, [])
+
+        child = self._bind_item(element)
         self.current_items.append(child)
+        if self._index is not None:
+            self._index.setdefault(child.name, []).append(child)  # it is the last one with its name
+        self.parent._mark_changed(self.path)
+        return child
+
+    def get(self, name, default=None):
+        """
+        Find an object by name, like a field by its label. If several objects have the same name, the first one is
+        returned
+        :param name: string
+        :param default: returned if there is no object with this name
+        :return: object
+        """
+        if "name" not in self.child_elements:
+            raise TypeError("Objects of {0} don't have a name".format(self.path))
+        if self._index is None:
+            self._index = {}
+            for item in self.current_items:
+                self._index.setdefault(item.name, []).append(item)
+        items = self._index.get(name)
+        return items[0] if items else default
+
+    def _unindex(self, item, name):
+        if self._index is not None:
+            items = self._index.get(name)
+            if items is not None and item in items:
+                items.remove(item)  # only the objects with the same name
+                if not items:
+                    del self._index[name]
+
+    def _renamed(self, item, old_name):
+        """
+        Move an object to its new name in the index
+        :param item: object of this list
+        :param old_name: string, name before the change
+        :return:
+        """
+        if self._index is None:
+            return
+        self._unindex(item, old_name)
+        name = item.name
+        if name in self._index:  # keep the objects with the same name in list order
+            self._index[name] = [other for other in self.current_items if other.name == name]
+        else:
+            self._index[name] = [item]
 
     def pop(self):
         """
         Remove the last element in element tree
         :return: object
         """
+        if not self.current_items:
+            return None
 
-        item_to_remove = None
-
-        for i in self.current_items:
-            item_to_remove = i
-
-        #j = copy.deepcopy(item_to_remove)
-
-        if item_to_remove is not None:
-            for item in self.parent.elements.find(self.path):
-                if item == item_to_remove.element:
-                    self.parent.elements.find(self.path).remove(item)
-            self.current_items.remove(item_to_remove)
-
+        item_to_remove = self.current_items.pop()
+        self._detach(item_to_remove)
         return item_to_remove
 
     def remove(self, item):
@@ -462,27 +648,75 @@ class MetadataObjectListConstructor(MetadataItemConstructor):
         :param item:
         :return:
         """
+        if getattr(item, "_owner", None) is not self or id(item) in self._removed:
+            raise ValueError("{0!r} is not in the list".format(item))
+        self._removed[id(item)] = item
+        self._detach(item)
 
-        for i in self.parent.elements.find(self.path):
-            if i == item.element:
-                self.parent.elements.find(self.path).remove(i)
-        self.current_items.remove(item)
+    def _detach(self, item):
+        self._unindex(item, item.name)
+        item._owner = None
+        self._get_element().remove(item.element)
+        self.parent._structure_changed(self.path, [item.element])
+        self.parent._mark_changed(self.path)
 
     def _removeall(self):
         """
         removes all items from element tree
         :return:
         """
-        items_to_remove = []
+        if not self.current_items:
+            return
+
+        removed = [item.element for item in self.current_items]
+        removed_ids = set(id(element) for element in removed)
+        container = self._get_element()
+        container[:] = [element for element in container if id(element) not in removed_ids]
 
         for item in self.current_items:
-            items_to_remove.append(item)
+            item._owner = None
+        self.current_items = []
+        if self._index is not None:
+            self._index = {}
+        self.parent._structure_changed(self.path, removed)
+        self.parent._mark_changed(self.path)
+
+
+class _ChildSchema(object):
+    """
+    What all parent items of one schema (like contact_elements) share: the position of each child, its path
+    split into steps and the values of attribute children
+    """
+
+    __slots__ = ("child_elements", "positions", "steps", "enums")
 
-        for item in items_to_remove:
-            for i in self.parent.elements.find(self.path):
-                if i == item.element:
-                    self.parent.elements.find(self.path).remove(i)
-            self.current_items.remove(item)
+    def __init__(self, child_elements):
+        self.child_elements = child_elements
+        self.positions = {}
+        self.steps = []
+        self.enums = {}  # name of an attribute child -> EnumMap
+        for name in child_elements:
+            self.positions[name] = len(self.steps)
+            self.steps.append(tuple(child_elements[name]["path"].split("/")))
+            if child_elements[name]["type"] == "attribute":
+                self.enums[name] = enum_map(child_elements[name]["values"])
+
+
+_child_schemas = {}  # id of a child element schema -> _ChildSchema
+
+
+def _child_schema(child_elements):
+    """
+    Get the compiled schema for a dictionary of child elements, it is only compiled once
+    :param child_elements: dictionary of child name -> definition
+    :return: _ChildSchema
+    """
+    schema = _child_schemas.get(id(child_elements))
+    if schema is None or schema.child_elements is not child_elements:
+        if len(_child_schemas) > 256:  # schemas built on the fly
+            _child_schemas.clear()
+        schema = _child_schemas[id(child_elements)] = _ChildSchema(child_elements)
+    return schema
 
 
 class MetadataParentItemConstructor(MetadataItemConstructor):
@@ -491,114 +725,104 @@ class MetadataParentItemConstructor(MetadataItemConstructor):
     This object will allow to add child elements to an item based on supplied element list
     """
 
-    def __init__(self, parent, child_elements):
+    __slots__ = ("child_elements", "_schema", "_children", "_owner")
+
+    # attributes of the item itself, everything else is a child element
+    _own_attributes = frozenset(["parent", "element", "path", "sync", "child_elements", "_schema", "_children",
+                                 "_owner"])
+
+    def __init__(self, parent, child_elements, element=None):
         self.parent = parent
         self.child_elements = child_elements
-        super().__init__(self.parent)
+        self._schema = _child_schema(child_elements)
+        self._owner = None  # the object list this item belongs to
+        super().__init__(self.parent, element)
 
-        i = 0
-        while i < len(self.child_elements):
-            for element in self.child_elements.keys():
+        # children are created in the order of the schema, so the tree looks the same no matter which ones exist
+        resolved = {(): self.element}
+        self._children = [MetadataSubItemConstructor(self._resolve_child(resolved, steps))
+                          for steps in self._schema.steps]
 
-                path = self.child_elements[element]["path"]
-
-                if f"_{element}" not in self.__dict__.keys():
-                    setattr(self, f"_{element}", self._create_item(path))
-                    i = 0
-                else:
-                    i += 1
-        pass
+    def _child(self, name):
+        """
+        :param name: string, name of a child element
+        :return: MetadataSubItemConstructor
+        """
+        return self._children[self._schema.positions[name]]
 
     def __setattr__(self, n, v):
-        if n in ["path", "parent", "child_elements", "value", "attr_lang", "attr_country"]:
-            self.__dict__[n] = v
-        else:
-            if n in self.child_elements.keys():
-                element_type = self.child_elements[n]["type"]
-
-                if element_type == "attribute":
-                    key = self.child_elements[n]["key"]
-                    if v is None or v == "":
-                        self.__dict__["_{0}".format(n)].element.attrib[key] = ""
-                    else:
-                        allowed_values = []
-                        found = False
-                        for value in self.child_elements[n]["values"]:
-                            allowed_values.append(value[0])
-                            if v == value[0]:
-                                self.__dict__["_{0}".format(n)].element.attrib[key] = value[1]
-                                found = True
-                        if not found:
-                            raise TypeError("Value must be in {0}".format(allowed_values))
-
-                elif isinstance(v, (str, bytes)):
-                    self.__dict__[f"_{n}"].element.text = v
-                elif v is None:
-                    self.__dict__[f"_{n}"].element.text = ""
-                else:
-                    raise RuntimeWarning("Input value must be of type String or None")
-            else:
-                self.__dict__[n] = v
-
-    def __getattr__(self, name):
-
-        if name != "child_elements" and name in self.child_elements.keys():
+        if n in self._own_attributes:
+            object.__setattr__(self, n, v)
+        elif n in ("value", "attributes"):
+            pass  # these are read from the item's element, see MetadataItemConstructor.__init__
+        elif n in self.child_elements:
+            element_type = self.child_elements[n]["type"]
+            element = self._child(n).element
+            before = (element.text, dict(element.attrib))
 
-            element_type = self.child_elements[name]["type"]
             if element_type == "attribute":
-                key = self.child_elements[name]["key"]
-                values = self.child_elements[name]["values"]
-                if key in self.__dict__["_{0}".format(name)].element.attrib.keys():
-                    v = self.__dict__["_{0}".format(name)].element.attrib[key]
-                    for value in values:
-                        if v in value:
-                            return value[0]
+                key = self.child_elements[n]["key"]
+                if v is None or v == "":
+                    element.attrib[key] = ""
                 else:
-                    return None
-
+                    enum = self._schema.enums[n]
+                    code = enum.code(v, labels_only=True)
+                    if code is None:
+                        raise TypeError("Value must be in {0}".format(enum.labels))
+                    element.attrib[key] = code
+
+            elif isinstance(v, (str, bytes)):
+                element.text = v
+            elif v is None:
+                element.text = ""
             else:
-                #return self.__dict__["_{}".format(name)].value
-                return self.__dict__["_{0}".format(name)].element.text # should be the same"
+                raise RuntimeWarning("Input value must be of type String or None")
 
+            if (element.text, dict(element.attrib)) != before:
+                self.parent._mark_changed(self.path)
+                if n == "name" and self._owner is not None:
+                    self._owner._renamed(self, before[0])
         else:
-            return self.__dict__[name]
-
-    def _create_item(self, tag_name):
+            raise AttributeError("{0} has no element {1}".format(type(self).__name__, n))
 
-        tags = tag_name.split("/")
-        i = 0
+    def __getattr__(self, name):
+        # only called for names that aren't set, these can't be child elements
+        if name in self._own_attributes or name.startswith("__"):
+            raise AttributeError(name)
+
+        if name in self.child_elements:
+            element = self._child(name).element
+            if self.child_elements[name]["type"] == "attribute":
+                code = element.attrib.get(self.child_elements[name]["key"])
+                if code is None:
+                    return None
+                return self._schema.enums[name].label(code)
+            else:
+                return element.text
 
-        parent = self.element
+        elif name[1:] in self.child_elements:  # the child item itself, like _contact_name
+            return self._child(name[1:])
 
-        # search for tag
-        while i < len(tags):
-            tag = tags[i]
-            p = None
-            iterator = parent.iter()
+        raise AttributeError(name)
 
-            for item in iterator:
-                # item exists already but is not the final one
-                if item.tag == tag and i < len(tags)-1:
-                    p = item
-                    break
-                # item exists already and is final one
-                elif item.tag == tag and i == len(tags)-1:
-                    #create_element = ET.Element(tag)
-                    #create_element.attrib = copy.deepcopy(item.attrib)
-                    #create_element.text = copy.copy(item.text)
-                    #parent.append(create_element)
-                    return MetadataSubItemConstructor(element=item)
-                
-            # item does not yet exist
-            if p is None:
-                p = ET.Element(tag)
-                parent.append(p)
-                # if it is the final one
-                if i == len(tags)-1:
-                    return MetadataSubItemConstructor(p)
+    def _resolve_child(self, resolved, steps):
+        """
+        Find the element for a compiled child path by looking up one direct child per step, create what is missing
+        :param resolved: dictionary of the steps resolved so far for this item -> element, shared by all child paths
+        :param steps: tuple of tags
+        :return: element
+        """
+        element = resolved.get(steps)
+        if element is not None:
+            return element
 
-            parent = p
-            i += 1
+        element = self._resolve_child(resolved, steps[:-1])
+        child = element.find(steps[-1])
+        if child is None:
+            child = self.parent._xml.Element(steps[-1])
+            element.append(child)
+        resolved[steps] = child
+        return child
 
 
 class MetadataSubItemConstructor(object):
@@ -607,6 +831,8 @@ class MetadataSubItemConstructor(object):
     This object can be placed as single item inside a parent items
     """
 
+    __slots__ = ("element",)
+
     def __init__(self, element):
 
         self.element = element
@@ -615,7 +841,7 @@ class MetadataSubItemConstructor(object):
             self.value = self.element.text.strip()
         else:
             self.value = self.element.text
-        self.attributes = self.element.attrib # {}
+        self.attributes = dict(self.element.attrib) # {}
 
     @property
     def attributes(self):
@@ -646,6 +872,30 @@ class MetadataSubItemConstructor(object):
         self.element.append(element)
 
 
+class MetadataReadOnlyParentItem(object):
+    """
+    Read-only counterpart of MetadataParentItem. Child values are looked up when they are accessed, missing
+    children aren't created but read like MetadataParentItem reads them once it created them
+    """
+
+    __slots__ = ("element", "child_elements")
+
+    def __init__(self, element, child_elements):
+        object.__setattr__(self, "element", element)
+        object.__setattr__(self, "child_elements", child_elements)
+
+    def __getattr__(self, name):
+        if name in self.child_elements:
+            return extract_child_value(self.element, self.child_elements[name])
+        raise AttributeError(name)
+
+    def __setattr__(self, n, v):
+        raise PermissionError("Metadata was opened read only")
+
+    def __repr__(self):
+        return f"<MetadataReadOnlyParentItem {self.element.tag}>"
+
+
 ####################################################
 
 
@@ -654,6 +904,9 @@ class MetadataItem(MetadataItemConstructor):
     A simple metadata item
     Define path and position
     """
+
+    __slots__ = ("name",)
+
     def __init__(self, path, name, parent, sync=True):
         self.path = path
         self.name = name
@@ -667,6 +920,8 @@ class MetadataValueList(MetadataValueListConstructor):
     Define path, parent item position and item tag name
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, tagname, path, name, parent=None, sync=True):
         self.name = name
         self.sync = sync
@@ -679,6 +934,8 @@ class MetadataObjectList(MetadataObjectListConstructor):
     Define path, parent item position and item tag name
     """
 
+    __slots__ = ()
+
     def __init__(self, tagname, path, parent, elements, sync=True):
         self.child_elements = {}
         self.sync = sync
@@ -690,9 +947,15 @@ class MetadataParentItem(MetadataParentItemConstructor):
         Just a shortcut MetadataContacts that predefines the paths and position
     """
     # TODO: Define Role, Country and Online Resource list
-    def __init__(self, path, parent, elements, index=1):
-        self.path = "{0!s}[{1:d}]".format(path, index)
-        super().__init__(parent, elements)
+
+    __slots__ = ()
+
+    def __init__(self, path, parent, elements, index=1, element=None):
+        if element is None:
+            self.path = "{0!s}[{1:d}]".format(path, index)
+        else:
+            self.path = path
+        super().__init__(parent, elements, element)
 
     def __repr__(self):
         return f"<MetadataParentItem at Path {self.path}>"
\ No newline at end of file
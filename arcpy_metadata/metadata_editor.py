@@ -1,26 +1,25 @@
+import io
 import os
-import xml
+import weakref
 import warnings
-import traceback
 import logging
 from datetime import datetime, date, time
 
 import urllib
 
-import arcpy
-import arcgis
-
-from arcpy_metadata.metadata_constructors import MetadataItem
-from arcpy_metadata.metadata_constructors import MetadataValueList
-from arcpy_metadata.metadata_constructors import MetadataParentItem
-from arcpy_metadata.metadata_constructors import MetadataObjectList
 from arcpy_metadata.metadata_constructors import MetadataValueListHelper
 from arcpy_metadata.metadata_constructors import MetadataObjectListHelper
-
-from arcpy_metadata.metadata_items import MetadataLanguage
+from arcpy_metadata.metadata_constructors import MetadataReadOnlyParentItem
 
 from arcpy_metadata.elements import elements
-from arcpy_metadata.languages import languages
+from arcpy_metadata import gp_history
+from arcpy_metadata.describe_cache import get_describe_cache
+from arcpy_metadata.handle_pool import _arcpy_metadata_handle
+from arcpy_metadata.element_descriptors import make_descriptors
+from arcpy_metadata.instrumentation import make_timer
+from arcpy_metadata.path_resolver import element_paths
+from arcpy_metadata.reader import extract_value
+from arcpy_metadata.xml_backend import get_backend
 
 # TODO: Have logger handle deprecation warnings
 # turn on warnings for deprecation once
@@ -30,7 +29,20 @@ def warning_on_one_line(message, category, filename, lineno, file=None, line=Non
     return '{0}: {1}\n'.format(category.__name__, message)
 warnings.formatwarning = warning_on_one_line
 
-metadata_temp_folder = arcpy.env.scratchFolder  # a default temp folder to use - settable by other applications so they can set it once
+empty_metadata = '<metadata xml:lang="en"></metadata>'  # most basic metadata document
+
+metadata_temp_folder = None  # a default temp folder to use - settable by other applications so they can set it once
+
+
+def get_temp_folder():
+    """
+    Get the default temp folder: metadata_temp_folder if it is set, arcpy's scratch folder otherwise
+    :return: string
+    """
+    if metadata_temp_folder is not None:
+        return metadata_temp_folder
+    import arcpy  # only needed for datasets, metadata files can be edited without it
+    return arcpy.env.scratchFolder
 
 
 class MetadataEditor(object):
@@ -39,9 +51,18 @@ class MetadataEditor(object):
 
 
     def __init__(self, dataset=None, metadata_file=None, items=None,
-                 temp_folder=metadata_temp_folder, loglevel='INFO',
+                 temp_folder=None, loglevel='INFO',
                  metadata_export_option="EXACT_COPY",
-                 metadata_import_option="ARCGIS_METADATA"):
+                 metadata_import_option="ARCGIS_METADATA", lazy=False, xml_backend=None, read_only=False,
+                 describe_cache=None, stats=None, on_phase=None, handle_pool=None):
+
+        # phase timing, only if stats or a callback(editor, phase, seconds) is given
+        self._timer = make_timer(self, stats, on_phase)
+        self.lazy = lazy  # only bind elements when they are first accessed
+        self.read_only = read_only  # never change the tree, missing elements are returned as None
+        self._changed = set()  # paths of the elements changed since opening or the last save
+        self.save_count = 0  # number of times the metadata was written
+        self._tracking = False  # only changes made after opening count
 
         screen_handler = None
         self.logger = logging.getLogger("__name__")
@@ -83,9 +104,12 @@ class MetadataEditor(object):
 
         self.items = items
         self.metadata_file = metadata_file
-        self.elements = xml.etree.ElementTree.ElementTree()
-        self.temp_folder = temp_folder
+        self._xml = get_backend(xml_backend)  # lxml if available, otherwise xml.etree
+        self.temp_folder = temp_folder  # defaults to get_temp_folder() once a dataset's metadata is exported
         self.dataset = dataset
+        self._describe = describe_cache if describe_cache is not None else get_describe_cache()
+        self._handle_pool = handle_pool  # MetadataHandlePool to share the handle to the dataset's metadata with
+        self.closed = False
         
         self.metadata_export_option = metadata_export_option
         self.metadata_import_option = metadata_import_option
@@ -97,16 +121,16 @@ class MetadataEditor(object):
 
         if self.dataset:  # Check if dataset is set
             # export the metadata to the temporary location
-            self.data_type = self.get_datatype()
+            with self._timer("describe"):
+                self.data_type = self.get_datatype()
 
-            # for layers get the underlying dataset and start over
-            if self.data_type in self._layers:
-                desc = arcpy.Describe(self.dataset)
-                self.data_type = desc.dataElement.dataType
-                self.dataset = desc.dataElement.catalogPath  # overwrite path to dataset with layer's data source
+                # for layers get the underlying dataset and start over
+                if self.data_type in self._layers:
+                    # overwrite path to dataset with layer's data source
+                    self.data_type, self.dataset = self._describe.layer_source(self.dataset)
 
-            self._workspace = self.get_workspace()
-            self._workspace_type = self.get_workspace_type()
+                self._workspace = self.get_workspace()
+                self._workspace_type = self.get_workspace_type()
 
             # Datasets in Filesystem have metadata attached as XML file
             # we can directly write to it
@@ -114,7 +138,7 @@ class MetadataEditor(object):
                 if self.data_type in self._simple_datasets:
                     xml_file = self.dataset + ".xml"
                     #if no XML file exists create one and add most basic metadata item to it
-                    if not os.path.exists(xml_file):
+                    if not os.path.exists(xml_file) and not self.read_only:
                         self._create_xml_file(xml_file)
                     self.metadata_file = xml_file
 
@@ -126,14 +150,17 @@ class MetadataEditor(object):
             else:
                 if self.data_type in self._gdb_datasets:
                     metadata_filename = os.path.basename(self.dataset) + ".xml"
+                    if self.temp_folder is None:
+                        self.temp_folder = get_temp_folder()
                     self.metadata_file = os.path.join(self.temp_folder, metadata_filename)
                     if os.path.exists(self.metadata_file):
                         os.remove(self.metadata_file)
                     self.logger.debug("Exporting metadata to temporary file {0!s}".format(self.metadata_file))
 
                     # we're going to change how we do this for server-based datasets soon, but just making a checkpoint
-                    self._arcgis_metadata = arcpy.metadata.Metadata(self.dataset)  # we might be able to speed this up by storing it, but that may leave a lock?
-                    self._arcgis_metadata.saveAsXML(self.metadata_file, self.metadata_export_option)  # export option configures if it's an exact copy or strips anything out. Defaults to EXACT_COPY
+                    with self._timer("export"):
+                        self._arcgis_metadata = self._acquire_handle()  # kept until the editor is closed
+                        self._arcgis_metadata.saveAsXML(self.metadata_file, self.metadata_export_option)  # export option configures if it's an exact copy or strips anything out. Defaults to EXACT_COPY
                     if self._arcgis_metadata.isReadOnly:
                         # it would be good to make setattr calls check this? But they may want to edit the XML and import elsewhere
                         self.logger.info(f"Metadata for {self.dataset} is read only. You can access the metadata and save it back to another dataset, but will not be able to save changes back to the original source.")
@@ -145,356 +172,199 @@ class MetadataEditor(object):
         elif self.metadata_file:  # Check if metadata file is set instead
             self.data_type = 'MetadataFile'
             if self.metadata_file.endswith('.xml'):
-                if not os.path.exists(self.metadata_file):
+                if not os.path.exists(self.metadata_file) and not self.read_only:
                     self._create_xml_file(self.metadata_file)
                 self._workspace_type = 'FileSystem'
             else:
                 raise TypeError("Metadata file is not an XML file. Check file extension")
 
-        self.elements.parse(self.metadata_file)
+        with self._timer("parse"):
+            if self.read_only and not os.path.exists(self.metadata_file):
+                self.elements = self._xml.parse(io.BytesIO(empty_metadata.encode()))
+            else:
+                self.elements = self._xml.parse(self.metadata_file)
+            self._paths = element_paths.resolve(self.elements.getroot())  # find all schema elements in one pass
+        self._handles = weakref.WeakSet()  # items holding on to a node of the tree
+        self._handles_below = {}  # path -> the handles that may be bound below it, see _structure_changed
 
         # create these all after the parsing happens so that if they have any self initialization, they can correctly perform it
+        # in lazy mode, elements are bound when they are first read or set instead
+        if not self.lazy and not self.read_only:
+            for name in elements.keys():
+                self._bind_element(name)
 
-        for name in elements.keys():
-            if "sync" in elements[name].keys():
-                sync = elements[name]["sync"]
-            else:
-                sync = None
-
-            if "unsupported" in elements[name].keys():
-                if self.data_type in elements[name]["unsupported"]:
-                    self.logger.debug("{0} not supported for {1}. SKIP".format(name, self.data_type))
-                    continue
+        if items:
+            self.initialize_items()
 
-            setattr(self, "_{0!s}".format(name), None)
+        self._tracking = True
 
-            if elements[name]['type'] in ["string", "datetime", "date", "time", "integer", "float"]:
-                setattr(self, "_{0}".format(name), MetadataItem(elements[name]['path'], name, self, sync))
-                if self.__dict__["_{0}".format(name)].value is not None:
-                    setattr(self, name, self.__dict__["_{0}".format(name)].value.strip())
-                else:
-                    setattr(self, name, self.__dict__["_{0}".format(name)].value)
-
-            elif elements[name]['type'] == "attribute":
-                setattr(self, "_{0}".format(name), MetadataItem(elements[name]['path'], name, self, sync))
-                if isinstance(self.__dict__["_{0}".format(name)].attributes, dict):
-                    key = elements[name]['key']
-                    values = elements[name]['values']
-                    if key in self.__dict__["_{0}".format(name)].attributes.keys():
-                        v = self.__dict__["_{0}".format(name)].attributes[elements[name]['key']]
-                        for value in values:
-                            if v in value:
-                                setattr(self, name, value[0])
-                                break
-                else:
-                    setattr(self, name, None)
+    def _findall(self, path):
+        """
+        Find all elements for the given path. Uses the paths resolved on open and only searches the tree
+        for paths that are not part of the schema
+        :param path: string
+        :return: list of elements
+        """
+        found = self._paths.findall(path)
+        if found is None:
+            found = self._xml.findall(self.elements.getroot(), path)
+        return found
 
-            elif elements[name]['type'] == "list":
-                setattr(self, "_{0}".format(name), MetadataValueList(elements[name]["tagname"], elements[name]['path'], name, self, sync))
-                #setattr(self, name, self.__dict__["_{}".format(name)].value)
-                #setattr(self, name, ListValues(self.__dict__["_{}".format(name)], name))
+    def _structure_changed(self, path, removed):
+        """
+        Drop everything that still points to elements which were removed from below the given path
+        :param path: string, path of the element the children were removed from
+        :param removed: list of removed elements
+        :return:
+        """
+        self._paths.invalidate(path)
+        if not removed:
+            return
+
+        # only items bound below the path can point to removed elements. Which ones these are is kept until
+        # another item is bound, so removing objects from a list one by one doesn't check every item each time
+        below = self._handles_below.get(path)
+        if below is None:
+            prefix = path.split("[")[0]
+            below = self._handles_below[path] = weakref.WeakSet(
+                item for item in self._handles if item.path is not None and item.path.startswith(prefix))
+        if not below:
+            return
+
+        removed_ids = set()
+        for element in removed:
+            for e in element.iter():
+                removed_ids.add(id(e))
+
+        for item in list(below):
+            if id(item.element) in removed_ids:
+                item.element = None
+
+    def _add_handle(self, item):
+        """
+        Keep track of an item holding on to a node of the tree, see _structure_changed
+        :param item: MetadataItemConstructor
+        :return:
+        """
+        self._handles.add(item)
+        self._handles_below.clear()
 
-            elif elements[name]['type'] == "language":
-                setattr(self, "_{0}".format(name), MetadataLanguage(elements[name]['path'], name, self, sync))
-                if self.__dict__["_{0}".format(name)].value is not None:
-                    setattr(self, name, self.__dict__["_{0}".format(name)].value.strip())
-                else:
-                    setattr(self, name, self.__dict__["_{0}".format(name)].value)
+    def _mark_changed(self, path):
+        """
+        Record that the element at the given path was changed
+        :param path: string
+        :return:
+        """
+        if self._tracking:
+            self._changed.add(path)
 
-            # TODO: turn on sync
-            elif elements[name]['type'] == "parent_item":
-                setattr(self, "_{0}".format(name), MetadataParentItem(elements[name]['path'], self, elements[name]['elements']))
-                setattr(self, name, self.__dict__["_{0}".format(name)])
+    def _snapshot(self, name):
+        """
+        Get what's needed to tell if setting an element changed it
+        :param name: string
+        :return:
+        """
+        item = self.__dict__.get("_{0}".format(name))
+        if item is None:
+            return None
+        if elements[name]['type'] == "list":
+            return tuple(item.value)
+        element = item._get_element()
+        return id(item), element.text, dict(element.attrib)
+
+    @property
+    def is_dirty(self):
+        """
+        True if any element was changed since the metadata was opened or last saved
+        :return: boolean
+        """
+        return len(self._changed) > 0
 
-            elif elements[name]['type'] == "object_list":
-                setattr(self, "_{0}".format(name), MetadataObjectList(elements[name]["tagname"], elements[name]['path'], self, elements[name]['elements'], sync))
-                #setattr(self, name, self.__dict__["_{}".format(name)])
+    def _bind_element(self, name):
+        """
+        Bind the metadata element with the given name to its node in the tree. Missing nodes get created,
+        but that doesn't count as a change
+        :param name: string
+        :return:
+        """
+        tracking = self._tracking
+        self._tracking = False
+        try:
+            with self._timer("bind"):
+                self._bind(name)
+        finally:
+            self._tracking = tracking
 
-            if hasattr(self, name):
-                self.items.append(getattr(self, "_{0}".format(name)))
+    def _bind(self, name):
+        descriptor = descriptors[name]
+        if self.data_type in descriptor.unsupported:
+            self.logger.debug("{0} not supported for {1}. SKIP".format(name, self.data_type))
+            return
 
-        if items:
-            self.initialize_items()
+        self.__dict__[descriptor.key] = None
+        self.items.append(descriptor.bind(self))
 
     def _create_xml_file(self, xml_file):
         with open(xml_file, "w") as f:
             self.logger.debug("Create new file {0!s}".format(xml_file))
-            f.write('<metadata xml:lang="en"></metadata>')
+            f.write(empty_metadata)
 
-    def __setattr__(self, n, v):
+    def _read_element(self, name):
         """
-        Check if input value type matches required type for metadata element
-        and write value to internal property
-        :param n: string
-        :param v: string
+        Read the value of an element without binding it. Nothing gets added to the tree,
+        missing elements are returned as None
+        :param name: string
         :return:
         """
-
-        if n in elements.keys():
-
-            # Warn if property got deprecated, but only if call is made by user, not during initialization
-            if "deprecated" in elements[n].keys() and traceback.extract_stack()[-2][2] != "__init__":
-                warnings.warn("Call to deprecated property {0}. {1}".format(n, elements[n]["deprecated"]), category=DeprecationWarning)
-
-            if "unsupported" in elements[n].keys() and self.data_type in elements[n]["unsupported"]:
-                raise RuntimeWarning(f"Can't set key {n} - key is unsupported for data type {self.data_type}")
-
-            if elements[n]['type'] == "string":
-                if isinstance(v, (str, bytes)):
-                    self.__dict__["_{0}".format(n)].value = v
-                elif v is None:
-                    self.__dict__["_{0}".format(n)].value = ""
-                else:
-                    raise RuntimeWarning("Input value must be of type String")
-
-            elif elements[n]['type'] == "datetime":
-
-                if isinstance(v, datetime):
-                    self.__dict__["_{0}".format(n)].value = datetime.strftime(v, "%Y-%m-%dT%H:%M:%S")
-                elif isinstance(v, (str, bytes)):
-
-                    # remove all whitespaces for easier handling
-                    v = "".join(v.split())
-
-                    try:
-                        if len(v) == 8:
-                            # try first to convert to datetime to check if format is correct
-                            # then write string to file
-                            new_value = datetime.strptime(v, "%Y%m%d")
-                            self.__dict__["_{0}".format(n)].value = new_value.isoformat()
-                        elif len(v) == 10:
-                            # try first to convert to datetime to check if format is correct
-                            # then write string to file
-                            new_value = datetime.strptime(v, "%Y-%m-%d")
-                            self.__dict__["_{0}".format(n)].value = new_value.isoformat()
-
-                        else:
-                            # try first to convert to datetime to check if format is correct
-                            # then write string to fil
-                            new_value = datetime.strptime(v, "%Y-%m-%dT%H:%M:%S")
-                            self.__dict__["_{0}".format(n)].value = new_value.isoformat()
-
-                    except ValueError:
-                        RuntimeWarning(
-                            "Input value must be of type a Datetime or a String ('%Y%m%d', '%Y-%m-%d' or '%Y-%m-%dT%H:%M:%S')")
-                elif v is None:
-                    self.__dict__["_{0}".format(n)].value = ""
-                else:
-                    raise RuntimeWarning("Input value must be of type a Date or a String ('yyyymmdd')")
-
-            elif elements[n]['type'] == "date":
-                if isinstance(v, date):
-                    self.__dict__["_{0}".format(n)].value = datetime.strftime(v, "%Y-%m-%d")
-                elif isinstance(v, (str, bytes)):
-
-                    # remove all whitespaces for easier handling
-                    v = "".join(v.split())
-
-                    try:
-                        if len(v) == 8:
-                            # try first to convert to datetime to check if format is correct
-                            # then write string to file
-                            new_value = datetime.strptime(v, "%Y%m%d")
-                            self.__dict__["_{0}".format(n)].value = new_value.date().isoformat()
-                        elif len(v) == 10:
-                            # try first to convert to datetime to check if format is correct
-                            # then write string to file
-                            new_value = datetime.strptime(v, "%Y-%m-%d")
-                            self.__dict__["_{0}".format(n)].value = new_value.date().isoformat()
-
-                        else:
-                            # try first to convert to datetime to check if format is correct
-                            # then write string to fil
-                            new_value = datetime.date().strptime(v, "%Y-%m-%d")
-                            self.__dict__["_{0}".format(n)].value = new_value.date().isoformat()
-
-                    except ValueError:
-                        RuntimeWarning("Input value must be of type a Datetime.date or a String ('%Y%m%d' or '%Y-%m-%d'")
-                elif v is None:
-                    self.__dict__["_{0}".format(n)].value = ""
-                else:
-                    raise RuntimeWarning("Input value must be of type a Date or a String ('yyyymmdd')")
-
-            elif elements[n]['type'] == "time":
-                if isinstance(v, time):
-                    self.__dict__["_{0}".format(n)].value = datetime.strftime(v, "%H:%M:%S")
-                elif isinstance(v, (str, bytes)):
-
-                    # remove all whitespaces for easier handling
-                    v = "".join(v.split())
-
-                    try:
-                        if len(v) == 8 and v.find(":") == -1:
-                            new_value = datetime.strptime(v, "%H%M%S%f")
-                            self.__dict__["_{0}".format(n)].value = new_value.time().isoformat()
-                        elif len(v) <= 8:
-                            # try first to convert to datetime to check if format is correct
-                            # then write string to file
-                            new_value = datetime.strptime(v, "%H:%M:%S")
-                            self.__dict__["_{0}".format(n)].value = new_value.time().isoformat()
-                        else:
-                            # try first to convert to datetime to check if format is correct
-                            # then write string to file
-                            new_value = datetime.strptime(v, "%I:%M:%S%p")
-                            self.__dict__["_{0}".format(n)].value = new_value.time().isoformat()
-
-                    except ValueError:
-                        RuntimeWarning(
-                            "Input value must be of type a Datetime.time or a String ('%H:%M:%S' or '%I:%M:%S%p')")
-                elif v is None:
-                    self.__dict__["_{0}".format(n)].value = ""
-                else:
-                    raise RuntimeWarning("Input value must be of type a tatetime.time or a String ('HH:MM:SS')")
-
-            elif elements[n]['type'] == "integer":
-                if isinstance(v, int):
-                    self.__dict__["_{0}".format(n)].value = str(v)
-                elif isinstance(v, str):
-                    try:
-                        new_value = int(v)
-                        self.__dict__["_{0}".format(n)].value = str(new_value)
-                    except ValueError:
-                        RuntimeWarning("Input value must be of type Integer")
-                elif v is None:
-                    self.__dict__["_{0}".format(n)].value = ""
-                else:
-                    raise RuntimeWarning("Input value must be of type Integer")
-
-            elif elements[n]['type'] == "float":
-                if isinstance(v, float):
-                    self.__dict__["_{0}".format(n)].value = str(v)
-                elif isinstance(v, (str, bytes)):
-                    try:
-                        new_value = float(v)
-                        self.__dict__["_{0}".format(n)].value = str(new_value)
-                    except ValueError:
-                        RuntimeWarning("Input value must be of type Float")
-                elif v is None:
-                    self.__dict__["_{0}".format(n)].value = ""
-                else:
-                    raise RuntimeWarning("Input value must be of type Float")
-
-            elif elements[n]['type'] == 'attribute':
-                key = elements[n]['key']
-                values = elements[n]['values']
-                if isinstance(v,(str, bytes)):
-                    done = False
-                    for value in values:
-                        if v in value:
-                            self.__dict__["_{0}".format(n)].attributes[key] = value[1]
-                            done = True
-                            break
-                    if not done:
-                        raise RuntimeWarning("Input value must be one of: {0}".format(values))
-                else:
-                    raise RuntimeWarning("Input value must be one of: {0}".format(values))
-
-            elif elements[n]['type'] == "list":
-                if isinstance(v, list):
-                    #self.__dict__[n].value = ListValues(self.__dict__["_{}".format(n)], v)
-                    self.__dict__["_{0}".format(n)].value = v
-                elif isinstance(v, MetadataValueListHelper):
-                    self.__dict__["_{0}".format(n)].value = v
-                else:
-                    raise RuntimeWarning("Input value must be of type List")
-
-            elif elements[n]['type'] == "language":
-                if v in languages.keys():
-                    #self.__dict__["_{}".format(n)].value = v
-                    self.__dict__["_{0}".format(n)].attr_lang = {"value": languages[v][0]}
-                    self.__dict__["_{0}".format(n)].attr_country = {"value": languages[v][1]}
-                    a = 1
-                elif v is None:
-                    self.__dict__["_{0}".format(n)].value = ""
-                else:
-                    raise RuntimeWarning("Input value must be in {0}, an empty String or None".format(str(languages.keys())))
-
-            elif elements[n]['type'] == "parent_item":
-                if isinstance(v, MetadataParentItem):
-                    self.__dict__["_{0!s}".format(n)] = v
-                else:
-                    raise RuntimeWarning("Input value must be a MetadataParentItem object")
-
-            elif elements[n]['type'] == "object_list":
-                if isinstance(v, list):
-                    self.__dict__["_{0}".format(n)].value = v
-                elif isinstance(v, MetadataObjectList):
-                    self.__dict__["_{0}".format(n)].value = v
-                else:
-                    raise RuntimeWarning("Input value must be a MetadataOnlineResource object")
-
+        found = self._findall(elements[name]["path"])
+        if not found:
+            return None
+
+        if elements[name]["type"] == "parent_item":
+            return MetadataReadOnlyParentItem(found[0], elements[name]["elements"])
+        elif elements[name]["type"] == "object_list":
+            return [MetadataReadOnlyParentItem(child, elements[name]["elements"])
+                    for child in found[0] if child.tag == elements[name]["tagname"]]
+        elif elements[name]["type"] == "string":
+            return extract_value(found[0], elements[name]) or ""  # an empty node reads as "" like in the editor
         else:
-            self.__dict__[n] = v
+            return extract_value(found[0], elements[name])
 
-    def __getattr__(self, n):
+    def get(self, name, default=None):
         """
-        Type cast output values according to required element type
-        :param n: string
+        Get the value of an element, or default if the element doesn't exist or is unsupported for this data type.
+        Elements that aren't bound yet are only read, never created
+        :param name: string
+        :param default: value to return for missing elements
         :return:
         """
-        if n in elements.keys():
-
-            # Warn if property got deprecated
-            if "deprecated" in elements[n].keys():
-                warnings.warn("Call to deprecated property {0}. {1}".format(n, elements[n]["deprecated"]), category=DeprecationWarning)
+        if name not in elements.keys():
+            raise KeyError(f"{name} is not a supported metadata element")
 
-            key = f"_{n}"
+        if "unsupported" in elements[name].keys() and self.data_type in elements[name]["unsupported"]:
+            return default
 
-            if "unsupported" in elements[n].keys() and self.data_type in elements[n]["unsupported"]:
-                raise AttributeError(f"Key {n} unsupported for data type {self.data_type}")
+        if "_{0}".format(name) in self.__dict__:
+            value = getattr(self, name)
+        else:
+            value = self._read_element(name)
 
-            if key not in self.__dict__: # return a blanket None if we don't have the key, regardless
-                raise AttributeError(f"Key {key} not available in metadata or in this interface")
-            
-            if self.__dict__[key].value == "" and elements[n]['type'] in ["integer", "float", "datetime", "date", "time"]:
-                return None
-            elif elements[n]['type'] == "integer":
-                return int(self.__dict__[key].value)
-            elif elements[n]['type'] == "float":
-                return float(self.__dict__[key].value)
+        if value is None:
+            return default
+        return value
 
-            elif elements[n]['type'] == "datetime":
-                if len(self.__dict__["_{0}".format(n)].value) == 8:
-                    return datetime.strptime(self.__dict__["_{0}".format(n)].value, "%Y%m%d")
-                elif len(self.__dict__["_{0}".format(n)].value) == 10:
-                    return datetime.strptime(self.__dict__["_{0}".format(n)].value, "%Y-%m-%d")
-                else:
-                    return datetime.strptime(self.__dict__["_{0}".format(n)].value, "%Y-%m-%dT%H:%M:%S")
-            elif elements[n]['type'] == "date":
-                if len(self.__dict__["_{0}".format(n)].value) == 8:
-                    return datetime.strptime(self.__dict__["_{0}".format(n)].value, "%Y%m%d").date()
-                else:
-                    return datetime.strptime(self.__dict__["_{0}".format(n)].value, "%Y-%m-%d").date()
-            elif elements[n]['type'] == "time":
-                if len(self.__dict__["_{0}".format(n)].value) == 8 and self.__dict__["_{0}".format(n)].value.find(":") == -1:
-                    return datetime.strptime(self.__dict__["_{0}".format(n)].value, "%H%M%S%f").time()
-                elif len(self.__dict__["_{0}".format(n)].value) <= 8:
-                    return datetime.strptime(self.__dict__["_{0}".format(n)].value, "%H:%M:%S").time()
-                else:
-                    return datetime.strptime(self.__dict__["_{0}".format(n)].value, "%I:%M:%S%p")
-
-            elif elements[n]['type'] == "parent_item":
-                return self.__dict__["_{0}".format(n)]
-            elif elements[n]['type'] == "language":
-                return self.__dict__["_{0}".format(n)].get_lang()
-            elif elements[n]['type'] == 'attribute':
-                key = elements[n]['key']
-                values = elements[n]['values']
-                if key in self.__dict__["_{0}".format(n)].attributes:
-                    v = self.__dict__["_{0}".format(n)].attributes[key]
-                    for value in values:
-                        if v in value:
-                            return value[0]
-                else:
-                    return None
-            elif elements[n]['type'] == "list":
-                return MetadataValueListHelper(self.__dict__["_{0}".format(n)])
-            elif elements[n]['type'] == "object_list":
-                return MetadataObjectListHelper(self.__dict__["_{0}".format(n)])
-            else:
-                return self.__dict__["_{0}".format(n)].value
-        else:
-            return self.__dict__[n]
+    def has(self, name):
+        """
+        Check if an element has a value, without creating it
+        :param name: string
+        :return: boolean
+        """
+        value = self.get(name)
+        if value is None:
+            return False
+        elif isinstance(value, (str, list, MetadataValueListHelper, MetadataObjectListHelper)):
+            return len(value) > 0
+        return True
 
     def get_datatype(self):
         """
@@ -508,8 +378,7 @@ class MetadataEditor(object):
                     return server_type
 
         # get datatype
-        desc = arcpy.Describe(self.dataset)
-        return desc.dataType
+        return self._describe.data_type(self.dataset)
 
     def get_workspace(self):
         """
@@ -522,20 +391,7 @@ class MetadataEditor(object):
         if self.dataset.startswith("http://") or self.dataset.startswith("https://"):
             return "Server"
 
-        workspace = self.dataset
-        desc = arcpy.Describe(workspace)
-
-        while True:
-
-            if desc.dataType == "Workspace" or desc.dataType == "Folder":
-                return workspace
-            else:
-                workspace = os.path.dirname(workspace)
-                if workspace == '' and arcpy.env.workspace:
-                    return arcpy.env.workspace
-                if workspace == '':
-                    return os.path.curdir
-                desc = arcpy.Describe(workspace)
+        return self._describe.workspace(self.dataset)
 
     def get_workspace_type(self):
         """
@@ -547,8 +403,7 @@ class MetadataEditor(object):
         if self._workspace == "Server":
             return "Server"
 
-        desc = arcpy.Describe(self._workspace)
-        return desc.workspaceType
+        return self._describe.workspace_type(self._workspace)
 
     def initialize_items(self):
         """
@@ -563,47 +418,68 @@ class MetadataEditor(object):
         Remove all items from the geoprocessing history
         :return:
         """
-        element = self.elements.find("Esri/DataProperties/lineage")
-        if element is not None:
-            i = 0
-            children = element.findall("Process")
-            for child in children:
-                element.remove(child)
-                i += 1
-            self.logger.info("Remove {0} item(s) from the geoprocessing history".format(i))
-        else:
+        self.prune_gp_history()
+
+    def prune_gp_history(self, keep_last=None, after=None, tools=None):
+        """
+        Remove items from the geoprocessing history. Items matching any of the given rules are kept,
+        without any rule all items are removed
+        :param keep_last: int, keep the last n items
+        :param after: datetime or date, keep items of tools that ran later than this
+        :param tools: list of tool names, keep items of these tools
+        :return: int, number of removed items
+        """
+        if self.read_only:
+            raise PermissionError("Can't remove the geoprocessing history - metadata was opened read only")
+
+        element = self.elements.find(gp_history.lineage_path)
+        if element is None:
             self.logger.info("There are no items in the geoprocessing history")
+            return 0
 
+        removed = gp_history.prune(element, gp_history.RetentionPolicy(keep_last, after, tools))
+        if removed:
+            self._structure_changed(gp_history.lineage_path, removed)
+            self._mark_changed(gp_history.lineage_path)
+        self.logger.info("Remove {0} item(s) from the geoprocessing history".format(len(removed)))
+        return len(removed)
 
-    def save(self, Enable_automatic_updates=False):
+    def save(self, Enable_automatic_updates=False, force=False):
         """
         Save pending edits to file
         If feature class, import temporary XML file back into GDB
+        If nothing changed since the metadata was opened or last saved, nothing is written or imported
 
         :param Enable_automatic_updates: boolean
-        :return:
+        :param force: boolean, save even if nothing changed
+        :return: boolean, True if the metadata was written
         """
+        if self.read_only:
+            raise PermissionError("Can't save - metadata was opened read only")
+        if self.closed:
+            raise ValueError("Can't save - the editor was closed")
+
+        if not self._changed and not force:
+            self.logger.info("No changes to save")
+            return False
+
         self.logger.info("Saving metadata")
 
         # Write meta-metadata
-        self.meta_style = "ISO 19139 Metadata Implementation Specification"
-        if not self.meta_create_date:
-            self.meta_create_date = datetime.now().date().isoformat()
-        if not self.meta_create_time:
-            self.meta_create_time = datetime.now().time().isoformat()
-        self.meta_modification_date = datetime.now().date().isoformat()
-        self.meta_modification_time = datetime.now().time().isoformat()
-        self.meta_format = "1.0"
-        self.meta_profile = "ISO19139"
-        self.meta_publish_status = "editor:arcpy_metadata"
-
-        for item in self.items:  # TODO: What's going on here?
-            try:
-                self.logger.debug(item.value)
-            except:
-                self.logger.warn(item)
-
-        self.elements.write(self.metadata_file)  # overwrites itself
+        with self._timer("save.stamp"):
+            self.meta_style = "ISO 19139 Metadata Implementation Specification"
+            if not self.meta_create_date:
+                self.meta_create_date = datetime.now().date().isoformat()
+            if not self.meta_create_time:
+                self.meta_create_time = datetime.now().time()
+            self.meta_modification_date = datetime.now().date().isoformat()
+            self.meta_modification_time = datetime.now().time()
+            self.meta_format = "1.0"
+            self.meta_profile = "ISO19139"
+            self.meta_publish_status = "editor:arcpy_metadata"
+
+        with self._timer("save.write"):
+            self._xml.write(self.elements, self.metadata_file)  # overwrites itself
 
         if self._workspace_type != 'FileSystem':  # this is a different check than we use to trigger an export...Should this be updated to be the same as what triggers the export?
 
@@ -613,12 +489,17 @@ class MetadataEditor(object):
                 updates = 'DISABLED'
 
             if not self._arcgis_metadata:
-                self._arcgis_metadata = arcpy.metadata.Metadata(self.dataset)
+                self._arcgis_metadata = self._acquire_handle()
 
             if self._arcgis_metadata.isReadOnly:
                 raise PermissionError("The metadata is read only - this likely means you are accessing a source that we are *unable* to write to, even if you have permissions in another context.")
-            self._arcgis_metadata.importMetadata(self.metadata_file, self.metadata_import_option)
-            self._arcgis_metadata.save()
+            with self._timer("save.import"):
+                self._arcgis_metadata.importMetadata(self.metadata_file, self.metadata_import_option)
+                self._arcgis_metadata.save()
+
+        self._changed.clear()
+        self.save_count += 1
+        return True
 
     def cleanup(self):
         """
@@ -627,18 +508,53 @@ class MetadataEditor(object):
         """
         try:
             self.logger.debug("cleaning up from metadata operation")
-            if self._workspace_type != 'FileSystem':
-                if os.path.exists(self.metadata_file):
-                    os.remove(self.metadata_file)
+            with self._timer("cleanup"):
+                if self._workspace_type != 'FileSystem':
+                    if os.path.exists(self.metadata_file):
+                        os.remove(self.metadata_file)
 
         except:
             self.logger.warn("Unable to remove temporary metadata files")
 
-    def finish(self, Enable_automatic_updates=False):
+    def _acquire_handle(self):
         """
-        Alias for saving and cleaning up
-        :param Enable_automatic_updates: boolean
+        :return: arcpy.metadata.Metadata of the dataset, from the handle pool if there is one
+        """
+        if self._handle_pool is not None:
+            return self._handle_pool.acquire(self.dataset)
+        return _arcpy_metadata_handle(self.dataset)
+
+    def close(self):
+        """
+        Remove all temporary files and release the handle to the dataset's metadata
+        Changes that weren't saved are lost. Closing a closed editor does nothing
         :return:
         """
-        self.save(Enable_automatic_updates)
+        if self.closed:
+            return
         self.cleanup()
+        if self._arcgis_metadata is not None:
+            if self._handle_pool is not None:
+                self._handle_pool.release(self.dataset)
+            self._arcgis_metadata = None
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def finish(self, Enable_automatic_updates=False):
+        """
+        Alias for saving and closing
+        :param Enable_automatic_updates: boolean
+        :return: boolean, True if the metadata was written
+        """
+        saved = self.save(Enable_automatic_updates)
+        self.close()
+        return saved
+
+
+# one property per element of elements.py
+descriptors = make_descriptors(MetadataEditor, elements)
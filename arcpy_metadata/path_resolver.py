@@ -0,0 +1,181 @@
+import re
+
+from arcpy_metadata.elements import elements
+
+
+_step_pattern = re.compile(r"^([^\[\]/]+)((?:\[[^\]]+\])*)$")
+
+
+def parse_step(step):
+    """
+    Split a single path step like "searchKeys[last()]" into its tag and predicates
+    Supported predicates are positions ([1]), [last()] and attribute values ([@key='value'])
+    :param step: string
+    :return: tuple (tag, tuple of predicates)
+    """
+    match = _step_pattern.match(step)
+    if match is None:
+        raise ValueError("Unsupported path step {0}".format(step))
+
+    tag = match.group(1)
+    predicates = []
+    if match.group(2):
+        for predicate in match.group(2)[1:-1].split("]["):
+            if predicate == "last()":
+                predicates.append(("last", None))
+            elif predicate.isdigit():
+                predicates.append(("index", int(predicate)))
+            elif predicate.startswith("@") and "=" in predicate:
+                key, value = predicate[1:].split("=", 1)
+                predicates.append(("attribute", (key, value[1:-1])))
+            else:
+                raise ValueError("Unsupported predicate [{0}] in path step {1}".format(predicate, step))
+
+    return tag, tuple(predicates)
+
+
+def _apply_predicates(candidates, predicates):
+    for kind, argument in predicates:
+        if not candidates:
+            break
+        if kind == "last":
+            candidates = candidates[-1:]
+        elif kind == "index":
+            candidates = candidates[argument - 1:argument] if argument > 0 else []
+        else:
+            key, value = argument
+            candidates = [c for c in candidates if c.get(key) == value]
+    return candidates
+
+
+class _TrieNode(object):
+
+    def __init__(self, tag=None, predicates=()):
+        self.tag = tag
+        self.predicates = predicates
+        self.children = {}
+        self.paths = []  # full paths that end at this node
+
+
+class PathTrie(object):
+    """
+    Prefix tree of element paths. All paths get resolved against a document in a single walk,
+    so shared prefixes like dataIdInfo/idCitation are only visited once
+    """
+
+    def __init__(self, paths=None):
+        self.root = _TrieNode()
+        self.paths = []
+        for path in paths or []:
+            self.add(path)
+
+    def add(self, path):
+        """
+        Add a path to the trie
+        :param path: string, relative to the document root
+        :return:
+        """
+        if path in self.paths:
+            return
+
+        node = self.root
+        for step in path.split("/"):
+            if step not in node.children:
+                tag, predicates = parse_step(step)
+                node.children[step] = _TrieNode(tag, predicates)
+            node = node.children[step]
+        node.paths.append(path)
+        self.paths.append(path)
+
+    def resolve(self, root):
+        """
+        Resolve all paths in the trie against the given root element
+        :param root: root element of the document
+        :return: ResolvedPaths
+        """
+        found = {}
+        self._resolve(self.root, [root], found)
+        return ResolvedPaths(found)
+
+    def _resolve(self, node, parents, found):
+        tags = set(child.tag for child in node.children.values())
+
+        by_tag = {}
+        for parent in parents:
+            for element in parent:
+                if element.tag in tags:
+                    by_tag.setdefault((id(parent), element.tag), []).append(element)
+
+        for child in node.children.values():
+            matches = []
+            for parent in parents:
+                candidates = by_tag.get((id(parent), child.tag), [])
+                matches.extend(_apply_predicates(candidates, child.predicates))
+
+            for path in child.paths:
+                found[path] = matches
+            if child.children:
+                self._resolve(child, matches, found)
+
+
+class ResolvedPaths(object):
+    """
+    Elements found for each path of a PathTrie in one document
+    """
+
+    def __init__(self, found):
+        self._found = found
+
+    def findall(self, path):
+        """
+        Get all elements matching a path, the same as root.findall(path)
+        :param path: string
+        :return: list of elements or None if the path was not resolved
+        """
+        return self._found.get(path)
+
+    def record(self, path, element):
+        """
+        Remember an element that got created for a path which could not be resolved before
+        :param path: string
+        :param element: element
+        :return:
+        """
+        if path in self._found:
+            self._found[path] = [element]
+
+    def invalidate(self, path):
+        """
+        Forget all resolved paths below the given path, eg after child elements got removed
+        :param path: string
+        :return:
+        """
+        prefix = path + "/"
+        for p in [p for p in self._found if p.startswith(prefix)]:
+            del self._found[p]
+
+
+def schema_paths(schema):
+    """
+    List all paths the editor looks up in an element schema. Children of parent items and object lists are found
+    from their own element, so only the paths of the items themselves are needed
+    :param schema: dictionary of elements like arcpy_metadata.elements.elements
+    :return: list of paths
+    """
+    paths = []
+    for name in schema:
+        path = schema[name]["path"]
+        element_type = schema[name]["type"]
+
+        if element_type == "parent_item":
+            path = "{0}[1]".format(path)
+        paths.append(path)
+
+        if element_type == "object_list":
+            path = "{0}/{1}".format(path, schema[name]["tagname"])
+            paths.append(path)
+    return paths
+
+
+# compile all paths once on import
+element_paths = PathTrie(schema_paths(elements))
@@ -0,0 +1,205 @@
+from arcpy_metadata.elements import elements
+from arcpy_metadata.path_resolver import PathTrie
+from arcpy_metadata.xml_backend import get_backend
+from arcpy_metadata.value_codecs import get_codec, enum_map
+
+
+def decode_value(element_type, text):
+    """
+    Type cast the text of an element the same way MetadataEditor does
+    :param element_type: string, type of the element in elements.py
+    :param text: string
+    :return: typed value or None for empty values
+    """
+    if text is None:
+        return None
+    codec = get_codec(element_type)
+    if codec is not None:
+        return codec.decode(text)
+    return text.strip()
+
+
+def _attribute_value(element, spec):
+    code = element.get(spec["key"])
+    if code is None:
+        return None
+    return enum_map(spec["values"]).label(code)
+
+
+def extract_child_value(element, spec):
+    """
+    Read the value of a child element of a parent item (like a contact) without changing the tree
+    :param element: the node of the parent item
+    :param spec: the child's definition, eg from contact_elements
+    :return: string. Like in the editor, a missing or empty child is an empty string and a missing attribute None
+    """
+    node = element.find(spec["path"])
+    if spec["type"] == "attribute":
+        return _attribute_value(node, spec) if node is not None else None
+    elif node is None or node.text is None:
+        return ""
+    else:
+        return node.text.strip()
+
+
+def _child_values(element, child_elements):
+    values = {}
+    for name in child_elements:
+        values[name] = extract_child_value(element, child_elements[name])
+    return values
+
+
+def extract_value(element, spec):
+    """
+    Read the value of a metadata element from its node, without changing the node
+    :param element: the node found at the element's path
+    :param spec: the element's definition in elements.py
+    :return: value of the same type MetadataEditor returns. Lists and objects are returned as plain lists and dicts
+    """
+    element_type = spec["type"]
+    if element_type == "attribute":
+        return _attribute_value(element, spec)
+    elif element_type == "list":
+        return [child.text for child in element if child.tag == spec["tagname"]]
+    elif element_type == "parent_item":
+        return _child_values(element, spec["elements"])
+    elif element_type == "object_list":
+        return [_child_values(child, spec["elements"]) for child in element if child.tag == spec["tagname"]]
+    else:
+        return decode_value(element_type, element.text)
+
+
+class _OpenElement(object):
+
+    def __init__(self, element, nodes):
+        self.element = element
+        self.nodes = nodes  # trie nodes matched by this element
+        self.counts = {}  # number of children seen per tag
+        self.captures = []  # names of the requested elements found at this element
+
+
+class MetadataReader(object):
+    """
+    Read-only access to selected metadata elements without building the whole tree
+
+    The document is streamed with iterparse. Only the subtrees of requested elements are kept until their value
+    is read, everything else is dropped as soon as it is parsed, and parsing stops once all values are found.
+    Memory use therefore doesn't grow with the size of the document (like large eainfo or lineage sections)
+    """
+
+    def __init__(self, names=None, xml_backend=None):
+        """
+        :param names: list of element names from elements.py, defaults to all of them
+        :param xml_backend: "lxml" or "stdlib", defaults to lxml if it is installed
+        """
+        if names is None:
+            names = list(elements.keys())
+        for name in names:
+            if name not in elements:
+                raise KeyError("{0} is not a supported metadata element".format(name))
+
+        self.names = list(names)
+        self._xml = get_backend(xml_backend)
+        self._trie = PathTrie()
+        self._names_by_path = {}
+        self._finalize_depth = {}
+
+        for name in self.names:
+            path = elements[name]["path"]
+            self._trie.add(path)
+            self._names_by_path.setdefault(path, []).append(name)
+
+            # with [last()] the value is only final once the parent of that step is closed
+            steps = path.split("/")
+            for i, step in enumerate(steps):
+                if step.endswith("[last()]"):
+                    self._finalize_depth[name] = i
+                    break
+
+    def read(self, metadata_file):
+        """
+        Read the requested elements from a metadata file
+        :param metadata_file: path to the XML file
+        :return: dictionary of element name -> value, None for missing elements
+        """
+        values = dict.fromkeys(self.names)
+        done = set()
+        pending = {}  # depth -> names waiting for the end of the element at that depth
+        stack = []
+        capture_depth = 0
+
+        for event, element in self._xml.iterparse(metadata_file, events=("start", "end")):
+            if event == "start":
+                if not stack:
+                    stack.append(_OpenElement(element, [self._trie.root]))
+                    continue
+
+                parent = stack[-1]
+                count = parent.counts.get(element.tag, 0) + 1
+                parent.counts[element.tag] = count
+
+                nodes = []
+                for node in parent.nodes:
+                    for child in node.children.values():
+                        if child.tag == element.tag and self._matches(child, element, count):
+                            nodes.append(child)
+
+                entry = _OpenElement(element, nodes)
+                for node in nodes:
+                    for path in node.paths:
+                        entry.captures.extend(name for name in self._names_by_path[path] if name not in done)
+                if entry.captures:
+                    capture_depth += 1
+                stack.append(entry)
+
+            else:
+                entry = stack.pop()
+                depth = len(stack)
+
+                for name in entry.captures:
+                    if name in done:
+                        continue
+                    values[name] = extract_value(element, elements[name])
+                    if name in self._finalize_depth:
+                        pending.setdefault(self._finalize_depth[name], set()).add(name)
+                    else:
+                        done.add(name)
+
+                if depth in pending:
+                    done.update(pending.pop(depth))
+
+                if entry.captures:
+                    capture_depth -= 1
+                if stack and capture_depth == 0:
+                    # the parser may already have added following siblings, so it's not always the last child
+                    parent = stack[-1].element
+                    if parent[-1] is element:
+                        del parent[-1]
+                    else:
+                        parent.remove(element)
+
+                if len(done) == len(self.names):
+                    break
+
+        return values
+
+    @staticmethod
+    def _matches(node, element, count):
+        for kind, argument in node.predicates:
+            if kind == "index" and count != argument:
+                return False
+            elif kind == "attribute" and element.get(argument[0]) != argument[1]:
+                return False
+            # [last()] matches every candidate, later siblings overwrite the value until the parent closes
+        return True
+
+
+def read_metadata(metadata_file, names=None, xml_backend=None):
+    """
+    Shortcut to read selected elements from a single metadata file with MetadataReader
+    :param metadata_file: path to the XML file
+    :param names: list of element names, defaults to all elements
+    :param xml_backend: "lxml" or "stdlib", defaults to lxml if it is installed
+    :return: dictionary of element name -> value
+    """
+    return MetadataReader(names, xml_backend).read(metadata_file)
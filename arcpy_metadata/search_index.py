@@ -0,0 +1,293 @@
+import os
+import json
+import shutil
+import hashlib
+import sqlite3
+import logging
+import tempfile
+from datetime import date, time
+
+from arcpy_metadata.reader import MetadataReader
+
+# elements that can be searched with full text queries
+text_columns = ["title", "abstract", "purpose", "tags"]
+
+_schema = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    dataset TEXT UNIQUE NOT NULL,
+    source TEXT NOT NULL,
+    metadata_file TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    element_values TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_source ON documents (source);
+CREATE TABLE IF NOT EXISTS element_values (
+    document INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS element_values_name ON element_values (name, value);
+CREATE INDEX IF NOT EXISTS element_values_document ON element_values (document);
+"""
+
+
+def _json_default(value):
+    if isinstance(value, (date, time)):  # datetime is a date
+        return value.isoformat()
+    raise TypeError("Can't store {0} as JSON".format(type(value).__name__))
+
+
+def _text(value):
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _flatten(name, value):
+    """
+    Split a value into (name, text) pairs. Lists give one pair per entry, children of parent items and object lists
+    are named like "point_of_contact.contact_name"
+    """
+    if value is None or value == "":
+        return
+    if isinstance(value, list):
+        for entry in value:
+            yield from _flatten(name, entry)
+    elif isinstance(value, dict):
+        for key in value:
+            yield from _flatten("{0}.{1}".format(name, key), value[key])
+    else:
+        yield name, _text(value)
+
+
+def _file_hash(path, block_size=1 << 16):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MetadataIndex(object):
+    """
+    Search index of metadata elements in a SQLite database
+
+    refresh() indexes the metadata files found in folders (like shapefile.shp.xml sidecar files), refresh_workspace()
+    the metadata exported from the datasets of a geodatabase. On each refresh, files whose modification time and
+    size didn't change are skipped, and files whose content hash didn't change aren't parsed again.
+    Queries only read the database, never any XML.
+    """
+
+    def __init__(self, database, xml_backend=None):
+        """
+        :param database: string, path to the SQLite database. It is created if it doesn't exist
+        :param xml_backend: "lxml", "stdlib" or None for the default
+        """
+        self.database = database
+        self.logger = logging.getLogger(__name__)
+        self._reader = MetadataReader(xml_backend=xml_backend)
+        self._connection = sqlite3.connect(database)
+        self._connection.executescript(_schema)
+        self._create_text_index()
+
+    def _create_text_index(self):
+        columns = ", ".join(text_columns)
+        try:
+            self._connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS text_index USING fts5({0})".format(columns))
+        except sqlite3.OperationalError:  # SQLite built without FTS5
+            self._connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS text_index USING fts4({0})".format(columns))
+        # an existing database keeps the table it was created with
+        sql = self._connection.execute("SELECT sql FROM sqlite_master WHERE name = 'text_index'").fetchone()[0]
+        self._ranked = "fts5" in sql.lower()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+    def refresh(self, folders, extension=".xml"):
+        """
+        Index all metadata files in the folders and their subfolders, and drop the files that no longer exist.
+        The dataset of a file is its path without the extension, so rivers.shp.xml belongs to rivers.shp
+        :param folders: string or list of strings
+        :param extension: string, only index files ending with it
+        :return: dictionary with the number of "added", "updated", "unchanged" and "removed" files
+        """
+        if isinstance(folders, str):
+            folders = [folders]
+
+        counts = dict.fromkeys(["added", "updated", "unchanged", "removed"], 0)
+        with self._connection:
+            for folder in folders:
+                source = os.path.abspath(folder)
+                seen = set()
+                for dirpath, dirnames, filenames in os.walk(source):
+                    for filename in filenames:
+                        if filename.endswith(extension):
+                            metadata_file = os.path.join(dirpath, filename)
+                            dataset = metadata_file[:-len(extension)]
+                            counts[self._index_file(dataset, source, metadata_file)] += 1
+                            seen.add(dataset)
+                counts["removed"] += self._remove_missing(source, seen)
+        return counts
+
+    def refresh_workspace(self, workspace, store=None, export_option="EXACT_COPY"):
+        """
+        Export the metadata of all datasets of a workspace (like a geodatabase) and index it. Datasets that no longer
+        exist are dropped. The export is needed to read the metadata, but unchanged metadata isn't parsed again
+        :param workspace: string, path to the workspace
+        :param store: MetadataStore, defaults to ArcpyMetadataStore
+        :param export_option: string
+        :return: dictionary with the number of "added", "updated", "unchanged" and "removed" datasets
+        """
+        from arcpy_metadata.workspace_session import ArcpyMetadataStore  # needs arcpy
+        if store is None:
+            store = ArcpyMetadataStore()
+
+        counts = dict.fromkeys(["added", "updated", "unchanged", "removed"], 0)
+        export_folder = tempfile.mkdtemp("arcpy_metadata_index")
+        try:
+            with self._connection:
+                seen = set()
+                for i, dataset in enumerate(store.datasets(workspace)):
+                    metadata_file = os.path.join(export_folder, "{0}.xml".format(i))
+                    handle = store.open(dataset)
+                    try:
+                        store.export(handle, metadata_file, export_option)
+                    finally:
+                        store.release(handle)
+                    counts[self._index_file(dataset, workspace, dataset, check_stat=False,
+                                            exported_file=metadata_file)] += 1
+                    seen.add(dataset)
+                counts["removed"] += self._remove_missing(workspace, seen)
+        finally:
+            shutil.rmtree(export_folder)
+        return counts
+
+    def _index_file(self, dataset, source, metadata_file, check_stat=True, exported_file=None):
+        """
+        :param check_stat: boolean, skip the file if its modification time and size didn't change
+        :param exported_file: string, temporary export to read instead of metadata_file, which is only stored
+        :return: "added", "updated" or "unchanged"
+        """
+        path = exported_file if exported_file is not None else metadata_file
+        stat = os.stat(path)
+        row = self._connection.execute("SELECT id, mtime, size, hash, source, metadata_file FROM documents "
+                                       "WHERE dataset = ?", (dataset,)).fetchone()
+        # files that couldn't be read have no hash, they are read again on every refresh
+        if row is not None and row[3] and check_stat and (row[1], row[2]) == (stat.st_mtime, stat.st_size):
+            if (row[4], row[5]) != (source, metadata_file):  # seen from another folder, it belongs to it now
+                self._connection.execute("UPDATE documents SET source = ?, metadata_file = ? WHERE id = ?",
+                                         (source, metadata_file, row[0]))
+            return "unchanged"
+
+        content_hash = _file_hash(path)
+        if row is not None and row[3] == content_hash:
+            self._connection.execute("UPDATE documents SET source = ?, metadata_file = ?, mtime = ?, size = ? "
+                                     "WHERE id = ?", (source, metadata_file, stat.st_mtime, stat.st_size, row[0]))
+            return "unchanged"
+
+        try:
+            values = self._reader.read(path)
+        except Exception as e:
+            self.logger.warning("Can't index {0}: {1}".format(metadata_file, e))
+            values = {}
+            content_hash = ""
+
+        if row is None:
+            document = self._connection.execute(
+                "INSERT INTO documents (dataset, source, metadata_file, mtime, size, hash, element_values) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (dataset, source, metadata_file, stat.st_mtime, stat.st_size, content_hash,
+                 json.dumps(values, default=_json_default))).lastrowid
+        else:
+            document = row[0]
+            self._connection.execute(
+                "UPDATE documents SET source = ?, metadata_file = ?, mtime = ?, size = ?, hash = ?, "
+                "element_values = ? WHERE id = ?",
+                (source, metadata_file, stat.st_mtime, stat.st_size, content_hash,
+                 json.dumps(values, default=_json_default), document))
+            self._delete_values(document)
+
+        self._connection.executemany("INSERT INTO element_values (document, name, value) VALUES (?, ?, ?)",
+                                     [(document, name, text) for key in values for name, text in
+                                      _flatten(key, values[key])])
+        texts = []
+        for name in text_columns:
+            value = values.get(name)
+            texts.append(" ".join(value) if isinstance(value, list) else value)
+        self._connection.execute("INSERT INTO text_index (rowid, {0}) VALUES (?, ?, ?, ?, ?)".format(
+            ", ".join(text_columns)), [document] + texts)
+        return "added" if row is None else "updated"
+
+    def _delete_values(self, document):
+        self._connection.execute("DELETE FROM element_values WHERE document = ?", (document,))
+        self._connection.execute("DELETE FROM text_index WHERE rowid = ?", (document,))
+
+    def _remove_missing(self, source, seen):
+        removed = 0
+        for document, dataset in self._connection.execute("SELECT id, dataset FROM documents WHERE source = ?",
+                                                          (source,)).fetchall():
+            if dataset not in seen:
+                self._delete_values(document)
+                self._connection.execute("DELETE FROM documents WHERE id = ?", (document,))
+                removed += 1
+        return removed
+
+    def search(self, query, limit=None):
+        """
+        Full text search in title, abstract, purpose and tags
+        :param query: string, SQLite full text query, like "rivers", "title:rivers" or "river* AND NOT lake"
+        :param limit: int, maximum number of results
+        :return: list of datasets, best matches first
+        """
+        sql = "SELECT documents.dataset FROM text_index JOIN documents ON documents.id = text_index.rowid " \
+              "WHERE text_index MATCH ?"
+        if self._ranked:
+            sql += " ORDER BY rank"
+        parameters = [query]
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [row[0] for row in self._connection.execute(sql, parameters)]
+
+    def find(self, conditions=None, **values):
+        """
+        Find the datasets where elements have the given values. A list element (like tags) matches if any of its
+        entries does. Children of parent items and object lists are named like "point_of_contact.contact_name"
+        or "fields.name". Dates are compared in ISO format
+        :param conditions: dictionary of element name -> value
+        :param values: more element name -> value conditions
+        :return: list of datasets matching all conditions
+        """
+        conditions = dict(conditions or {}, **values)
+        if not conditions:
+            return [row[0] for row in self._connection.execute("SELECT dataset FROM documents ORDER BY dataset")]
+
+        subqueries = " INTERSECT ".join(["SELECT document FROM element_values WHERE name = ? AND value = ?"]
+                                        * len(conditions))
+        parameters = []
+        for name in conditions:
+            parameters.extend([name, _text(conditions[name])])
+        sql = "SELECT dataset FROM documents WHERE id IN ({0}) ORDER BY dataset".format(subqueries)
+        return [row[0] for row in self._connection.execute(sql, parameters)]
+
+    def values(self, dataset):
+        """
+        Get the indexed values of a dataset, dates and times are ISO formatted strings
+        :param dataset: string
+        :return: dictionary of element name -> value, None if the dataset isn't indexed
+        """
+        row = self._connection.execute("SELECT element_values FROM documents WHERE dataset = ?",
+                                       (dataset,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
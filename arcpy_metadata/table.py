@@ -0,0 +1,208 @@
+import io
+import os
+import csv
+import json
+import itertools
+import collections
+import concurrent.futures
+from datetime import date, time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from arcpy_metadata.elements import elements
+from arcpy_metadata.reader import MetadataReader
+
+# element types that become numpy arrays, and the dtype for each
+_array_types = {"integer": "int64", "float": "float64", "datetime": "datetime64[s]", "date": "datetime64[D]"}
+
+_readers = {}  # (columns, xml_backend) -> MetadataReader, one per worker process
+
+
+def _read_rows(paths, columns, xml_backend):
+    """
+    Read a chunk of files. Runs inside the worker processes, so it needs to be importable and must not raise
+    """
+    key = (columns, xml_backend)
+    if key not in _readers:
+        _readers[key] = MetadataReader(columns, xml_backend)
+    reader = _readers[key]
+
+    rows = []
+    for path in paths:
+        try:
+            values = reader.read(path)
+            error = None
+        except Exception as e:
+            values = dict.fromkeys(columns)
+            error = "{0}: {1}".format(type(e).__name__, e)
+        rows.append((path, [values[name] for name in columns], error))
+    return rows
+
+
+def _check_columns(columns):
+    columns = tuple(columns)
+    for name in columns:
+        if name not in elements:
+            raise KeyError("{0} is not a supported metadata element".format(name))
+    return columns
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_rows(paths, columns, max_workers=None, chunksize=256, xml_backend=None):
+    """
+    Read elements from many metadata files with a pool of worker processes, without opening editors. Values have
+    the same types the editor returns, lists and objects are plain lists and dicts.
+    On Windows, call it inside an `if __name__ == "__main__":` block.
+    :param paths: iterable of metadata file paths
+    :param columns: list of element names from elements.py
+    :param max_workers: number of worker processes, defaults to the number of processors
+    :param chunksize: number of files handed to a worker at once
+    :param xml_backend: "lxml", "stdlib" or None for the default
+    :return: generator of (path, list of values in the order of columns, error) tuples, in the order of paths.
+             error is None, or a description of the exception if the file couldn't be read
+    """
+    columns = _check_columns(columns)
+    read_ahead = 2 * (max_workers or os.cpu_count() or 1)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # only a few chunks are read ahead, so the paths and rows are never all in memory
+        pending = collections.deque()
+        for chunk in _chunks(paths, chunksize):
+            pending.append(executor.submit(_read_rows, chunk, columns, xml_backend))
+            if len(pending) > read_ahead:
+                for row in pending.popleft().result():
+                    yield row
+        while pending:
+            for row in pending.popleft().result():
+                yield row
+
+
+def _to_array(values, element_type):
+    dtype = _array_types[element_type]
+    if element_type == "integer" and None in values:
+        # integers have no missing value, use floats with NaN like pandas does
+        dtype = "float64"
+    missing = float("nan") if dtype == "float64" else "NaT"
+    return numpy.array([missing if value is None else value for value in values], dtype=dtype)
+
+
+def to_table(paths, columns, arrays=None, max_workers=None, chunksize=256, xml_backend=None):
+    """
+    Read elements from many metadata files into columns
+    :param paths: iterable of metadata file paths
+    :param columns: list of element names from elements.py
+    :param arrays: boolean, return integer, float, datetime and date columns as numpy arrays. Missing values are
+                   NaN or NaT, integer columns with missing values become floats. Defaults to True if numpy is
+                   installed
+    :param max_workers: number of worker processes, defaults to the number of processors
+    :param chunksize: number of files handed to a worker at once
+    :param xml_backend: "lxml", "stdlib" or None for the default
+    :return: dictionary of column name -> list or array, with the additional columns "path" and "error"
+    """
+    if arrays is None:
+        arrays = numpy is not None
+    elif arrays and numpy is None:
+        raise ImportError("numpy is needed for arrays=True")
+
+    columns = _check_columns(columns)
+    table = collections.OrderedDict((name, []) for name in ("path",) + columns + ("error",))
+    values_by_column = [table[name] for name in columns]
+    for path, values, error in iter_rows(paths, columns, max_workers, chunksize, xml_backend):
+        table["path"].append(path)
+        table["error"].append(error)
+        for column, value in zip(values_by_column, values):
+            column.append(value)
+
+    if arrays:
+        for name in columns:
+            if elements[name]["type"] in _array_types:
+                table[name] = _to_array(table[name], elements[name]["type"])
+    return table
+
+
+def _json_default(value):
+    if isinstance(value, (date, time)):  # datetime is a date
+        return value.isoformat()
+    raise TypeError("Can't write {0} as JSON".format(type(value).__name__))
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    elif isinstance(value, (date, time)):
+        return value.isoformat()
+    elif isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def _open_output(output):
+    if isinstance(output, str):
+        return io.open(output, "w", encoding="utf-8", newline=""), True
+    return output, False
+
+
+def write_csv(paths, columns, output, max_workers=None, chunksize=256, xml_backend=None):
+    """
+    Read elements from many metadata files and write them to a CSV file, one row per file as soon as it is read.
+    Dates and times are written in ISO format, lists and objects as JSON
+    :param paths: iterable of metadata file paths
+    :param columns: list of element names from elements.py
+    :param output: path of the CSV file or a file object opened with newline=""
+    :param max_workers: number of worker processes, defaults to the number of processors
+    :param chunksize: number of files handed to a worker at once
+    :param xml_backend: "lxml", "stdlib" or None for the default
+    :return: int, number of rows written
+    """
+    columns = _check_columns(columns)
+    f, close = _open_output(output)
+    try:
+        writer = csv.writer(f)
+        writer.writerow(("path",) + columns + ("error",))
+        count = 0
+        for path, values, error in iter_rows(paths, columns, max_workers, chunksize, xml_backend):
+            writer.writerow([path] + [_csv_value(value) for value in values] + [error or ""])
+            count += 1
+    finally:
+        if close:
+            f.close()
+    return count
+
+
+def write_jsonl(paths, columns, output, max_workers=None, chunksize=256, xml_backend=None):
+    """
+    Read elements from many metadata files and write them as JSON Lines, one object per file as soon as it is
+    read. Dates and times are written in ISO format
+    :param paths: iterable of metadata file paths
+    :param columns: list of element names from elements.py
+    :param output: path of the file or a text file object
+    :param max_workers: number of worker processes, defaults to the number of processors
+    :param chunksize: number of files handed to a worker at once
+    :param xml_backend: "lxml", "stdlib" or None for the default
+    :return: int, number of lines written
+    """
+    columns = _check_columns(columns)
+    f, close = _open_output(output)
+    try:
+        count = 0
+        for path, values, error in iter_rows(paths, columns, max_workers, chunksize, xml_backend):
+            row = collections.OrderedDict([("path", path)])
+            row.update(zip(columns, values))
+            row["error"] = error
+            f.write(json.dumps(row, default=_json_default))
+            f.write("\n")
+            count += 1
+    finally:
+        if close:
+            f.close()
+    return count
@@ -0,0 +1,259 @@
+import collections
+
+from arcpy_metadata.elements import elements
+from arcpy_metadata.path_resolver import PathTrie
+from arcpy_metadata.reader import decode_value
+from arcpy_metadata.xml_backend import get_backend
+from arcpy_metadata.metadata_editor import MetadataEditor
+
+OVERWRITE = "overwrite"  # replace the target's value
+FILL = "fill"  # only set empty values of the target
+APPEND = "append"  # add the entries the target doesn't have yet, lists and object lists only
+
+# how the value of each element type is merged, unless a rule is given for the element
+default_rules = {
+    "string": OVERWRITE,
+    "integer": OVERWRITE,
+    "float": OVERWRITE,
+    "datetime": OVERWRITE,
+    "date": OVERWRITE,
+    "time": OVERWRITE,
+    "attribute": OVERWRITE,
+    "list": APPEND,
+    "parent_item": FILL,
+    "object_list": APPEND,
+}
+
+_Step = collections.namedtuple("_Step", ["name", "path", "type", "rule", "value"])
+
+
+def _child_values(node, child_elements):
+    """
+    :return: tuple of (child name, attribute key or None for the text, value) for the children with a value
+    """
+    values = []
+    for name in child_elements:
+        spec = child_elements[name]
+        child = node.find(spec["path"])  # children are direct descendants, like the editor binds them
+        if child is None:
+            continue
+        if spec["type"] == "attribute":
+            value = child.get(spec["key"])
+            if value:
+                values.append((name, spec["key"], value))
+        else:
+            value = (child.text or "").strip()
+            if value:
+                values.append((name, None, value))
+    return tuple(values)
+
+
+def _write(node, key, value, fill):
+    """
+    Write a text or attribute to a node of the target
+    :return: boolean, True if the node changed
+    """
+    current = node.get(key) if key is not None else (node.text or "").strip()
+    if current == value or (fill and current):
+        return False
+    if key is not None:
+        node.set(key, value)
+    else:
+        node.text = value
+    return True
+
+
+class MetadataTemplate(object):
+    """
+    Apply the elements of a template document to many editors or files
+
+    The template is read once and compiled into a merge plan: one step per element with its path, the rule and the
+    value, already checked against its type. Applying the plan writes the values straight to the nodes the target
+    editor is bound to, without going through the checks of the element descriptors again.
+
+    The rule of an element decides how the template value is merged:
+     - overwrite: replace the target's value
+     - fill: only set the value if the target has none. For parent items (like contacts) this is done per child
+     - append: add the entries the target doesn't have yet (lists and object lists only)
+
+    A template can be passed to MetadataBatchEditor as edits.
+    """
+
+    def __init__(self, template, names=None, rules=None, xml_backend=None):
+        """
+        :param template: path to a metadata XML file or a MetadataEditor
+        :param names: list of element names to take from the template, defaults to all elements with a value,
+                      except deprecated ones and the meta_ elements describing the template document itself
+        :param rules: dictionary of element name -> rule, for elements that don't follow default_rules
+        :param xml_backend: "lxml", "stdlib" or None for the default, used to read a template file
+        """
+        if rules is None:
+            rules = {}
+        for name in list(names or []) + list(rules):
+            if name not in elements:
+                raise KeyError("{0} is not a supported metadata element".format(name))
+
+        if names is None:
+            names = [name for name in elements
+                     if "deprecated" not in elements[name] and not name.startswith("meta_")]
+
+        if isinstance(template, MetadataEditor):
+            root = template.elements.getroot()
+        else:
+            root = get_backend(xml_backend).parse(template).getroot()
+
+        found = PathTrie(sorted(set(elements[name]["path"] for name in names))).resolve(root)
+        self.steps = []
+        for name in names:
+            nodes = found.findall(elements[name]["path"])
+            if not nodes:
+                continue
+            element_type = elements[name]["type"]
+            rule = rules.get(name, default_rules[element_type])
+            allowed = [OVERWRITE, FILL, APPEND] if element_type in ("list", "object_list") else [OVERWRITE, FILL]
+            if rule not in allowed:
+                raise TypeError("Rule for {0} must be in {1}".format(name, allowed))
+
+            value = self._compile_value(name, nodes[0])
+            if value:
+                self.steps.append(_Step(name, elements[name]["path"], element_type, rule, value))
+
+    @staticmethod
+    def _compile_value(name, node):
+        spec = elements[name]
+        element_type = spec["type"]
+        if element_type == "attribute":
+            code = node.get(spec["key"])
+            if code and code not in [value[1] for value in spec["values"]]:
+                raise RuntimeWarning("Template value of {0} must be in {1}".format(
+                    name, [value[1] for value in spec["values"]]))
+            return code
+        elif element_type == "list":
+            return tuple(child.text.strip() for child in node if child.tag == spec["tagname"]
+                         and child.text and child.text.strip())
+        elif element_type == "parent_item":
+            return _child_values(node, spec["elements"])
+        elif element_type == "object_list":
+            entries = (_child_values(child, spec["elements"]) for child in node if child.tag == spec["tagname"])
+            return tuple(entry for entry in entries if entry)
+        else:
+            text = (node.text or "").strip()
+            try:
+                decode_value(element_type, text)
+            except ValueError:
+                raise RuntimeWarning("Template value of {0} is not a valid {1}: {2}".format(name, element_type, text))
+            return text
+
+    @property
+    def names(self):
+        """
+        :return: list of the element names the template sets
+        """
+        return [step.name for step in self.steps]
+
+    def __call__(self, metadata):
+        return self.apply(metadata)
+
+    def apply(self, metadata):
+        """
+        Merge the template into an editor
+        :param metadata: MetadataEditor
+        :return: list of the names of the elements that changed
+        """
+        if metadata.read_only:
+            raise PermissionError("Can't apply a template - metadata was opened read only")
+
+        changed = []
+        for step in self.steps:
+            key = "_{0}".format(step.name)
+            if key not in metadata.__dict__:
+                metadata._bind_element(step.name)
+            item = metadata.__dict__.get(key)
+            if item is None:  # unsupported for the data type
+                continue
+            if getattr(self, "_apply_{0}".format(step.type), self._apply_text)(metadata, item, step):
+                changed.append(step.name)
+        return changed
+
+    def apply_file(self, metadata_file, save=True, **editor_options):
+        """
+        Merge the template into a metadata file. Only the elements of the template are bound
+        :param metadata_file: string, path to the XML file
+        :param save: boolean, save the file if anything changed
+        :param editor_options: any other keyword arguments for MetadataEditor
+        :return: list of the names of the elements that changed
+        """
+        editor_options.setdefault("lazy", True)
+        with MetadataEditor(metadata_file=metadata_file, **editor_options) as metadata:
+            changed = self.apply(metadata)
+            if save and changed:
+                metadata.save()
+        return changed
+
+    @staticmethod
+    def _apply_text(metadata, item, step):
+        if _write(item._get_element(), None, step.value, step.rule == FILL):
+            metadata._mark_changed(step.path)
+            return True
+        return False
+
+    @staticmethod
+    def _apply_attribute(metadata, item, step):
+        if _write(item._get_element(), elements[step.name]["key"], step.value, step.rule == FILL):
+            metadata._mark_changed(step.path)
+            return True
+        return False
+
+    @staticmethod
+    def _apply_list(metadata, item, step):
+        before = len(item.current_items)
+        if step.rule == OVERWRITE:
+            if tuple(item.value) == step.value:
+                return False
+            item.value = list(step.value)
+            return True
+        elif step.rule == FILL:
+            if before:
+                return False
+            item.extend(step.value)
+        else:
+            item.update(step.value)
+        return len(item.current_items) != before
+
+    @staticmethod
+    def _apply_parent_item(metadata, item, step):
+        changed = False
+        for name, key, value in step.value:
+            changed = _write(item._child(name).element, key, value, step.rule == FILL) or changed
+        if changed:
+            metadata._mark_changed(step.path)
+        return changed
+
+    @staticmethod
+    def _apply_object_list(metadata, item, step):
+        child_elements = elements[step.name]["elements"]
+        existing = [_child_values(child.element, child_elements) for child in item.current_items]
+        existing = [entry for entry in existing if entry]  # empty entries the editor created don't count
+        if step.rule == OVERWRITE:
+            if tuple(existing) == step.value:
+                return False
+            item._removeall()
+            entries = step.value
+        elif step.rule == FILL:
+            if existing:
+                return False
+            entries = step.value
+        else:
+            existing = set(existing)
+            entries = [entry for entry in step.value if entry not in existing]
+
+        for entry in entries:
+            child = item.new()
+            for name, key, value in entry:
+                # set through the item, so the list learns the new names
+                label = child._schema.enums[name].label(value) if key is not None else value
+                if label is not None:
+                    setattr(child, name, label)
+                else:  # a code without a label is copied as it is
+                    _write(child._child(name).element, key, value, False)
+        return len(entries) > 0 or step.rule == OVERWRITE
@@ -0,0 +1,251 @@
+import functools
+from datetime import datetime, date, time
+
+
+class ValueCodec(object):
+    """
+    Converts between the text of a node and the value of one element type
+
+    decode() is cached by text, values are immutable so they can be shared. Reading an element that didn't change
+    costs a dictionary lookup
+    """
+
+    cache_size = 4096
+
+    def __init__(self):
+        self.decode = functools.lru_cache(maxsize=self.cache_size)(self._decode)
+
+    def _decode(self, text):
+        """
+        :param text: string, text of the node
+        :return: value, None for empty text. Raises ValueError if the text can't be decoded
+        """
+        raise NotImplementedError
+
+    def encode(self, value):
+        """
+        :param value: value or string to check and write. None writes an empty node
+        :return: string, text for the node. Raises RuntimeWarning if the value is invalid
+        """
+        if value is None:
+            return ""
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        if isinstance(value, str):
+            try:
+                value = self._decode(value)
+            except ValueError:
+                value = None
+            if value is None:
+                raise RuntimeWarning(self.error)
+            return self._encode_decoded(value)
+        return self._encode(value)
+
+    def _encode(self, value):
+        raise NotImplementedError
+
+    def _encode_decoded(self, value):
+        return self._encode(value)
+
+    error = "Invalid value"
+
+
+def _text(text):
+    # whitespace never belongs to a value, it may come from pretty printed files
+    if text is None:
+        return ""
+    return "".join(text.split())
+
+
+def _parse(text, formats):
+    for f in formats:
+        try:
+            return datetime.strptime(text, f)
+        except ValueError:
+            pass
+    raise ValueError("{0} doesn't match any of {1}".format(text, formats))
+
+
+class IntegerCodec(ValueCodec):
+
+    error = "Input value must be of type Integer"
+
+    def _decode(self, text):
+        text = _text(text)
+        return int(text) if text else None
+
+    def _encode(self, value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return str(value)
+        raise RuntimeWarning(self.error)
+
+
+class FloatCodec(ValueCodec):
+
+    error = "Input value must be of type Float"
+
+    def _decode(self, text):
+        text = _text(text)
+        return float(text) if text else None
+
+    def _encode(self, value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(float(value))
+        raise RuntimeWarning(self.error)
+
+
+class DatetimeCodec(ValueCodec):
+
+    error = "Input value must be of type a Datetime or a String ('%Y%m%d', '%Y-%m-%d' or '%Y-%m-%dT%H:%M:%S')"
+    formats = ["%Y%m%d", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"]
+
+    def _decode(self, text):
+        text = _text(text)
+        if not text:
+            return None
+        if len(text) != 8 and hasattr(datetime, "fromisoformat"):  # Python 3.7+
+            try:
+                return datetime.fromisoformat(text)
+            except ValueError:
+                pass
+        return _parse(text, self.formats)
+
+    def _encode(self, value):
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%dT%H:%M:%S")
+        raise RuntimeWarning(self.error)
+
+    def _encode_decoded(self, value):
+        return value.isoformat()
+
+
+class DateCodec(ValueCodec):
+
+    error = "Input value must be of type a Datetime.date or a String ('%Y%m%d' or '%Y-%m-%d')"
+    formats = ["%Y%m%d", "%Y-%m-%d"]
+
+    def _decode(self, text):
+        text = _text(text)
+        if not text:
+            return None
+        if len(text) == 10 and hasattr(date, "fromisoformat"):  # Python 3.7+
+            try:
+                return date.fromisoformat(text)
+            except ValueError:
+                pass
+        return _parse(text, self.formats).date()
+
+    def _encode(self, value):
+        if isinstance(value, date):  # a datetime is a date too
+            return value.strftime("%Y-%m-%d")
+        raise RuntimeWarning(self.error)
+
+
+class TimeCodec(ValueCodec):
+
+    error = "Input value must be of type a Datetime.time or a String ('%H:%M:%S', '%H%M%S%f' or '%I:%M:%S%p')"
+    formats = ["%H:%M:%S", "%H:%M:%S.%f", "%H:%M", "%I:%M:%S%p"]
+
+    def _decode(self, text):
+        text = _text(text)
+        if not text:
+            return None
+        if len(text) == 8 and ":" not in text:  # ArcGIS writes HHMMSS and hundredths of a second
+            return datetime.strptime(text, "%H%M%S%f").time()
+        if hasattr(time, "fromisoformat"):  # Python 3.7+
+            try:
+                return time.fromisoformat(text)
+            except ValueError:
+                pass
+        return _parse(text, self.formats).time()
+
+    def _encode(self, value):
+        if isinstance(value, time):
+            return value.strftime("%H:%M:%S")
+        raise RuntimeWarning(self.error)
+
+    def _encode_decoded(self, value):
+        return value.isoformat()
+
+
+# element type -> codec
+codecs = {
+    "integer": IntegerCodec(),
+    "float": FloatCodec(),
+    "datetime": DatetimeCodec(),
+    "date": DateCodec(),
+    "time": TimeCodec(),
+}
+
+
+def get_codec(element_type):
+    """
+    :param element_type: string, type of an element in elements.py
+    :return: ValueCodec, None for types without one (like string or list)
+    """
+    return codecs.get(element_type)
+
+
+def register_codec(element_type, codec):
+    """
+    Use a codec for all elements of a type, for example to change how dates are written
+    :param element_type: string
+    :param codec: ValueCodec
+    :return:
+    """
+    codecs[element_type] = codec
+
+
+class EnumMap(object):
+    """
+    Both directions of the values of an attribute element, like [("download", "001"), ("information", "002")].
+    Every label and code is looked up once when the map is built, instead of scanning the values on each access
+    """
+
+    __slots__ = ("values", "labels", "_labels", "_codes", "_codes_by_label")
+
+    def __init__(self, values):
+        self.values = values
+        self.labels = [value[0] for value in values]
+        self._labels = {}  # label or code -> label
+        self._codes = {}  # label or code -> code
+        self._codes_by_label = {}
+        for value in values:
+            for entry in value:
+                self._labels.setdefault(entry, value[0])
+                self._codes.setdefault(entry, value[1])
+            self._codes_by_label[value[0]] = value[1]
+
+    def label(self, value):
+        """
+        :param value: string, code or label
+        :return: string, the label, None if the value is unknown
+        """
+        return self._labels.get(value)
+
+    def code(self, value, labels_only=False):
+        """
+        :param value: string, label or code
+        :param labels_only: boolean, only accept labels
+        :return: string, the code, None if the value is unknown
+        """
+        if labels_only:
+            return self._codes_by_label.get(value)
+        return self._codes.get(value)
+
+
+_enum_maps = {}  # id of a list of values -> EnumMap
+
+
+def enum_map(values):
+    """
+    Get the map for the values of an attribute element, it is only built once
+    :param values: list of (label, code) pairs
+    :return: EnumMap
+    """
+    enum = _enum_maps.get(id(values))
+    if enum is None or enum.values is not values:
+        if len(_enum_maps) > 256:  # values built on the fly
+            _enum_maps.clear()
+        enum = _enum_maps[id(values)] = EnumMap(values)
+    return enum
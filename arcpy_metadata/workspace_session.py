@@ -0,0 +1,245 @@
+import os
+import shutil
+import logging
+import tempfile
+from collections import OrderedDict
+
+from arcpy_metadata import metadata_editor
+from arcpy_metadata.metadata_editor import MetadataEditor
+
+
+class MetadataStore(object):
+    """
+    Where the datasets of a workspace keep their metadata. The session only talks to the store, so it can run
+    against arcpy or against a stand-in without it
+    """
+
+    def datasets(self, workspace):
+        """
+        :param workspace: string, path to the workspace
+        :return: list of paths of all datasets with metadata in the workspace
+        """
+        raise NotImplementedError
+
+    def open(self, dataset):
+        """
+        :param dataset: string, path to the dataset
+        :return: a handle that is passed to all other calls for this dataset
+        """
+        raise NotImplementedError
+
+    def export(self, handle, xml_file, export_option):
+        """
+        Write the metadata of a dataset to an XML file
+        :param handle: handle from open()
+        :param xml_file: string
+        :param export_option: string, eg "EXACT_COPY"
+        :return:
+        """
+        raise NotImplementedError
+
+    def import_metadata(self, handle, xml_file, import_option):
+        """
+        Replace the metadata of a dataset with the content of an XML file
+        :param handle: handle from open()
+        :param xml_file: string
+        :param import_option: string, eg "ARCGIS_METADATA"
+        :return:
+        """
+        raise NotImplementedError
+
+    def is_read_only(self, handle):
+        """
+        :param handle: handle from open()
+        :return: boolean, True if the metadata can't be imported back
+        """
+        return False
+
+    def release(self, handle):
+        """
+        Let go of a handle from open(), it isn't used afterwards
+        :param handle: handle from open()
+        :return:
+        """
+        pass
+
+
+class ArcpyMetadataStore(MetadataStore):
+    """
+    Metadata stored inside a geodatabase, accessed with arcpy.metadata
+    """
+
+    data_types = ["FeatureClass", "Table", "RasterDataset", "RasterCatalog", "MosaicDataset"]
+
+    def __init__(self):
+        import arcpy
+        self._arcpy = arcpy
+
+    def datasets(self, workspace):
+        datasets = []
+        for dirpath, dirnames, filenames in self._arcpy.da.Walk(workspace, datatype=self.data_types):
+            for filename in filenames:
+                datasets.append(os.path.join(dirpath, filename))
+        return datasets
+
+    def open(self, dataset):
+        return self._arcpy.metadata.Metadata(dataset)
+
+    def export(self, handle, xml_file, export_option):
+        handle.saveAsXML(xml_file, export_option)
+
+    def import_metadata(self, handle, xml_file, import_option):
+        handle.importMetadata(xml_file, import_option)
+        handle.save()
+
+    def is_read_only(self, handle):
+        return handle.isReadOnly
+
+
+class FileSystemMetadataStore(MetadataStore):
+    """
+    Stand-in for a geodatabase: a folder where every <dataset>.xml file holds the metadata of <dataset>
+    """
+
+    def datasets(self, workspace):
+        return [os.path.join(workspace, name[:-4]) for name in sorted(os.listdir(workspace)) if name.endswith(".xml")]
+
+    def open(self, dataset):
+        return dataset + ".xml"
+
+    def export(self, handle, xml_file, export_option):
+        shutil.copyfile(handle, xml_file)
+
+    def import_metadata(self, handle, xml_file, import_option):
+        shutil.copyfile(xml_file, handle)
+
+
+class WorkspaceSession(object):
+    """
+    Edit the metadata of all datasets in a workspace (like a geodatabase) in one session
+
+    The metadata of all datasets is exported to one temporary folder when the session is opened. Editors work on
+    the exported files, and commit() imports only the metadata that changed, using the handles from the export.
+    """
+
+    def __init__(self, workspace, store=None, temp_folder=None, metadata_export_option="EXACT_COPY",
+                 metadata_import_option="ARCGIS_METADATA", loglevel="WARNING", **editor_options):
+        """
+        :param workspace: string, path to the workspace
+        :param store: MetadataStore, defaults to ArcpyMetadataStore
+        :param temp_folder: folder for the exported metadata, defaults to the editor's temp folder
+        :param metadata_export_option: string
+        :param metadata_import_option: string
+        :param loglevel: log level for the editors
+        :param editor_options: any other keyword arguments for MetadataEditor, eg lazy=True
+        """
+        if store is None:
+            store = ArcpyMetadataStore()
+        if temp_folder is None:
+            temp_folder = metadata_editor.get_temp_folder()
+
+        self.workspace = workspace
+        self.store = store
+        self.metadata_export_option = metadata_export_option
+        self.metadata_import_option = metadata_import_option
+        self.loglevel = loglevel
+        self.editor_options = editor_options
+        self.logger = logging.getLogger(__name__)
+
+        self.temp_folder = tempfile.mkdtemp("arcpy_metadata_session", dir=temp_folder)
+        self._handles = OrderedDict()  # dataset -> store handle
+        self._files = {}  # dataset -> exported metadata file
+        self._editors = OrderedDict()  # dataset -> editor, for the datasets opened in this session
+        self._imported = {}  # dataset -> save_count of its editor when its metadata was last imported
+
+        try:
+            for i, dataset in enumerate(self.store.datasets(workspace)):
+                self._handles[dataset] = self.store.open(dataset)
+                metadata_file = os.path.join(self.temp_folder, "{0}_{1}.xml".format(i, os.path.basename(dataset)))
+                self.logger.debug("Exporting metadata of {0} to {1}".format(dataset, metadata_file))
+                self.store.export(self._handles[dataset], metadata_file, self.metadata_export_option)
+                self._files[dataset] = metadata_file
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._handles)
+
+    @property
+    def datasets(self):
+        """
+        :return: list of paths of all datasets in the session
+        """
+        return list(self._handles.keys())
+
+    def _resolve(self, dataset):
+        if dataset in self._handles:
+            return dataset
+        path = os.path.join(self.workspace, dataset)
+        if path in self._handles:
+            return path
+        raise KeyError("{0} is not a dataset of workspace {1}".format(dataset, self.workspace))
+
+    def editor(self, dataset):
+        """
+        Get the editor for a dataset. Asking again for the same dataset returns the same editor
+        :param dataset: string, path to the dataset or path relative to the workspace
+        :return: MetadataEditor
+        """
+        dataset = self._resolve(dataset)
+        if dataset not in self._editors:
+            self._editors[dataset] = MetadataEditor(metadata_file=self._files[dataset], temp_folder=self.temp_folder,
+                                                    loglevel=self.loglevel, **self.editor_options)
+        return self._editors[dataset]
+
+    def editors(self):
+        """
+        Iterate over the editors of all datasets
+        :return: generator of (dataset, MetadataEditor) tuples
+        """
+        for dataset in self.datasets:
+            yield dataset, self.editor(dataset)
+
+    def commit(self):
+        """
+        Save the changed editors and import their metadata back into the datasets. Editors that were saved since
+        the last commit are imported too. Datasets whose metadata is read only are skipped
+        :return: list of the datasets that were imported
+        """
+        committed = []
+        for dataset, editor in self._editors.items():
+            handle = self._handles[dataset]
+            if not editor.is_dirty and editor.save_count == self._imported.get(dataset, 0):
+                continue
+            if self.store.is_read_only(handle):
+                self.logger.warning("Metadata for {0} is read only, changes are not imported".format(dataset))
+                continue
+            if editor.is_dirty:
+                editor.save()
+            self.store.import_metadata(handle, self._files[dataset], self.metadata_import_option)
+            self._imported[dataset] = editor.save_count
+            committed.append(dataset)
+        return committed
+
+    def close(self):
+        """
+        Close all editors and remove the exported metadata. Changes that weren't committed are lost
+        :return:
+        """
+        for editor in self._editors.values():
+            editor.close()
+        for handle in self._handles.values():
+            self.store.release(handle)
+        self._editors.clear()
+        self._handles.clear()
+        self._imported.clear()
+        self._files.clear()
+        if os.path.exists(self.temp_folder):
+            shutil.rmtree(self.temp_folder)
@@ -0,0 +1,100 @@
+import xml.etree.ElementTree as stdlib_etree
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+
+class XmlBackend(object):
+    """
+    Thin wrapper around an ElementTree implementation, so the editor can run on lxml or on the standard library
+    """
+
+    name = None
+
+    def __init__(self, etree):
+        self.etree = etree
+        self.Element = etree.Element
+
+    def parse(self, source):
+        """
+        Parse an XML file
+        :param source: path or file object
+        :return: ElementTree
+        """
+        return self.etree.parse(source)
+
+    def write(self, tree, path):
+        """
+        Write a tree back to a file
+        :param tree: ElementTree
+        :param path: string
+        :return:
+        """
+        tree.write(path)
+
+    def iterparse(self, source, events=("end",)):
+        return self.etree.iterparse(source, events=events)
+
+    def findall(self, element, path):
+        """
+        Find all elements for a path relative to the given element
+        :param element: element
+        :param path: string
+        :return: list of elements
+        """
+        return element.findall(path)
+
+
+class StdlibBackend(XmlBackend):
+
+    name = "stdlib"
+
+    def __init__(self):
+        super().__init__(stdlib_etree)
+
+
+class LxmlBackend(XmlBackend):
+    """
+    lxml's parser and serializer are faster, and paths are evaluated as compiled XPath expressions
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        if lxml_etree is None:
+            raise ImportError("lxml is not installed")
+        super().__init__(lxml_etree)
+        self._xpaths = {}
+
+    def findall(self, element, path):
+        if path not in self._xpaths:
+            self._xpaths[path] = self.etree.XPath(path)
+        return self._xpaths[path](element)
+
+
+_backends = {"stdlib": StdlibBackend}
+if lxml_etree is not None:
+    _backends["lxml"] = LxmlBackend
+
+_instances = {}
+
+default_backend = "lxml" if lxml_etree is not None else "stdlib"
+
+
+def get_backend(name=None):
+    """
+    Get an XML backend by name
+    :param name: "lxml" or "stdlib". Defaults to lxml if it is installed, otherwise the standard library
+    :return: XmlBackend
+    """
+    if name is None:
+        name = default_backend
+    if isinstance(name, XmlBackend):
+        return name
+    if name not in _backends:
+        raise ValueError("XML backend {0} is not available. Use one of {1}".format(name, list(_backends.keys())))
+    if name not in _instances:
+        _instances[name] = _backends[name]()
+    return _instances[name]
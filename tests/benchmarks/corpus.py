@@ -0,0 +1,88 @@
+"""
+Generate synthetic Esri metadata documents of different sizes for the benchmarks
+"""
+import os
+from xml.sax.saxutils import escape, quoteattr
+
+# name -> number of eainfo/detailed/attr fields, lineage Process entries and keywords in each keyword list
+scales = {
+    "empty": {"fields": 0, "processes": 0, "keywords": 0},
+    "small": {"fields": 20, "processes": 20, "keywords": 10},
+    "medium": {"fields": 1000, "processes": 5000, "keywords": 500},
+    "large": {"fields": 10000, "processes": 50000, "keywords": 5000},
+}
+
+empty_document = '<metadata xml:lang="en"></metadata>'  # same as MetadataEditor._create_xml_file
+
+
+def _lineage(processes):
+    yield "<Esri><CreaDate>20150830</CreaDate><CreaTime>13064500</CreaTime><ArcGISFormat>1.0</ArcGISFormat>"
+    if processes:
+        yield "<DataProperties><lineage>"
+        for i in range(processes):
+            yield '<Process ToolSource={0} Date="2015{1:02d}{2:02d}" Time="130645" Name={3} export="">{4}</Process>'.format(
+                quoteattr("c:\\program files\\arcgis\\toolboxes\\Data Management Tools.tbx\\Tool{0}".format(i % 50)),
+                i % 12 + 1, i % 28 + 1, quoteattr("Tool{0}".format(i % 50)),
+                escape("Tool{0} dataset_{1} dataset_{2} # NO_TEST".format(i % 50, i, i + 1)))
+        yield "</lineage></DataProperties>"
+    yield "</Esri>"
+
+
+def _identification(keywords):
+    yield "<dataIdInfo>"
+    yield "<idCitation><resTitle>Synthetic dataset</resTitle><date><createDate>2015-08-30T00:00:00</createDate></date>"
+    yield "</idCitation>"
+    yield "<idPurp>Benchmark the metadata editor.</idPurp><idAbs>A generated document.</idAbs><idCredit>Nobody</idCredit>"
+    yield '<dataLang><languageCode value="eng" /><countryCode value="USA" /></dataLang>'
+    for tag in ["searchKeys", "placeKeys"]:
+        yield "<{0}>".format(tag)
+        for i in range(keywords):
+            yield "<keyword>{0}_{1}</keyword>".format(tag, i)
+        yield "</{0}>".format(tag)
+    yield "</dataIdInfo>"
+
+
+def _fields(fields):
+    yield "<eainfo><detailed><enttyp><enttypl>synthetic</enttypl></enttyp>"
+    for i in range(fields):
+        yield "<attr><attrlabl>FIELD_{0}</attrlabl><attalias>Field {0}</attalias><attrtype>Double</attrtype>" \
+              "<attwidth>8</attwidth><atprecis>0</atprecis><attscale>0</attscale>" \
+              "<attrdef>Generated field {0}.</attrdef><attrdefs>Benchmark</attrdefs></attr>".format(i)
+    yield "</detailed></eainfo>"
+
+
+def generate(path, fields=0, processes=0, keywords=0):
+    """
+    Write a synthetic metadata document
+    :param path: string, file to write
+    :param fields: number of attribute fields in eainfo/detailed
+    :param processes: number of geoprocessing history entries
+    :param keywords: number of keywords in each of the tags and place keyword lists
+    :return: path
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        if not (fields or processes or keywords):
+            f.write(empty_document)
+            return path
+
+        f.write('<?xml version="1.0" encoding="UTF-8"?><metadata xml:lang="en">')
+        for part in [_lineage(processes), _identification(keywords), _fields(fields)]:
+            for chunk in part:
+                f.write(chunk)
+        f.write("<mdDateSt>20150830</mdDateSt></metadata>")
+    return path
+
+
+def generate_corpus(folder, names=None):
+    """
+    Write one document per scale
+    :param folder: string, existing folder
+    :param names: list of scale names, defaults to all scales
+    :return: dictionary of scale name -> path
+    """
+    if names is None:
+        names = list(scales.keys())
+    paths = {}
+    for name in names:
+        paths[name] = generate(os.path.join(folder, "{0}.xml".format(name)), **scales[name])
+    return paths
@@ -0,0 +1,76 @@
+"""
+Measure how much memory open editors hold with tracemalloc
+
+    python tests/benchmarks/memory.py --editors 200 --scale small
+
+Reports the memory per editor, and the part of it taken by the item objects (everything but the parsed tree)
+"""
+import os
+import sys
+import json
+import shutil
+import inspect  # allow to test arcpy_metadata even when it is not installed as module
+import argparse
+import tempfile
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.xml_backend import get_backend
+import corpus
+
+
+def _traced(function, count):
+    """
+    :return: bytes held per call after count calls, while all results are alive
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    kept = [function() for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del kept
+    return used / count
+
+
+def measure(path, editors=100, xml_backend="stdlib"):
+    """
+    :param path: metadata file
+    :param editors: number of editors to keep open at the same time
+    :param xml_backend: tracemalloc only sees the memory of the standard library tree, so that's the default
+    :return: dictionary with bytes per editor, per parsed tree and per editor's items
+    """
+    backend = get_backend(xml_backend)
+
+    # warm up caches, so they are not counted for the first editor
+    md.MetadataEditor(metadata_file=path, loglevel="ERROR", xml_backend=xml_backend)
+
+    per_editor = _traced(lambda: md.MetadataEditor(metadata_file=path, loglevel="ERROR", xml_backend=xml_backend),
+                         editors)
+    per_tree = _traced(lambda: backend.parse(path), editors)
+    return {"editor": per_editor, "tree": per_tree, "items": per_editor - per_tree}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the memory held by open editors")
+    parser.add_argument("--scale", choices=list(corpus.scales.keys()), default="small")
+    parser.add_argument("--editors", type=int, default=100)
+    parser.add_argument("--xml-backend", choices=["lxml", "stdlib"], default="stdlib")
+    args = parser.parse_args(argv)
+
+    folder = tempfile.mkdtemp("arcpy_metadata_memory")
+    try:
+        path = corpus.generate_corpus(folder, [args.scale])[args.scale]
+        result = measure(path, args.editors, args.xml_backend)
+    finally:
+        shutil.rmtree(folder)
+
+    result.update({"scale": args.scale, "editors": args.editors, "xml_backend": args.xml_backend})
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Time the MetadataEditor on synthetic metadata documents and write the results as JSON
+
+    python tests/benchmarks/run_benchmarks.py --output results.json
+    python tests/benchmarks/run_benchmarks.py --scales small medium --compare results.json
+
+With --compare, the exit code is 1 if any benchmark got slower than the given tolerance
+"""
+import os
+import sys
+import json
+import shutil
+import time
+import inspect  # allow to test arcpy_metadata even when it is not installed as module
+import argparse
+import platform
+import tempfile
+import statistics
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(os.path.dirname(current_dir))
+sys.path.insert(0, current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.xml_backend import get_backend
+import corpus
+
+
+def _open(path, options):
+    return md.MetadataEditor(metadata_file=path, loglevel="ERROR", **options)
+
+
+def bench_open(metadata):
+    _open(metadata.metadata_file, metadata.options)
+
+
+def bench_open_lazy(metadata):
+    options = dict(metadata.options)
+    options["lazy"] = True
+    _open(metadata.metadata_file, options)
+
+
+def bench_get(metadata):
+    for name in ["title", "purpose", "abstract", "credits", "language", "file_identifier"]:
+        getattr(metadata, name)
+    list(metadata.tags)
+    for field in metadata.fields[-10:]:
+        field.name
+
+
+def bench_set(metadata):
+    metadata.title = "Benchmark title"
+    metadata.abstract = "Benchmark abstract"
+    metadata.purpose = "Benchmark purpose"
+    metadata.credits = "Benchmark credits"
+    metadata.point_of_contact.contact_name = "Benchmark contact"
+
+
+def bench_list_append(metadata):
+    for i in range(100):
+        metadata.tags.append("appended_{0}".format(i))
+
+
+def bench_list_set(metadata):
+    metadata.place_keywords = ["place_{0}".format(i) for i in range(100)]
+
+
+def bench_list_remove(metadata):
+    for i in range(min(10, len(metadata.tags))):
+        metadata.tags.pop()
+
+
+def bench_object_list_new(metadata):
+    for i in range(10):
+        metadata.fields.new()
+
+
+def bench_object_list_remove(metadata):
+    # look up and remove every other field of the first 200 by name
+    fields = metadata.fields
+    for i in range(0, min(200, len(fields)), 2):
+        fields.remove(fields.get("FIELD_{0}".format(i)))
+
+
+def bench_rm_gp_history(metadata):
+    metadata.rm_gp_history()
+
+
+def bench_save(metadata):
+    metadata.save(force=True)
+
+
+benchmarks = [
+    ("open", bench_open),
+    ("open_lazy", bench_open_lazy),
+    ("get", bench_get),
+    ("set", bench_set),
+    ("list_append", bench_list_append),
+    ("list_set", bench_list_set),
+    ("list_remove", bench_list_remove),
+    ("object_list_new", bench_object_list_new),
+    ("object_list_remove", bench_object_list_remove),
+    ("rm_gp_history", bench_rm_gp_history),
+    ("save", bench_save),
+]
+
+
+def run(paths, repeat=5, xml_backend=None, names=None, log=None):
+    """
+    Run the benchmarks
+    :param paths: dictionary of scale name -> metadata file
+    :param repeat: number of timed runs per benchmark, each on a fresh copy of the document
+    :param xml_backend: "lxml" or "stdlib", defaults to lxml if it is installed
+    :param names: list of benchmark names, defaults to all
+    :param log: callable taking a message, for progress output
+    :return: list of result dictionaries
+    """
+    options = {"xml_backend": xml_backend}
+    results = []
+    work_folder = tempfile.mkdtemp("arcpy_metadata_benchmarks")
+    try:
+        for scale, path in paths.items():
+            for name, function in benchmarks:
+                if names and name not in names:
+                    continue
+                times = []
+                for i in range(repeat):
+                    work_file = os.path.join(work_folder, "{0}_{1}.xml".format(scale, i))
+                    shutil.copyfile(path, work_file)
+                    metadata = _open(work_file, options)
+                    metadata.options = options
+                    start = time.perf_counter()
+                    function(metadata)
+                    times.append(time.perf_counter() - start)
+                    os.remove(work_file)
+
+                result = {"scale": scale, "benchmark": name, "repeat": repeat, "min": min(times),
+                          "median": statistics.median(times), "mean": statistics.mean(times), "max": max(times)}
+                results.append(result)
+                if log:
+                    log("{scale:>8} {benchmark:<16} median {median:.6f}s  min {min:.6f}s".format(**result))
+    finally:
+        shutil.rmtree(work_folder)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Find the benchmarks whose median got slower than the baseline by more than the tolerance
+    :param results: list of result dictionaries
+    :param baseline: list of result dictionaries from an earlier run
+    :param tolerance: float, eg 0.2 for 20 percent
+    :return: list of (scale, benchmark, ratio) tuples
+    """
+    before = dict(((result["scale"], result["benchmark"]), result["median"]) for result in baseline)
+    regressions = []
+    for result in results:
+        key = (result["scale"], result["benchmark"])
+        if key in before and before[key] > 0:
+            ratio = result["median"] / before[key]
+            if ratio > 1 + tolerance:
+                regressions.append((result["scale"], result["benchmark"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark arcpy_metadata on synthetic metadata documents")
+    parser.add_argument("--scales", nargs="+", choices=list(corpus.scales.keys()), default=list(corpus.scales.keys()))
+    parser.add_argument("--benchmarks", nargs="+", choices=[name for name, function in benchmarks])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--xml-backend", choices=["lxml", "stdlib"])
+    parser.add_argument("--output", help="JSON file for the results, printed to stdout if not set")
+    parser.add_argument("--compare", help="JSON file of an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown for --compare, default 0.2")
+    args = parser.parse_args(argv)
+
+    def log(message):
+        print(message, file=sys.stderr)
+
+    corpus_folder = tempfile.mkdtemp("arcpy_metadata_corpus")
+    try:
+        paths = corpus.generate_corpus(corpus_folder, args.scales)
+        results = run(paths, args.repeat, args.xml_backend, args.benchmarks, log)
+    finally:
+        shutil.rmtree(corpus_folder)
+
+    report = {
+        "version": md.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "xml_backend": get_backend(args.xml_backend).name,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for scale, name, ratio in regressions:
+            log("REGRESSION {0} {1}: {2:.2f}x slower".format(scale, name, ratio))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import unittest
+import os
+import sys
+import shutil
+import asyncio
+import tempfile
+import threading
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.aio import AsyncMetadataRunner
+
+
+class TestAsync(unittest.TestCase):
+
+    def setUp(self):
+        original_test_data_folder = os.path.join(os.path.dirname(__file__), "test_data")
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        self.paths = []
+        for workspace in ["a", "b"]:
+            os.mkdir(os.path.join(self.temp_data_folder, workspace))
+            for i in range(3):
+                path = os.path.join(self.temp_data_folder, workspace, "{0}.xml".format(i))
+                shutil.copy(os.path.join(original_test_data_folder, "simple_poly_w_base_metadata.shp.xml"), path)
+                self.paths.append(path)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        shutil.rmtree(self.temp_data_folder)
+
+    def test_open_save(self):
+        runner = AsyncMetadataRunner(max_concurrency=4, per_workspace=1)
+
+        async def edit(path):
+            metadata = await runner.open(metadata_file=path)
+            metadata.title = "Async"
+            saved = await runner.save(metadata)
+            await runner.close(metadata)
+            return saved
+
+        async def edit_all():
+            return await asyncio.gather(*[edit(path) for path in self.paths])
+
+        self.assertEqual(self.loop.run_until_complete(edit_all()), [True] * len(self.paths))
+        runner.shutdown()
+        for path in self.paths:
+            self.assertEqual(md.MetadataEditor(metadata_file=path).title, "Async")
+
+    def test_per_workspace(self):
+        running = {}
+        most = {}
+        lock = threading.Lock()
+
+        def track(path):
+            workspace = os.path.dirname(path)
+            with lock:
+                running[workspace] = running.get(workspace, 0) + 1
+                most[workspace] = max(most.get(workspace, 0), running[workspace])
+            try:
+                return md.MetadataEditor(metadata_file=path, loglevel="ERROR").title
+            finally:
+                with lock:
+                    running[workspace] -= 1
+
+        runner = AsyncMetadataRunner(max_concurrency=4, per_workspace=1)
+
+        async def run_all():
+            return await asyncio.gather(*[runner._run(await runner._workspace(metadata_file=path), track, path)
+                                          for path in self.paths])
+
+        self.loop.run_until_complete(run_all())
+        runner.shutdown()
+        self.assertEqual(set(most.values()), {1})
+
+    def test_editors(self):
+        runner = AsyncMetadataRunner(max_concurrency=2)
+        paths = self.paths + [os.path.join(self.temp_data_folder, "not_a_metadata_file.txt")]
+
+        async def collect():
+            found = []
+            async for metadata in runner.editors(paths, metadata_files=True, return_exceptions=True):
+                found.append(metadata)
+            return found
+
+        found = self.loop.run_until_complete(collect())
+        runner.shutdown()
+        self.assertEqual(sorted(metadata.metadata_file for metadata in found if not isinstance(metadata, Exception)),
+                         sorted(self.paths))
+        self.assertEqual(len([metadata for metadata in found if isinstance(metadata, TypeError)]), 1)
+
+    def test_editors_early_exit(self):
+        runner = AsyncMetadataRunner(max_concurrency=3)
+        opened = []
+        open_editor = runner.open
+
+        async def track(*args, **kwargs):
+            metadata = await open_editor(*args, **kwargs)
+            opened.append(metadata)
+            return metadata
+
+        runner.open = track
+
+        async def first():
+            editors = runner.editors(self.paths, metadata_files=True)
+            try:
+                async for metadata in editors:
+                    return metadata
+            finally:
+                await editors.aclose()
+
+        metadata = self.loop.run_until_complete(first())
+        self.assertGreater(len(opened), 1)
+        self.assertEqual([editor.closed for editor in opened if editor is not metadata], [True] * (len(opened) - 1))
+        self.assertFalse(metadata.closed)
+
+        # a path that can't be opened ends the loop too
+        del opened[:]
+        paths = [os.path.join(self.temp_data_folder, "not_a_metadata_file.txt")] + self.paths
+
+        async def collect():
+            editors = runner.editors(paths, metadata_files=True)
+            try:
+                return [metadata async for metadata in editors]
+            finally:
+                await editors.aclose()
+
+        with self.assertRaises(TypeError):
+            self.loop.run_until_complete(collect())
+        runner.shutdown()
+        self.assertTrue(opened)
+        self.assertTrue(all(editor.closed for editor in opened))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.describe_cache import DescribeAdapter, DescribeCache
+
+
+class FolderAdapter(DescribeAdapter):
+    """
+    Describes shapefiles in plain folders, and counts how often it was asked
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def data_type(self, path):
+        self.calls.append(path)
+        if path.endswith(".shp"):
+            return "ShapeFile"
+        elif os.path.isdir(path):
+            return "Folder"
+        return "File"
+
+    def workspace_type(self, path):
+        self.calls.append(path)
+        return "FileSystem"
+
+
+class TestDescribeCache(unittest.TestCase):
+
+    def setUp(self):
+        original_test_data_folder = os.path.join(os.path.dirname(__file__), "test_data")
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        for name in os.listdir(original_test_data_folder):
+            if name.endswith(".xml"):
+                shutil.copy(os.path.join(original_test_data_folder, name), self.temp_data_folder)
+        self.adapter = FolderAdapter()
+        self.cache = DescribeCache(self.adapter, maxsize=4)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_data_folder)
+
+    def test_editor(self):
+        datasets = [os.path.join(self.temp_data_folder, name[:-4])
+                    for name in sorted(os.listdir(self.temp_data_folder))]
+
+        for dataset in datasets:
+            metadata = md.MetadataEditor(dataset, describe_cache=self.cache)
+            self.assertEqual(metadata.metadata_file, dataset + ".xml")
+            self.assertEqual(metadata._workspace, self.temp_data_folder)
+
+        # the folder and its workspace type are only described once
+        self.assertEqual(self.adapter.calls.count(self.temp_data_folder), 2)
+
+    def test_invalidate(self):
+        dataset = os.path.join(self.temp_data_folder, "rivers.shp")
+        self.assertEqual(self.cache.workspace(dataset), self.temp_data_folder)
+        self.assertEqual(self.cache.workspace(dataset), self.temp_data_folder)
+        self.assertEqual(len(self.adapter.calls), 2)
+        self.assertEqual(self.cache.hits, 1)
+
+        self.cache.invalidate(self.temp_data_folder)
+        self.assertEqual(len(self.cache), 0)
+        self.cache.workspace(dataset)
+        self.assertEqual(len(self.adapter.calls), 4)
+
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_maxsize(self):
+        for i in range(10):
+            self.cache.data_type("dataset_{0}.shp".format(i))
+        self.assertEqual(len(self.cache), 4)
+        self.cache.data_type("dataset_9.shp")
+        self.assertEqual(len(self.adapter.calls), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.diff import diff, diff_files, diff_directories, PropertyChange, XmlChange
+from arcpy_metadata.diff import subtree_hashes, _Document, _diff_properties
+
+
+class TestDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.original = os.path.join(os.path.dirname(__file__), "test_data", "simple_poly_w_base_metadata.shp.xml")
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        self.old = os.path.join(self.temp_data_folder, "old")
+        self.new = os.path.join(self.temp_data_folder, "new")
+        for folder in [self.old, self.new]:
+            os.makedirs(os.path.join(folder, "sub"))
+            for name in ["a.xml", "b.xml", os.path.join("sub", "c.xml")]:
+                shutil.copy(self.original, os.path.join(folder, name))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_data_folder)
+
+    def _edit(self, path):
+        metadata = md.MetadataEditor(metadata_file=path, loglevel="ERROR")
+        metadata.title = "New title"
+        metadata.tags.append("water")
+        metadata.save()
+
+    def test_diff(self):
+        old = md.MetadataEditor(metadata_file=self.original, loglevel="ERROR")
+        new = md.MetadataEditor(metadata_file=self.original, loglevel="ERROR")
+        self.assertFalse(diff(old, new).changed)
+
+        new.purpose = "Changed"
+        new.tags.remove("bar")
+        result = diff(old, new)
+        self.assertEqual(result.properties, [
+            PropertyChange("purpose", old.purpose, "Changed"),
+            PropertyChange("tags", ["atag", "foo", "bar", "baz"], ["atag", "foo", "baz"])])
+        self.assertIn(XmlChange("dataIdInfo/idPurp", "text", old.purpose, "Changed"), result.xml)
+        self.assertIn(XmlChange("dataIdInfo/searchKeys/keyword[4]", "removed", "baz", None), result.xml)
+
+    def test_diff_files(self):
+        path = os.path.join(self.new, "a.xml")
+        self.assertFalse(diff_files(self.original, path).changed)
+
+        self._edit(path)
+        result = diff_files(self.original, path, xml=False, xml_backend="stdlib")
+        self.assertEqual(result.xml, [])
+        self.assertEqual([change.name for change in result.properties if not change.name.startswith("meta_")],
+                         ["title", "tags"])
+
+    def test_lazy_hashes(self):
+        old = md.MetadataEditor(metadata_file=self.original, loglevel="ERROR")
+        new = md.MetadataEditor(metadata_file=self.original, loglevel="ERROR")
+        new.purpose = "Changed"
+        a = _Document(old.elements.getroot())
+        b = _Document(new.elements.getroot())
+        self.assertEqual([change.name for change in _diff_properties(a, b)], ["purpose"])
+        # only the nodes of the elements and what is below them were hashed
+        self.assertNotIn(a.root, a.hashes)
+        self.assertLess(len(b.hashes), len(subtree_hashes(b.root)))
+        self.assertEqual(b.digest(b.root), subtree_hashes(b.root)[b.root])
+
+    def test_diff_directories(self):
+        self._edit(os.path.join(self.new, "sub", "c.xml"))
+        os.remove(os.path.join(self.new, "b.xml"))
+        shutil.copy(self.original, os.path.join(self.new, "d.xml"))
+        with open(os.path.join(self.new, "a.xml"), "w") as f:
+            f.write("not xml")
+
+        results = diff_directories(self.old, self.new, max_workers=2, chunksize=1)
+        self.assertEqual([(result.path, result.status) for result in results],
+                         [("a.xml", "error"), ("b.xml", "removed"), ("d.xml", "added"),
+                          (os.path.join("sub", "c.xml"), "changed")])
+        self.assertIn("title", [change.name for change in results[-1].diff.properties])
+
+
+if __name__ == '__main__':
+    unittest.main()
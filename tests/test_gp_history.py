@@ -0,0 +1,73 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+import xml.etree.ElementTree as ET
+from datetime import date, datetime
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.gp_history import RetentionPolicy, prune_file
+
+history = [("Project", "20150105", "101010"), ("Clip", "20160310", "090000"), ("Buffer", "20170420", "235959"),
+           ("Clip", "20180101", "000000"), ("Dissolve", "20190707", "120000")]
+
+
+class TestGpHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        self.metadata_file = os.path.join(self.temp_data_folder, "history.xml")
+        processes = "".join('<Process ToolSource="c:\\toolbox\\{0}" Date="{1}" Time="{2}" Name="{0}">{0} a b'
+                            '</Process>'.format(*entry) for entry in history)
+        with open(self.metadata_file, "w") as f:
+            f.write('<metadata xml:lang="en"><Esri><DataProperties><itemProps><itemName>rivers</itemName></itemProps>'
+                    '<lineage>{0}</lineage></DataProperties></Esri><dataIdInfo><idPurp>Rivers</idPurp></dataIdInfo>'
+                    '</metadata>'.format(processes))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_data_folder)
+
+    def _dates(self, path):
+        return [process.get("Date") for process in ET.parse(path).findall("Esri/DataProperties/lineage/Process")]
+
+    def test_prune(self):
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual(metadata.prune_gp_history(keep_last=1, after=date(2016, 3, 11), tools=["Project"]), 1)
+        self.assertEqual(metadata.prune_gp_history(after=datetime(2018, 1, 1)), 3)
+        self.assertEqual(metadata.prune_gp_history(after=datetime(2018, 1, 1)), 0)
+        metadata.save()
+        self.assertEqual(self._dates(self.metadata_file), ["20190707"])
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        metadata.rm_gp_history()
+        metadata.save()
+        self.assertEqual(self._dates(self.metadata_file), [])
+
+    def test_prune_file(self):
+        output_file = os.path.join(self.temp_data_folder, "pruned.xml")
+        policy = RetentionPolicy(keep_last=2, tools=["Clip"])
+        self.assertEqual(prune_file(self.metadata_file, policy, output_file), 2)
+        self.assertEqual(self._dates(output_file), ["20160310", "20180101", "20190707"])
+
+        # everything else stays the same
+        metadata = md.MetadataEditor(metadata_file=output_file, read_only=True)
+        self.assertEqual(metadata.purpose, "Rivers")
+        self.assertEqual(ET.parse(output_file).find("Esri/DataProperties/lineage/Process").text, "Clip a b")
+
+        with open(output_file, "rb") as f:
+            pruned = f.read()
+        self.assertEqual(prune_file(output_file, policy), 0)
+        with open(output_file, "rb") as f:
+            self.assertEqual(f.read(), pruned)
+
+        self.assertEqual(prune_file(self.metadata_file, RetentionPolicy()), 5)
+        self.assertEqual(self._dates(self.metadata_file), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.describe_cache import DescribeAdapter, DescribeCache
+from arcpy_metadata.handle_pool import MetadataHandlePool
+
+
+class GeodatabaseAdapter(DescribeAdapter):
+    """
+    Describes everything inside a folder ending with .gdb as feature class
+    """
+
+    def data_type(self, path):
+        return "Workspace" if path.endswith(".gdb") else "FeatureClass"
+
+    def workspace_type(self, path):
+        return "LocalDatabase"
+
+
+class FakeHandle(object):
+    """
+    Stand-in for arcpy.metadata.Metadata, the metadata of <dataset> is kept in <dataset>.xml
+    """
+
+    isReadOnly = False
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.imports = 0
+
+    def saveAsXML(self, xml_file, export_option):
+        shutil.copyfile(self.dataset + ".xml", xml_file)
+
+    def importMetadata(self, xml_file, import_option):
+        shutil.copyfile(xml_file, self.dataset + ".xml")
+        self.imports += 1
+
+    def save(self):
+        pass
+
+
+class TestHandlePool(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        self.workspace = os.path.join(self.temp_data_folder, "data.gdb")
+        os.mkdir(self.workspace)
+        self.dataset = os.path.join(self.workspace, "rivers")
+        shutil.copy(os.path.join(os.path.dirname(__file__), "test_data", "simple_poly_w_base_metadata.shp.xml"),
+                    self.dataset + ".xml")
+        self.temp_folder = os.path.join(self.temp_data_folder, "temp")
+        os.mkdir(self.temp_folder)
+
+        self.created = []
+        self.pool = MetadataHandlePool(factory=self._open, max_idle=1)
+        self.options = {"describe_cache": DescribeCache(GeodatabaseAdapter()), "handle_pool": self.pool,
+                        "temp_folder": self.temp_folder, "loglevel": "ERROR"}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_data_folder)
+
+    def _open(self, dataset):
+        handle = FakeHandle(dataset)
+        self.created.append(handle)
+        return handle
+
+    def test_editor(self):
+        for title in ["first", "second"]:
+            with md.MetadataEditor(self.dataset, **self.options) as metadata:
+                metadata.title = title
+                metadata.save()
+            self.assertTrue(metadata.closed)
+            self.assertEqual(os.listdir(self.temp_folder), [])
+
+        # both editors used the same handle
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(self.created[0].imports, 2)
+        self.assertEqual(md.MetadataEditor(metadata_file=self.dataset + ".xml").title, "second")
+
+        with self.assertRaises(ValueError):
+            metadata.save()
+        metadata.close()
+
+    def test_pool(self):
+        first = self.pool.acquire("a")
+        self.assertIs(self.pool.acquire("a"), first)
+        self.pool.release("a")
+        self.pool.release("a")
+        self.assertIs(self.pool.acquire("a"), first)
+        self.assertEqual((self.pool.hits, self.pool.misses), (2, 1))
+
+        # only one idle handle is kept
+        self.pool.release("a")
+        self.pool.acquire("b")
+        self.pool.release("b")
+        self.assertNotIn("a", self.pool)
+        self.assertIn("b", self.pool)
+
+        self.pool.close()
+        self.assertEqual(len(self.pool), 0)
+        self.pool.release("b")
+
+
+if __name__ == '__main__':
+    unittest.main()
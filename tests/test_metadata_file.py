@@ -0,0 +1,316 @@
+from __future__ import print_function
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import warnings
+from datetime import datetime, time
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.elements import elements
+from arcpy_metadata.reader import read_metadata
+from arcpy_metadata.instrumentation import MetadataStats
+
+
+class TestMetadataFile(unittest.TestCase):
+    """
+    Tests that work directly on metadata XML files (metadata_file=...), so they don't need any geodatabase
+    """
+
+    def setUp(self):
+        original_test_data_folder = os.path.join(os.path.dirname(__file__), "test_data")
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        for name in os.listdir(original_test_data_folder):
+            if name.endswith(".xml"):
+                shutil.copy(os.path.join(original_test_data_folder, name), self.temp_data_folder)
+        self.metadata_file = os.path.join(self.temp_data_folder, "simple_poly_w_base_metadata.shp.xml")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_data_folder)
+
+    def test_lazy_binding(self):
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file, lazy=True)
+        self.assertEqual(len(metadata.items), 0)
+
+        self.assertEqual(metadata.purpose, "Layer represents locations of the rare Snipe.")
+        self.assertEqual(len(metadata.items), 1)
+
+        metadata.abstract = "This is the Abstract"
+        metadata.save()
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual(len(metadata.items), len(elements))
+        self.assertEqual(metadata.abstract, "This is the Abstract")
+
+    def test_save_clean(self):
+        with open(self.metadata_file, "rb") as f:
+            original = f.read()
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertFalse(metadata.is_dirty)
+        self.assertFalse(metadata.save())
+
+        metadata.purpose = metadata.purpose
+        metadata.tags = list(metadata.tags)
+        self.assertFalse(metadata.is_dirty)
+        self.assertFalse(metadata.save())
+        with open(self.metadata_file, "rb") as f:
+            self.assertEqual(f.read(), original)
+
+        metadata.tags.append("new tag")
+        self.assertTrue(metadata.is_dirty)
+        self.assertTrue(metadata.save())
+        self.assertFalse(metadata.is_dirty)
+
+        metadata.fields[0].name = "OBJECTID"
+        self.assertTrue(metadata.save())
+        self.assertEqual(md.MetadataEditor(metadata_file=self.metadata_file).fields[0].name, "OBJECTID")
+
+    def test_fields(self):
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual([field.name for field in metadata.fields], ["FID", "Shape", "Id"])
+        self.assertIs(metadata.fields.get("Shape"), metadata.fields[1])
+        self.assertIsNone(metadata.fields.get("OBJECTID"))
+
+        metadata.fields.get("FID").name = "OBJECTID"
+        self.assertIsNone(metadata.fields.get("FID"))
+        self.assertIs(metadata.fields.get("OBJECTID"), metadata.fields[0])
+
+        field = metadata.fields.new()
+        field.name = "Area"
+        field.definition = "Area in square meters"
+        metadata.fields.remove(metadata.fields.get("Shape"))
+        self.assertEqual(metadata.fields.pop().name, "Area")
+        metadata.fields.new().name = "Length"
+
+        # the index follows renames, also when two fields share a name
+        metadata.fields.get("Id").name = "Length"
+        self.assertEqual(metadata.fields.get("Length").name, "Length")
+        self.assertIs(metadata.fields.get("Length"), metadata.fields[1])
+        metadata.fields.remove(metadata.fields[1])
+        self.assertIs(metadata.fields.get("Length"), metadata.fields[1])
+        with self.assertRaises(ValueError):
+            metadata.fields.remove(field)  # popped before
+        metadata.fields.new().name = "Id"
+        metadata.fields[1].name = "Id"  # now before the other Id
+        self.assertIs(metadata.fields.get("Id"), metadata.fields[1])
+        metadata.fields.remove(metadata.fields[2])
+        metadata.fields.new().name = "Length"
+        metadata.save()
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual([field.name for field in metadata.fields], ["OBJECTID", "Id", "Length"])
+        metadata._fields._removeall()
+        metadata.save()
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual(len(metadata.fields), 0)
+        self.assertEqual(metadata.elements.find("eainfo/detailed/enttyp/enttypl").text, "simple_poly_w_base_metadata")
+
+    def test_contact_children(self):
+        with open(self.metadata_file, "w") as f:
+            f.write('<metadata xml:lang="en"><dataIdInfo><idPoC><rpCntInfo><cntAddress><city>Sacramento</city>'
+                    '</cntAddress><rpIndName>Nested</rpIndName></rpCntInfo></idPoC></dataIdInfo></metadata>')
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual(metadata.point_of_contact.city, "Sacramento")
+        self.assertFalse(metadata.point_of_contact.contact_name)  # only direct children count
+
+        metadata.point_of_contact.contact_name = "Jane Doe"
+        metadata.save()
+        self.assertEqual(metadata.elements.find("dataIdInfo/idPoC/rpIndName").text, "Jane Doe")
+        self.assertEqual(metadata.elements.find("dataIdInfo/idPoC/rpCntInfo/rpIndName").text, "Nested")
+
+    def test_keywords(self):
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual(list(metadata.tags), ["atag", "foo", "bar", "baz"])
+        self.assertIn("foo", metadata.tags)
+        self.assertNotIn("water", metadata.tags)
+
+        metadata.tags.update(["foo", "water", "rivers", "water"])
+        metadata.tags.extend(["lakes", "lakes"])
+        metadata.tags.discard_many(["bar", "lakes", "not a tag"])
+        metadata.tags.remove("atag")
+        metadata.tags[0] = "FOO"
+        self.assertNotIn("foo", metadata.tags)
+        self.assertEqual(metadata.tags.pop().text, "rivers")
+        metadata.save()
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual(list(metadata.tags), ["FOO", "baz", "water"])
+        self.assertEqual(len(metadata.elements.findall("dataIdInfo/searchKeys/keyword")), 3)
+
+        metadata.tags = ["a", "b"]
+        metadata.save()
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual(list(metadata.tags), ["a", "b"])
+
+    def test_stats(self):
+        stats = MetadataStats()
+        calls = []
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file, lazy=True, stats=stats,
+                                     on_phase=lambda editor, phase, seconds: calls.append((editor, phase)))
+        metadata.title
+        metadata.abstract = "This is the Abstract"
+        metadata.save()
+        metadata.cleanup()
+
+        self.assertEqual(list(stats.phases.keys()), ["parse", "bind", "save.stamp", "save.write", "cleanup"])
+        self.assertEqual(stats["parse"].count, 1)
+        self.assertEqual(stats["bind"].count, len(metadata.items))
+        self.assertEqual(len(calls), sum(phase.count for phase in stats.phases.values()))
+        self.assertIs(calls[0][0], metadata)
+
+    def test_batch_editor(self):
+        paths = [os.path.join(self.temp_data_folder, name) for name in sorted(os.listdir(self.temp_data_folder))]
+        paths.append(os.path.join(self.temp_data_folder, "not_a_metadata_file.txt"))
+
+        batch = md.MetadataBatchEditor({"license": "License", "credits": "Credits", "tags": ["water"]},
+                                       max_workers=2, chunksize=1)
+        results = batch.run(paths)
+
+        self.assertEqual([result.path for result in results], paths)
+        self.assertEqual([result.ok for result in results], [True] * (len(paths) - 1) + [False])
+        for path in paths[:-1]:
+            metadata = md.MetadataEditor(metadata_file=path)
+            self.assertEqual(metadata.license, "License")
+            self.assertEqual(metadata.credits, "Credits")
+            self.assertEqual(list(metadata.tags), ["water"])
+
+    def test_reader(self):
+        values = read_metadata(self.metadata_file, ["title", "purpose", "tags", "fields", "language", "max_scale"])
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertEqual(values["title"], metadata.title)
+        self.assertEqual(values["purpose"], metadata.purpose)
+        self.assertEqual(values["tags"], list(metadata.tags))
+        self.assertEqual([field["name"] for field in values["fields"]], [field.name for field in metadata.fields])
+        self.assertEqual(values["language"], metadata.language)
+        self.assertIsNone(values["max_scale"])
+
+    def test_read_only(self):
+        with open(self.metadata_file, "rb") as f:
+            original = f.read()
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file, read_only=True)
+        number_of_elements = len(list(metadata.elements.iter()))
+
+        self.assertEqual(metadata.purpose, "Layer represents locations of the rare Snipe.")
+        self.assertEqual(metadata.tags, ["atag", "foo", "bar", "baz"])
+        self.assertEqual(metadata.language, "english")
+        self.assertEqual([field.name for field in metadata.fields], ["FID", "Shape", "Id"])
+        self.assertIsNone(metadata.credits)
+        self.assertIsNone(metadata.point_of_contact)
+        self.assertIsNone(metadata.max_scale)
+
+        self.assertTrue(metadata.has("title"))
+        self.assertFalse(metadata.has("credits"))
+        self.assertEqual(metadata.get("credits", "no credits"), "no credits")
+
+        with self.assertRaises(PermissionError):
+            metadata.title = "New title"
+        with self.assertRaises(PermissionError):
+            metadata.save()
+
+        self.assertEqual(len(list(metadata.elements.iter())), number_of_elements)
+        with open(self.metadata_file, "rb") as f:
+            self.assertEqual(f.read(), original)
+
+    def test_read_only_matches_editor(self):
+        # empty and padded nodes read the same in both modes
+        with open(self.metadata_file) as f:
+            xml = f.read()
+        xml = xml.replace("<idPurp>Layer represents locations of the rare Snipe.</idPurp>", "<idPurp />")
+        xml = xml.replace("<resTitle>The metadata title!</resTitle>", "<resTitle>  The metadata title!  </resTitle>")
+        empty_nodes = os.path.join(self.temp_data_folder, "empty_nodes.xml")
+        with open(empty_nodes, "w") as f:
+            f.write(xml)
+
+        def plain(value, spec):
+            if spec["type"] == "parent_item":
+                return dict((name, getattr(value, name)) for name in spec["elements"])
+            elif spec["type"] == "object_list":
+                return [dict((name, getattr(item, name)) for name in spec["elements"]) for item in value]
+            elif spec["type"] == "list":
+                return list(value)
+            return value
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            for path in [self.metadata_file, empty_nodes]:
+                read_only = md.MetadataEditor(metadata_file=path, read_only=True, loglevel="ERROR")
+                for name in elements:
+                    value = read_only.get(name)
+                    if value is None:
+                        continue  # missing elements are None in read only mode, the editor creates them
+                    # bind only this element, binding others can add nodes below it
+                    editor = md.MetadataEditor(metadata_file=path, lazy=True, loglevel="ERROR")
+                    self.assertEqual(plain(value, elements[name]), plain(getattr(editor, name), elements[name]),
+                                     "{0} in {1}".format(name, os.path.basename(path)))
+
+        read_only = md.MetadataEditor(metadata_file=empty_nodes, read_only=True, loglevel="ERROR")
+        self.assertEqual(read_only.purpose, "")
+        self.assertEqual(read_only.title, "The metadata title!")
+        self.assertEqual(read_only.get("fields")[2].definition, "")
+
+    def test_typed_values(self):
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        metadata.max_scale = "25000"
+        metadata.last_update = "20200131"
+        metadata.temporal_extent_start = datetime(2020, 1, 31, 12, 30)
+        self.assertEqual(metadata.max_scale, 25000)
+        self.assertEqual(metadata.last_update, datetime(2020, 1, 31))
+        self.assertEqual(metadata.temporal_extent_start, datetime(2020, 1, 31, 12, 30))
+
+        for name, value in [("max_scale", "large"), ("max_scale", 1.5), ("max_scale", True), ("last_update", "2020-13-01"),
+                            ("temporal_extent_start", "yesterday"), ("meta_create_time", "25:00:00")]:
+            with self.assertRaises(RuntimeWarning):
+                setattr(metadata, name, value)
+        self.assertEqual(metadata.max_scale, 25000)
+
+        metadata.save()
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+        self.assertIsInstance(metadata.meta_modification_time, time)
+        self.assertEqual(metadata.last_update, datetime(2020, 1, 31))
+
+    def test_element_descriptors(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            metadata = md.MetadataEditor(metadata_file=self.metadata_file)
+            self.assertEqual(len(caught), 0)  # binding a deprecated element doesn't warn
+            metadata.download = "http://example.com"
+            self.assertEqual(metadata.download, "http://example.com")
+            self.assertEqual([w.category for w in caught], [DeprecationWarning, DeprecationWarning])
+
+        metadata.update_frequency = "weekly"
+        self.assertEqual(metadata.update_frequency, "weekly")
+        metadata.update_frequency = "005"  # codes work too
+        self.assertEqual(metadata.update_frequency, "monthly")
+        with self.assertRaises(RuntimeWarning):
+            metadata.update_frequency = "yearly"
+
+        metadata.point_of_contact.role = "publisher"
+        self.assertEqual(metadata.point_of_contact.role, "publisher")
+        with self.assertRaises(TypeError):
+            metadata.point_of_contact.role = "Nobody"
+
+        metadata.some_setting = 1  # anything else is a plain attribute
+        self.assertNotIn("some_setting", metadata.items)
+        with self.assertRaises(AttributeError):
+            metadata.does_not_exist
+
+    def test_read_only_missing_file(self):
+        metadata_file = os.path.join(self.temp_data_folder, "does_not_exist.xml")
+        metadata = md.MetadataEditor(metadata_file=metadata_file, read_only=True)
+        self.assertIsNone(metadata.title)
+        self.assertFalse(os.path.exists(metadata_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import os
+import sys
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+import xml.etree.ElementTree as ET
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+from arcpy_metadata.path_resolver import PathTrie
+from arcpy_metadata.path_resolver import element_paths
+
+
+class TestPathResolver(unittest.TestCase):
+
+    def test_same_as_findall(self):
+        """
+        Every schema path needs to resolve to the same elements as ElementTree's findall
+        """
+        test_data_folder = os.path.join(os.path.dirname(__file__), "test_data")
+        for name in os.listdir(test_data_folder):
+            if not name.endswith(".xml"):
+                continue
+            root = ET.parse(os.path.join(test_data_folder, name)).getroot()
+            resolved = element_paths.resolve(root)
+            for path in element_paths.paths:
+                self.assertEqual(resolved.findall(path), root.findall(path),
+                                 "Path {0} in {1} was not correctly resolved".format(path, name))
+
+    def test_predicates(self):
+        root = ET.fromstring('<metadata><a><b n="1">x</b><b n="2">y</b><b n="3">z</b></a><a><b n="4">w</b></a></metadata>')
+        paths = ["a/b", "a/b[last()]", "a/b[2]", "a[2]/b", "a/b[@n='3']", "a/c"]
+        resolved = PathTrie(paths).resolve(root)
+        for path in paths:
+            self.assertEqual(resolved.findall(path), root.findall(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
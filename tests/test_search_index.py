@@ -0,0 +1,118 @@
+import unittest
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+from unittest import mock
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.search_index import MetadataIndex
+from arcpy_metadata.workspace_session import FileSystemMetadataStore
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        original_test_data_folder = os.path.join(os.path.dirname(__file__), "test_data")
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        self.folder = os.path.join(self.temp_data_folder, "data")
+        os.mkdir(self.folder)
+        for name in os.listdir(original_test_data_folder):
+            if name.endswith(".xml"):
+                shutil.copy(os.path.join(original_test_data_folder, name), self.folder)
+        self.dataset = os.path.join(self.folder, "simple_poly_w_base_metadata.shp")
+        self.index = MetadataIndex(os.path.join(self.temp_data_folder, "index.sqlite"))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.temp_data_folder)
+
+    def test_refresh(self):
+        self.assertEqual(self.index.refresh(self.folder), {"added": 2, "updated": 0, "unchanged": 0, "removed": 0})
+        self.assertEqual(self.index.refresh(self.folder), {"added": 0, "updated": 0, "unchanged": 2, "removed": 0})
+
+        # same content, new modification time: only hashed, not parsed
+        os.utime(self.dataset + ".xml", (0, 0))
+        self.assertEqual(self.index.refresh(self.folder)["unchanged"], 2)
+
+        metadata = md.MetadataEditor(metadata_file=self.dataset + ".xml", loglevel="ERROR")
+        metadata.title = "Snipe locations"
+        metadata.save()
+        os.remove(os.path.join(self.folder, "simple_poly_no_metadata.shp.xml"))
+        self.assertEqual(self.index.refresh([self.folder]), {"added": 0, "updated": 1, "unchanged": 0, "removed": 1})
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.values(self.dataset)["title"], "Snipe locations")
+
+    def test_overlapping_folders(self):
+        sub_folder = os.path.join(self.folder, "sub")
+        os.mkdir(sub_folder)
+        dataset = os.path.join(sub_folder, "moved.shp")
+        shutil.copy(self.dataset + ".xml", dataset + ".xml")
+        self.assertEqual(self.index.refresh(self.folder)["added"], 3)
+
+        # the file now belongs to the last folder it was seen in, so that folder drops it once it is gone
+        self.assertEqual(self.index.refresh(sub_folder)["unchanged"], 1)
+        os.remove(dataset + ".xml")
+        self.assertEqual(self.index.refresh(sub_folder)["removed"], 1)
+        self.assertEqual(len(self.index), 2)
+
+    def test_failed_read(self):
+        with mock.patch.object(self.index._reader, "read", side_effect=OSError("busy")):
+            self.assertEqual(self.index.refresh(self.folder)["added"], 2)
+        self.assertEqual(self.index.find(tags="bar"), [])
+
+        # the files didn't change, but they couldn't be read before
+        self.assertEqual(self.index.refresh(self.folder)["updated"], 2)
+        self.assertEqual(self.index.find(tags="bar"), [self.dataset])
+
+    def test_existing_fts4_index(self):
+        database = os.path.join(self.temp_data_folder, "fts4.sqlite")
+        connection = sqlite3.connect(database)
+        connection.execute("CREATE VIRTUAL TABLE text_index USING fts4(title, abstract, purpose, tags)")
+        connection.close()
+        with MetadataIndex(database) as index:
+            self.assertFalse(index._ranked)
+            index.refresh(self.folder)
+            self.assertEqual(index.search("snipe"), [self.dataset])
+        self.assertEqual(self.index._ranked, "fts5" in self.index._connection.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'text_index'").fetchone()[0].lower())
+
+    def test_queries(self):
+        self.index.refresh(self.folder)
+        self.assertEqual(self.index.search("snipe"), [self.dataset])
+        self.assertEqual(self.index.search("tags:foo"), [self.dataset])
+        self.assertEqual(self.index.search("nothing"), [])
+
+        self.assertEqual(self.index.find(tags="bar"), [self.dataset])
+        self.assertEqual(self.index.find({"fields.name": "Shape"}, tags="foo"), [self.dataset])
+        self.assertEqual(self.index.find(tags="bar", title="Other"), [])
+        self.assertEqual(len(self.index.find()), 2)
+
+    def test_refresh_workspace(self):
+        opened = []
+
+        class Store(FileSystemMetadataStore):
+            def open(self, dataset):
+                opened.append(dataset)
+                return super().open(dataset)
+
+            def release(self, handle):
+                opened.remove(handle[:-4])
+
+        store = Store()
+        self.assertEqual(self.index.refresh_workspace(self.folder, store)["added"], 2)
+        self.assertEqual(self.index.refresh_workspace(self.folder, store)["unchanged"], 2)
+        self.assertEqual(self.index.find(tags="baz"), [self.dataset])
+        # the export is deleted after indexing, the dataset is stored instead
+        self.assertEqual(self.index._connection.execute("SELECT metadata_file FROM documents WHERE dataset = ?",
+                                                        (self.dataset,)).fetchone()[0], self.dataset)
+        self.assertEqual(opened, [])  # every handle was released
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+import csv
+import json
+import shutil
+import tempfile
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.table import to_table, write_csv, write_jsonl, numpy
+
+columns = ["title", "purpose", "tags", "last_update", "max_scale"]
+
+
+class TestTable(unittest.TestCase):
+
+    def setUp(self):
+        original = os.path.join(os.path.dirname(__file__), "test_data", "simple_poly_w_base_metadata.shp.xml")
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        self.paths = []
+        for i in range(5):
+            path = os.path.join(self.temp_data_folder, "{0}.xml".format(i))
+            shutil.copy(original, path)
+            self.paths.append(path)
+
+        metadata = md.MetadataEditor(metadata_file=self.paths[1], loglevel="ERROR")
+        metadata.max_scale = 500
+        metadata.last_update = "20160221"
+        metadata.save()
+        self.paths.append(os.path.join(self.temp_data_folder, "missing.xml"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_data_folder)
+
+    def test_to_table(self):
+        table = to_table(self.paths, columns, arrays=False, max_workers=2, chunksize=2)
+        self.assertEqual(list(table.keys()), ["path"] + columns + ["error"])
+        self.assertEqual(table["path"], self.paths)
+        self.assertEqual(table["tags"][0], ["atag", "foo", "bar", "baz"])
+        self.assertEqual(table["max_scale"], [None, 500, None, None, None, None])
+        self.assertEqual(table["error"][:-1], [None] * 5)
+        self.assertIsNotNone(table["error"][-1])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_arrays(self):
+        table = to_table(self.paths, columns, max_workers=2)
+        self.assertEqual(table["max_scale"].dtype, numpy.float64)
+        self.assertEqual(table["max_scale"][1], 500)
+        self.assertTrue(numpy.isnan(table["max_scale"][0]))
+        self.assertEqual(str(table["last_update"][1]), "2016-02-21T00:00:00")
+        self.assertIsInstance(table["tags"], list)
+
+    def test_writers(self):
+        output = os.path.join(self.temp_data_folder, "inventory.csv")
+        self.assertEqual(write_csv(self.paths, columns, output, max_workers=2), len(self.paths))
+        with open(output, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[1]["last_update"], "2016-02-21T00:00:00")
+        self.assertEqual(json.loads(rows[0]["tags"]), ["atag", "foo", "bar", "baz"])
+
+        output = os.path.join(self.temp_data_folder, "inventory.jsonl")
+        self.assertEqual(write_jsonl(self.paths, columns, output, max_workers=2), len(self.paths))
+        with open(output) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[1]["max_scale"], 500)
+        self.assertEqual(rows[0]["path"], self.paths[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
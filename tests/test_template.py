@@ -0,0 +1,99 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from unittest import mock
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.template import MetadataTemplate, FILL, OVERWRITE
+from arcpy_metadata.batch import _edit_file
+
+
+class TestTemplate(unittest.TestCase):
+
+    def setUp(self):
+        original_test_data_folder = os.path.join(os.path.dirname(__file__), "test_data")
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        for name in os.listdir(original_test_data_folder):
+            if name.endswith(".xml"):
+                shutil.copy(os.path.join(original_test_data_folder, name), self.temp_data_folder)
+        self.metadata_file = os.path.join(self.temp_data_folder, "simple_poly_w_base_metadata.shp.xml")
+
+        self.template_file = os.path.join(self.temp_data_folder, "template.xml")
+        template = md.MetadataEditor(metadata_file=self.template_file, loglevel="ERROR")
+        template.license = "CC-BY 4.0"
+        template.credits = "Our organisation"
+        template.tags = ["foo", "water"]
+        template.point_of_contact.contact_name = "Jane Doe"
+        template.point_of_contact.role = "owner"
+        template.online_resource.new()
+        template.online_resource[0].link = "http://example.com"
+        template.online_resource[0].function = "download"
+        template.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_data_folder)
+
+    def test_compile(self):
+        template = MetadataTemplate(self.template_file)
+        self.assertEqual(sorted(template.names),
+                         ["credits", "license", "online_resource", "point_of_contact", "tags"])
+        with self.assertRaises(TypeError):
+            MetadataTemplate(self.template_file, rules={"license": "append"})
+        with self.assertRaises(KeyError):
+            MetadataTemplate(self.template_file, names=["not_an_element"])
+
+    def test_apply(self):
+        template = MetadataTemplate(self.template_file, rules={"credits": FILL, "point_of_contact": OVERWRITE})
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file, loglevel="ERROR")
+        metadata.credits = "Someone else"
+        metadata.point_of_contact.contact_name = "John Doe"
+        metadata.save()
+
+        self.assertEqual(sorted(template.apply(metadata)), ["license", "online_resource", "point_of_contact", "tags"])
+        self.assertTrue(metadata.is_dirty)
+        self.assertEqual(template.apply(metadata), [])  # applying it again changes nothing
+        metadata.save()
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file, loglevel="ERROR")
+        self.assertEqual(metadata.license, "CC-BY 4.0")
+        self.assertEqual(metadata.credits, "Someone else")
+        self.assertEqual(list(metadata.tags), ["atag", "foo", "bar", "baz", "water"])
+        self.assertEqual(metadata.point_of_contact.contact_name, "Jane Doe")
+        self.assertEqual(metadata.point_of_contact.role, "owner")
+        self.assertEqual([resource.link for resource in metadata.online_resource if resource.link],
+                         ["http://example.com"])
+        self.assertEqual(metadata.online_resource[-1].function, "download")
+
+    def test_apply_fields(self):
+        template = md.MetadataEditor(metadata_file=self.template_file, loglevel="ERROR")
+        template.fields.new()
+        template.fields[-1].name = "TEMPLATE_FIELD"
+        template.save()
+
+        metadata = md.MetadataEditor(metadata_file=self.metadata_file, loglevel="ERROR")
+        self.assertIsNotNone(metadata.fields.get("FID"))  # builds the name index
+        self.assertIn("fields", MetadataTemplate(self.template_file, names=["fields"]).apply(metadata))
+        self.assertEqual(metadata.fields.get("TEMPLATE_FIELD").name, "TEMPLATE_FIELD")
+
+    def test_batch(self):
+        template = MetadataTemplate(self.template_file, names=["license", "tags"])
+        paths = [os.path.join(self.temp_data_folder, name) for name in ["simple_poly_w_base_metadata.shp.xml",
+                                                                          "simple_poly_no_metadata.shp.xml"]]
+        results = md.MetadataBatchEditor(template, max_workers=2, lazy=True).run(paths)
+        self.assertEqual([result.value for result in results], [["license", "tags"]] * 2)
+        # editors opened for a single file are closed again
+        with mock.patch.object(md.MetadataEditor, "close", autospec=True) as close:
+            self.assertEqual(template.apply_file(paths[1]), [])
+            self.assertTrue(_edit_file(paths[1], template, True, {"lazy": True}).ok)
+        self.assertEqual(close.call_count, 2)
+        self.assertEqual(md.MetadataEditor(metadata_file=paths[1]).license, "CC-BY 4.0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from unittest import mock
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.workspace_session import WorkspaceSession, FileSystemMetadataStore
+
+
+class TestWorkspaceSession(unittest.TestCase):
+    """
+    Runs the session against a folder of metadata files instead of a geodatabase
+    """
+
+    def setUp(self):
+        original_test_data_folder = os.path.join(os.path.dirname(__file__), "test_data")
+        self.workspace = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        self.temp_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        for name in os.listdir(original_test_data_folder):
+            if name.endswith(".xml"):
+                shutil.copy(os.path.join(original_test_data_folder, name), self.workspace)
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace)
+        shutil.rmtree(self.temp_folder)
+
+    def _read(self, dataset):
+        with open(os.path.join(self.workspace, dataset + ".xml"), "rb") as f:
+            return f.read()
+
+    @mock.patch.dict(sys.modules, {"arcpy": None})  # any import of arcpy fails, the session must not need it
+    def test_commit_changed_only(self):
+        untouched = self._read("simple_poly_no_metadata.shp")
+
+        with WorkspaceSession(self.workspace, FileSystemMetadataStore(), self.temp_folder) as session:
+            self.assertEqual(len(session), 2)
+            self.assertEqual(len(os.listdir(session.temp_folder)), 2)
+
+            for dataset, metadata in session.editors():
+                metadata.title = metadata.title
+            session.editor("simple_poly_w_base_metadata.shp").title = "New title"
+
+            committed = session.commit()
+            self.assertEqual(committed, [os.path.join(self.workspace, "simple_poly_w_base_metadata.shp")])
+            self.assertEqual(session.commit(), [])
+            session_folder = session.temp_folder
+            editor = session.editor("simple_poly_no_metadata.shp")
+
+        self.assertTrue(editor.closed)
+        self.assertFalse(os.path.exists(session_folder))
+        self.assertEqual(self._read("simple_poly_no_metadata.shp"), untouched)
+        metadata = md.MetadataEditor(metadata_file=os.path.join(self.workspace, "simple_poly_w_base_metadata.shp.xml"))
+        self.assertEqual(metadata.title, "New title")
+
+    def test_save_then_commit(self):
+        with WorkspaceSession(self.workspace, FileSystemMetadataStore(), self.temp_folder) as session:
+            metadata = session.editor("simple_poly_w_base_metadata.shp")
+            metadata.title = "Saved first"
+            metadata.save()
+            self.assertEqual(session.commit(), [os.path.join(self.workspace, "simple_poly_w_base_metadata.shp")])
+            self.assertEqual(session.commit(), [])
+
+        metadata = md.MetadataEditor(metadata_file=os.path.join(self.workspace, "simple_poly_w_base_metadata.shp.xml"))
+        self.assertEqual(metadata.title, "Saved first")
+
+    def test_failed_export(self):
+        released = []
+
+        class FailingStore(FileSystemMetadataStore):
+            def export(self, handle, xml_file, export_option):
+                if handle.endswith("simple_poly_w_base_metadata.shp.xml"):
+                    raise RuntimeError("export failed")
+                super().export(handle, xml_file, export_option)
+
+            def release(self, handle):
+                released.append(handle)
+
+        with self.assertRaises(RuntimeError):
+            WorkspaceSession(self.workspace, FailingStore(), self.temp_folder)
+        self.assertEqual(os.listdir(self.temp_folder), [])
+        self.assertEqual(len(released), 2)
+
+    def test_unknown_dataset(self):
+        with WorkspaceSession(self.workspace, FileSystemMetadataStore(), self.temp_folder) as session:
+            with self.assertRaises(KeyError):
+                session.editor("rivers")
+
+
+if __name__ == '__main__':
+    unittest.main()
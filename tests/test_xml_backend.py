@@ -0,0 +1,85 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import inspect # allow to test arcpy_metadata even when it is not installed as module
+import xml.etree.ElementTree as ET
+
+current_dir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+import arcpy_metadata as md
+from arcpy_metadata.elements import elements
+from arcpy_metadata.reader import read_metadata
+from arcpy_metadata.xml_backend import lxml_etree
+
+
+def _plain_value(metadata, name):
+    value = getattr(metadata, name)
+    if elements[name]["type"] == "list":
+        return list(value)
+    elif elements[name]["type"] == "parent_item":
+        return dict((k, getattr(value, k)) for k in elements[name]["elements"])
+    elif elements[name]["type"] == "object_list":
+        return [dict((k, getattr(item, k)) for k in elements[name]["elements"]) for item in value]
+    return value
+
+
+@unittest.skipIf(lxml_etree is None, "lxml is not installed")
+class TestXmlBackend(unittest.TestCase):
+    """
+    The lxml and the standard library backends need to give the same results for all test files
+    """
+
+    def setUp(self):
+        self.original_test_data_folder = os.path.join(os.path.dirname(__file__), "test_data")
+        self.temp_data_folder = tempfile.mkdtemp("arcpy_metadata_unit_tests")
+        self.names = [name for name in os.listdir(self.original_test_data_folder) if name.endswith(".xml")]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_data_folder)
+
+    def _copy(self, name, backend):
+        path = os.path.join(self.temp_data_folder, "{0}_{1}".format(backend, name))
+        shutil.copy(os.path.join(self.original_test_data_folder, name), path)
+        return path
+
+    def test_read(self):
+        for name in self.names:
+            stdlib_metadata = md.MetadataEditor(metadata_file=self._copy(name, "stdlib"), xml_backend="stdlib")
+            lxml_metadata = md.MetadataEditor(metadata_file=self._copy(name, "lxml"), xml_backend="lxml")
+            for key in elements:
+                self.assertEqual(_plain_value(stdlib_metadata, key), _plain_value(lxml_metadata, key),
+                                 "Value for element {0} in {1} differs between backends".format(key, name))
+
+    def test_reader(self):
+        for name in self.names:
+            path = os.path.join(self.original_test_data_folder, name)
+            self.assertEqual(read_metadata(path, xml_backend="stdlib"), read_metadata(path, xml_backend="lxml"))
+
+    def test_write(self):
+        for name in self.names:
+            paths = []
+            for backend in ["stdlib", "lxml"]:
+                path = self._copy(name, backend)
+                metadata = md.MetadataEditor(metadata_file=path, xml_backend=backend)
+                metadata.abstract = "This is the Abstract"
+                metadata.tags.append("new tag")
+                metadata.point_of_contact.role = "owner"
+                metadata.save()
+                paths.append(path)
+
+            # the meta-metadata timestamps can differ, everything else must be the same
+            trees = [ET.parse(path) for path in paths]
+            for tree in trees:
+                esri = tree.getroot().find("Esri")
+                for tag in ["ModDate", "ModTime", "CreaDate", "CreaTime"]:
+                    for element in esri.findall(tag):
+                        element.text = None
+            self.assertEqual(ET.canonicalize(ET.tostring(trees[0].getroot())),
+                             ET.canonicalize(ET.tostring(trees[1].getroot())))
+
+
+if __name__ == '__main__':
+    unittest.main()